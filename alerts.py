@@ -0,0 +1,393 @@
+"""
+Price alert rules evaluated on the live WebSocket feed.
+
+    python alerts.py rules.json
+
+Three rule kinds, all "value crosses a threshold":
+
+    price   the asset's price (bid/ask midpoint, else last trade)
+    spread  best ask minus best bid
+    move    relative price change over the last ``window`` seconds
+
+A rule fires when its value crosses the threshold in its direction,
+from one tick to the next. It fires again only after the value has gone
+back across. The first tick for an asset sets the starting side and
+never fires.
+
+Rules are indexed per (asset, kind, window, direction) in lists sorted
+by threshold. A tick moves each value from ``prev`` to ``cur``, and the
+rules it crosses are exactly the thresholds between the two: one bisect
+per value, plus the rules that fire. Ticks for assets with no rules
+return after one dict lookup. So the cost of a tick doesn't grow with
+the number of rules.
+"""
+import argparse
+import json
+import signal
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from ws_client import extract_price_update
+
+KINDS = ("price", "spread", "move")
+DIRECTIONS = ("above", "below")
+
+
+class AlertRule(NamedTuple):
+    """
+    One user rule.
+
+    ``threshold`` is a price, a spread, or for "move" a fraction (0.05 is
+    5%); "move" rules with direction "below" fire on falls of at least
+    ``threshold`` (a positive number).
+    """
+    rule_id: str
+    asset_id: str
+    kind: str
+    threshold: float
+    direction: str = "above"
+    # Seconds of history for "move" rules
+    window: float = 0.0
+    owner: str = ""
+
+
+class Alert(NamedTuple):
+    """A rule that fired."""
+    rule: AlertRule
+    value: float
+    previous: float
+    ts: float
+
+
+def validate_rule(rule: AlertRule) -> AlertRule:
+    """
+    Check a rule's kind, direction and window.
+
+    Returns:
+        The rule, with threshold and window as floats
+
+    Raises:
+        ValueError: On an unknown kind or direction, or a "move" rule
+            without a positive window
+    """
+    if rule.kind not in KINDS:
+        raise ValueError(f"Unknown rule kind {rule.kind!r} (expected one of {', '.join(KINDS)})")
+    if rule.direction not in DIRECTIONS:
+        raise ValueError(f"Unknown rule direction {rule.direction!r} (expected above or below)")
+    if rule.kind == "move" and not rule.window > 0:
+        raise ValueError(f"Move rule {rule.rule_id} needs a positive window")
+    return rule._replace(threshold=float(rule.threshold), window=float(rule.window) if rule.kind == "move" else 0.0)
+
+
+class NotificationSink:
+    """Where fired alerts go. Subclasses implement ``send``."""
+
+    def send(self, alert: Alert):
+        """
+        Deliver one alert. Called from the WebSocket thread, outside the
+        engine's lock; slow sinks should queue and return.
+        """
+        raise NotImplementedError
+
+
+class MemorySink(NotificationSink):
+    """Keeps alerts in a list; for tests and the benchmark suite."""
+
+    def __init__(self):
+        self.alerts: List[Alert] = []
+        self.lock = threading.Lock()
+
+    def send(self, alert: Alert):
+        with self.lock:
+            self.alerts.append(alert)
+
+    def drain(self) -> List[Alert]:
+        """Return and clear the collected alerts."""
+        with self.lock:
+            alerts, self.alerts = self.alerts, []
+        return alerts
+
+
+class PrintSink(NotificationSink):
+    """Prints one line per alert."""
+
+    def send(self, alert: Alert):
+        rule = alert.rule
+        what = f"{rule.kind} {rule.window:g}s" if rule.kind == "move" else rule.kind
+        print(f"[{time.strftime('%H:%M:%S', time.localtime(alert.ts))}] {rule.rule_id}: {rule.asset_id[:12]}… "
+              f"{what} {alert.previous:.4f} -> {alert.value:.4f} crossed {rule.direction} {rule.threshold:g}")
+
+
+class ThresholdIndex:
+    """Rules on one value, sorted by threshold."""
+
+    def __init__(self):
+        self.thresholds: List[float] = []
+        self.rules: List[AlertRule] = []
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def add(self, rule: AlertRule):
+        i = bisect_right(self.thresholds, rule.threshold)
+        self.thresholds.insert(i, rule.threshold)
+        self.rules.insert(i, rule)
+
+    def remove(self, rule: AlertRule) -> bool:
+        i = bisect_left(self.thresholds, rule.threshold)
+        while i < len(self.rules) and self.thresholds[i] == rule.threshold:
+            if self.rules[i].rule_id == rule.rule_id:
+                del self.thresholds[i]
+                del self.rules[i]
+                return True
+            i += 1
+        return False
+
+    def rising(self, prev: float, cur: float) -> List[AlertRule]:
+        """Rules with prev < threshold <= cur."""
+        return self.rules[bisect_right(self.thresholds, prev):bisect_right(self.thresholds, cur)]
+
+    def falling(self, prev: float, cur: float) -> List[AlertRule]:
+        """Rules with cur <= threshold < prev."""
+        return self.rules[bisect_left(self.thresholds, cur):bisect_left(self.thresholds, prev)]
+
+
+class _AssetState:
+    """Latest quote, derived values and move-window histories of one asset."""
+
+    __slots__ = ("bid", "ask", "last", "values", "history")
+
+    def __init__(self):
+        self.bid: Optional[float] = None
+        self.ask: Optional[float] = None
+        self.last: Optional[float] = None
+        # (kind, window) -> value after the previous tick
+        self.values: Dict[Tuple[str, float], float] = {}
+        # window -> deque of (ts, price)
+        self.history: Dict[float, deque] = {}
+
+
+class AlertEngine:
+    """
+    Evaluates AlertRules against WebSocket events.
+
+    Attach to a WSClient or WSConnectionManager with
+    ``add_listener(engine)``; fired alerts go to every sink.
+    """
+
+    def __init__(self, sinks: Iterable[NotificationSink] = ()):
+        """
+        Args:
+            sinks: Initial notification sinks
+        """
+        self.sinks: List[NotificationSink] = list(sinks)
+        self.rules: Dict[str, AlertRule] = {}
+        # asset -> (kind, window, direction) -> index
+        self.indexes: Dict[str, Dict[Tuple[str, float, str], ThresholdIndex]] = {}
+        self.assets: Dict[str, _AssetState] = {}
+        self.stats = {"ticks": 0, "fired": 0}
+        self.lock = threading.Lock()
+
+    def __call__(self, event: Dict, recv_ts: float):
+        """WSClient listener entry point."""
+        self.update(event, recv_ts)
+
+    def add_sink(self, sink: NotificationSink):
+        self.sinks.append(sink)
+
+    def add_rule(self, rule: AlertRule) -> AlertRule:
+        """
+        Add or replace (by rule_id) a rule.
+
+        Raises:
+            ValueError: If the rule is invalid (see validate_rule)
+        """
+        rule = validate_rule(rule)
+        with self.lock:
+            self._remove(rule.rule_id)
+            self.rules[rule.rule_id] = rule
+            indexes = self.indexes.setdefault(rule.asset_id, {})
+            index = indexes.get((rule.kind, rule.window, rule.direction))
+            if index is None:
+                index = indexes[(rule.kind, rule.window, rule.direction)] = ThresholdIndex()
+            index.add(rule)
+            state = self.assets.get(rule.asset_id)
+            if rule.kind == "move" and state is not None and rule.window not in state.history:
+                state.history[rule.window] = deque()
+        return rule
+
+    def add_rules(self, rules: Iterable[AlertRule]) -> int:
+        """Add several rules; returns how many."""
+        count = 0
+        for rule in rules:
+            self.add_rule(rule)
+            count += 1
+        return count
+
+    def remove_rule(self, rule_id: str) -> bool:
+        """Remove a rule; False if there was none with that id."""
+        with self.lock:
+            return self._remove(rule_id)
+
+    def asset_ids(self) -> List[str]:
+        """Assets with at least one rule (what to subscribe)."""
+        with self.lock:
+            return list(self.indexes)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.stats, rules=len(self.rules), assets=len(self.indexes))
+
+    def update(self, event: Dict, recv_ts: Optional[float] = None):
+        """
+        Evaluate one WebSocket event and notify sinks of fired rules.
+
+        Args:
+            event: Decoded book, price_change or last_trade_price event
+            recv_ts: Receive timestamp (defaults to now)
+        """
+        msg_type, asset_id, fields = extract_price_update(event)
+        if not asset_id or not fields:
+            return
+        ts = recv_ts if recv_ts is not None else time.time()
+        with self.lock:
+            indexes = self.indexes.get(asset_id)
+            if indexes is None:
+                return
+            self.stats["ticks"] += 1
+            state = self.assets.get(asset_id)
+            if state is None:
+                state = self.assets[asset_id] = _AssetState()
+                for kind, window, _ in indexes:
+                    if kind == "move":
+                        state.history.setdefault(window, deque())
+            if "best_bid" in fields:
+                state.bid = fields["best_bid"]
+            if "best_ask" in fields:
+                state.ask = fields["best_ask"]
+            if "last_trade_price" in fields:
+                state.last = fields["last_trade_price"]
+
+            current: Dict[Tuple[str, float], float] = {}
+            if state.bid is not None and state.ask is not None:
+                price = (state.bid + state.ask) / 2
+                current[("spread", 0.0)] = state.ask - state.bid
+            else:
+                price = state.last
+            if price is not None:
+                current[("price", 0.0)] = price
+                for window, history in state.history.items():
+                    history.append((ts, price))
+                    # Keep one point at or before the window start as the reference
+                    while len(history) > 1 and history[1][0] <= ts - window:
+                        history.popleft()
+                    reference = history[0][1]
+                    if reference > 0:
+                        current[("move", window)] = price / reference - 1
+
+            fired = []
+            for key, cur in current.items():
+                prev = state.values.get(key)
+                state.values[key] = cur
+                if prev is None or prev == cur:
+                    continue
+                kind, window = key
+                above = indexes.get((kind, window, "above"))
+                below = indexes.get((kind, window, "below"))
+                if kind == "move":
+                    # Falls are matched against positive thresholds
+                    if above is not None:
+                        fired.extend(self._crossed(above, prev, cur, ts, True))
+                    if below is not None:
+                        fired.extend(self._crossed(below, -prev, -cur, ts, True, sign=-1))
+                else:
+                    if above is not None:
+                        fired.extend(self._crossed(above, prev, cur, ts, True))
+                    if below is not None:
+                        fired.extend(self._crossed(below, prev, cur, ts, False))
+            self.stats["fired"] += len(fired)
+
+        for alert in fired:
+            for sink in self.sinks:
+                try:
+                    sink.send(alert)
+                except Exception as e:
+                    print(f"Error in alert sink: {e}")
+
+    def _crossed(self, index: ThresholdIndex, prev: float, cur: float, ts: float,
+                 upward: bool, sign: int = 1) -> List[Alert]:
+        """Alerts for rules of one index crossed by prev -> cur (lock held)."""
+        if upward:
+            rules = index.rising(prev, cur) if cur > prev else []
+        else:
+            rules = index.falling(prev, cur) if cur < prev else []
+        return [Alert(rule, sign * cur, sign * prev, ts) for rule in rules]
+
+    def _remove(self, rule_id: str) -> bool:
+        """Drop a rule from the rule map and its index (lock held)."""
+        rule = self.rules.pop(rule_id, None)
+        if rule is None:
+            return False
+        indexes = self.indexes[rule.asset_id]
+        key = (rule.kind, rule.window, rule.direction)
+        indexes[key].remove(rule)
+        if not indexes[key]:
+            del indexes[key]
+            state = self.assets.get(rule.asset_id)
+            if rule.kind == "move" and state is not None and not any(
+                    k == "move" and w == rule.window for k, w, _ in indexes):
+                state.history.pop(rule.window, None)
+                state.values.pop(("move", rule.window), None)
+        if not indexes:
+            del self.indexes[rule.asset_id]
+            self.assets.pop(rule.asset_id, None)
+        return True
+
+
+def load_rules(path: str) -> List[AlertRule]:
+    """
+    Read rules from a JSON list of objects with AlertRule's fields.
+
+    Raises:
+        ValueError: On a malformed file or rule
+    """
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    if not isinstance(raw, list):
+        raise ValueError(f"{path}: expected a JSON list of rules")
+    rules = []
+    for i, item in enumerate(raw):
+        try:
+            rules.append(validate_rule(AlertRule(**{"rule_id": str(i), **item})))
+        except TypeError as e:
+            raise ValueError(f"{path}: rule {i}: {e}") from e
+    return rules
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Print price alerts from the live market feed.")
+    parser.add_argument("rules", help="JSON file: list of {asset_id, kind, threshold, direction, window}")
+    parser.add_argument("--per-connection", type=int, default=500, help="assets per WebSocket connection")
+    args = parser.parse_args(argv)
+
+    from ws_manager import WSConnectionManager
+
+    engine = AlertEngine([PrintSink()])
+    engine.add_rules(load_rules(args.rules))
+    manager = WSConnectionManager(max_assets_per_connection=args.per_connection)
+    manager.add_listener(engine)
+    manager.subscribe(engine.asset_ids())
+    print(f"Watching {len(engine.rules)} rules on {len(engine.indexes)} assets")
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    stop.wait()
+    manager.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,31 @@
 Polymarket Live Data Platform - Streamlit App
 Redesigned to match Polymarket's UI
 """
+import functools
+import html
+import inspect
+import os
+import time
+import uuid
+
+import requests
 import streamlit as st
-from datetime import datetime
-import plotly.graph_objects as go
 from gamma_client import GammaClient
 from clob_client import CLOBClient
+from charts import live_history_figure, overlay_figure
+from data_cache import CachedDataService, normalize_query
+from feed import FEED_CSS, feed_html, load_feed
+from live_feed import LiveFeed, live_price
+from metrics import REGISTRY, start_http_server
+from prefetch import Prefetcher
+from search_service import SearchService
+from styles import APP_CSS
+from market_filter import get_real_markets
+from token_index import CatalogIndex
 from utils import (
-    parse_markets_from_event,
-    get_first_token_id,
+    get_event,
     format_price,
     format_volume,
-    safe_float
 )
 
 # Page configuration
@@ -23,319 +37,6 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Cyberpunk-style CSS
-st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@400;500;700;900&family=Rajdhani:wght@300;400;500;600;700&display=swap');
-    
-    /* Remove Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-        font-family: 'Rajdhani', sans-serif;
-    }
-    
-    /* Force dark background everywhere */
-    .stApp, .stApp > div, .main, .main > div,
-    [data-testid="stAppViewContainer"],
-    [data-testid="stAppViewBlockContainer"],
-    section[data-testid="stMain"],
-    .block-container {
-        background: transparent !important;
-    }
-    
-    [data-testid="stAppViewContainer"] {
-        background: linear-gradient(135deg, #0a0e27 0%, #1a1a2e 50%, #16213e 100%) !important;
-        background-attachment: fixed !important;
-    }
-    
-    .main .block-container {
-        padding: 2rem;
-        max-width: 1400px;
-    }
-    
-    /* Animated background grid */
-    .stApp::before {
-        content: '';
-        position: fixed;
-        top: 0;
-        left: 0;
-        width: 100%;
-        height: 100%;
-        background-image: 
-            linear-gradient(rgba(0, 255, 255, 0.03) 1px, transparent 1px),
-            linear-gradient(90deg, rgba(0, 255, 255, 0.03) 1px, transparent 1px);
-        background-size: 50px 50px;
-        pointer-events: none;
-        z-index: 0;
-    }
-    
-    /* Remove Streamlit branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    
-    /* Headers with glow */
-    h1 {
-        font-family: 'Orbitron', sans-serif !important;
-        font-size: 3rem !important;
-        font-weight: 900 !important;
-        background: linear-gradient(135deg, #00f5ff 0%, #ff00ff 50%, #00f5ff 100%) !important;
-        -webkit-background-clip: text !important;
-        -webkit-text-fill-color: transparent !important;
-        background-clip: text !important;
-        text-shadow: 0 0 30px rgba(0, 245, 255, 0.5);
-        margin-bottom: 2rem !important;
-        animation: glow 2s ease-in-out infinite alternate;
-    }
-    
-    @keyframes glow {
-        from { filter: drop-shadow(0 0 10px #00f5ff); }
-        to { filter: drop-shadow(0 0 20px #ff00ff); }
-    }
-    
-    h2 {
-        font-family: 'Orbitron', sans-serif !important;
-        font-size: 1.5rem !important;
-        font-weight: 700 !important;
-        color: #00f5ff !important;
-        text-transform: uppercase !important;
-        letter-spacing: 2px !important;
-        margin: 2rem 0 1rem 0 !important;
-        text-shadow: 0 0 10px rgba(0, 245, 255, 0.5);
-    }
-    
-    h3 {
-        font-family: 'Rajdhani', sans-serif !important;
-        font-size: 1.2rem !important;
-        font-weight: 600 !important;
-        color: #fff !important;
-    }
-    
-    /* Neon buttons */
-    .stButton > button {
-        background: linear-gradient(135deg, #ff00ff 0%, #00f5ff 100%) !important;
-        color: #000 !important;
-        border: 2px solid #00f5ff !important;
-        border-radius: 10px !important;
-        font-weight: 700 !important;
-        font-family: 'Orbitron', sans-serif !important;
-        padding: 0.75rem 1.5rem !important;
-        text-transform: uppercase !important;
-        letter-spacing: 1px !important;
-        box-shadow: 0 0 20px rgba(0, 245, 255, 0.5), inset 0 0 20px rgba(255, 0, 255, 0.2) !important;
-        transition: all 0.3s ease !important;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-3px) scale(1.05) !important;
-        box-shadow: 0 0 30px rgba(0, 245, 255, 0.8), 0 0 50px rgba(255, 0, 255, 0.6) !important;
-        border-color: #ff00ff !important;
-    }
-    
-    /* Glowing search bar */
-    .stTextInput > div > div > input {
-        background: rgba(26, 26, 46, 0.8) !important;
-        border: 2px solid #00f5ff !important;
-        border-radius: 10px !important;
-        padding: 1rem !important;
-        font-size: 1rem !important;
-        color: #00f5ff !important;
-        font-weight: 500 !important;
-        box-shadow: 0 0 15px rgba(0, 245, 255, 0.3), inset 0 0 10px rgba(0, 245, 255, 0.1) !important;
-        transition: all 0.3s ease !important;
-    }
-    
-    .stTextInput > div > div > input:focus {
-        border-color: #ff00ff !important;
-        box-shadow: 0 0 25px rgba(255, 0, 255, 0.6), inset 0 0 15px rgba(255, 0, 255, 0.2) !important;
-    }
-    
-    .stTextInput > div > div > input::placeholder {
-        color: rgba(0, 245, 255, 0.5) !important;
-    }
-    
-    /* Cyberpunk metrics */
-    [data-testid="stMetricValue"] {
-        font-family: 'Orbitron', sans-serif !important;
-        font-size: 2rem !important;
-        font-weight: 900 !important;
-        background: linear-gradient(135deg, #00f5ff 0%, #ff00ff 100%) !important;
-        -webkit-background-clip: text !important;
-        -webkit-text-fill-color: transparent !important;
-        text-shadow: 0 0 20px rgba(0, 245, 255, 0.5);
-    }
-    
-    [data-testid="stMetricLabel"] {
-        font-size: 0.9rem !important;
-        color: #00f5ff !important;
-        font-weight: 600 !important;
-        text-transform: uppercase !important;
-        letter-spacing: 1px !important;
-    }
-    
-    /* Selectbox */
-    .stSelectbox > div > div {
-        background: rgba(26, 26, 46, 0.8) !important;
-        border: 2px solid #00f5ff !important;
-        border-radius: 8px !important;
-        color: #00f5ff !important;
-        box-shadow: 0 0 10px rgba(0, 245, 255, 0.3) !important;
-    }
-    
-    /* Neon dividers */
-    hr {
-        border: none !important;
-        height: 2px !important;
-        background: linear-gradient(90deg, transparent, #00f5ff, #ff00ff, #00f5ff, transparent) !important;
-        box-shadow: 0 0 10px rgba(0, 245, 255, 0.5) !important;
-        margin: 2rem 0 !important;
-    }
-    
-    /* Captions */
-    .stCaption {
-        color: #00f5ff !important;
-        font-size: 0.9rem !important;
-        font-weight: 500 !important;
-    }
-    
-    /* Fix all text elements to ensure visibility */
-    p, span, label {
-        color: #fff !important;
-    }
-    
-    /* Ensure text is visible on dark background */
-    p, span, label, .stMarkdown, .stMarkdown p {
-        color: #fff !important;
-    }
-    
-    /* Selectbox styling - force all parts to be visible */
-    .stSelectbox label {
-        color: #00f5ff !important;
-        font-weight: 600 !important;
-        text-shadow: 0 0 10px rgba(0, 245, 255, 0.5);
-    }
-    
-    /* Target the actual select container */
-    .stSelectbox > div > div {
-        background: rgba(26, 26, 46, 0.95) !important;
-        border: 2px solid #00f5ff !important;
-        border-radius: 8px !important;
-        box-shadow: 0 0 10px rgba(0, 245, 255, 0.3) !important;
-    }
-    
-    /* Target the select element itself */
-    .stSelectbox [data-baseweb="select"] {
-        background: rgba(26, 26, 46, 0.95) !important;
-    }
-    
-    .stSelectbox [data-baseweb="select"] > div {
-        background: rgba(26, 26, 46, 0.95) !important;
-        color: #00f5ff !important;
-        border: 2px solid #00f5ff !important;
-    }
-    
-    /* Force all text inside selectbox to be cyan */
-    .stSelectbox > div > div {
-        background-color: rgba(26, 26, 46, 0.95) !important;
-    }
-    
-    .stSelectbox span {
-        color: #00f5ff !important;
-    }
-    
-    .stSelectbox svg {
-        fill: #00f5ff !important;
-    }
-    
-    /* Dropdown menu options */
-    [role="listbox"] {
-        background: #1a1a2e !important;
-        border: 2px solid #00f5ff !important;
-    }
-    
-    [role="option"] {
-        background: #1a1a2e !important;
-        color: #00f5ff !important;
-    }
-    
-    [role="option"]:hover {
-        background: rgba(0, 245, 255, 0.2) !important;
-        color: #ff00ff !important;
-    }
-    
-    /* Force dropdown text to be visible */
-    option {
-        background: #1a1a2e !important;
-        color: #00f5ff !important;
-    }
-    
-    /* Target specific selectbox elements by data attributes */
-    [data-baseweb="popover"] {
-        background: #1a1a2e !important;
-    }
-    
-    [data-baseweb="menu"] {
-        background: #1a1a2e !important;
-    }
-    
-    [data-baseweb="list"] {
-        background: #1a1a2e !important;
-    }
-    
-    [data-baseweb="list-item"] {
-        background: #1a1a2e !important;
-        color: #00f5ff !important;
-    }
-    
-    [data-baseweb="list-item"]:hover {
-        background: rgba(0, 245, 255, 0.3) !important;
-    }
-    
-    /* Markdown text */
-    .stMarkdown {
-        color: #fff !important;
-    }
-    
-    .stMarkdown p {
-        color: #fff !important;
-    }
-    
-    /* Strong/bold text */
-    strong, b {
-        color: #00f5ff !important;
-    }
-    
-    /* Chart text */
-    .js-plotly-plot .plotly text {
-        fill: #00f5ff !important;
-    }
-    
-    /* Info boxes */
-    .stAlert {
-        background: rgba(0, 245, 255, 0.1) !important;
-        border: 2px solid #00f5ff !important;
-        border-radius: 10px !important;
-        box-shadow: 0 0 20px rgba(0, 245, 255, 0.2) !important;
-    }
-    
-    /* Spinner */
-    .stSpinner > div {
-        border-top-color: #00f5ff !important;
-        border-right-color: #ff00ff !important;
-    }
-    
-    /* Glitch effect on hover */
-    @keyframes glitch {
-        0% { transform: translate(0); }
-        20% { transform: translate(-2px, 2px); }
-        40% { transform: translate(-2px, -2px); }
-        60% { transform: translate(2px, 2px); }
-        80% { transform: translate(2px, -2px); }
-        100% { transform: translate(0); }
-    }
-    </style>
-""", unsafe_allow_html=True)
 
 # Initialize clients
 @st.cache_resource
@@ -346,138 +47,151 @@ def get_gamma_client():
 def get_clob_client():
     return CLOBClient()
 
-gamma = get_gamma_client()
-clob = get_clob_client()
+@st.cache_resource
+def get_catalog_index():
+    # Shared across sessions; loaded events are indexed by token/slug/id,
+    # the least recently loaded evicted past CATALOG_MAX_EVENTS
+    return CatalogIndex(max_events=CATALOG_MAX_EVENTS)
 
-# Session state
-if "selected_event" not in st.session_state:
-    st.session_state.selected_event = None
-if "search_query" not in st.session_state:
-    st.session_state.search_query = ""
+@st.cache_resource
+def get_data_service():
+    # Shared across sessions; reruns reuse data fetched moments ago
+    service = CachedDataService(get_gamma_client(), get_clob_client())
+    REGISTRY.register_collector("data_cache", service.render_prometheus)
+    return service
 
+@st.cache_resource
+def get_live_feed():
+    # One set of WebSocket connections (or one feeder attachment) per process
+    feed = LiveFeed()
+    REGISTRY.register_collector("live_feed", feed.render_prometheus)
+    return feed
 
-def is_real_market(market_dict):
-    """Check if a market has real, meaningful outcomes (not placeholders)."""
-    import re
-    
-    question = market_dict.get("question", "").lower()
-    outcomes = market_dict.get("outcomes", [])
-    
-    if not outcomes or len(outcomes) == 0:
-        return False
-    
-    # First check the question itself for placeholder patterns
-    question_placeholder_patterns = [
-        r'\bindividual\s+[a-z0-9]\b',
-        r'\bleader\s+\d+\b',
-        r'\bperson\s+[a-z0-9]\b',
-        r'\bcandidate\s+[a-z]\b',
-        r'\boption\s+[a-z0-9]\b',
-        r'\bchoice\s+[a-z0-9]\b',
-        r'\bteam\s+[a-z0-9]\b',
-        r'\bplayer\s+[a-z0-9]\b',
-        r'\bcompany\s+[a-z0-9]\b',
-    ]
-    
-    # If question contains placeholder patterns, skip it
-    for pattern in question_placeholder_patterns:
-        if re.search(pattern, question):
-            return False
-    
-    # Check test/placeholder keywords in question
-    if any(kw in question for kw in ["test market", "placeholder", "example", "dummy", "sample"]):
-        return False
-    
-    # Check each outcome
-    real_outcomes = 0
-    for outcome in outcomes:
-        outcome_str = str(outcome).strip().lower()
-        
-        # Skip if it matches placeholder patterns
-        placeholder_patterns = [
-            r'^(individual|leader|person|candidate|option|choice|team|player|company)\s*[a-z0-9]$',
-            r'^(individual|leader|person|candidate|option|choice|team|player|company)\s*\d+$',
-            r'^[a-z]$',  # Single letter
-            r'^\d+$',    # Just a number
-        ]
-        
-        is_placeholder = any(re.match(pattern, outcome_str) for pattern in placeholder_patterns)
-        
-        # Also check for very generic outcomes
-        if outcome_str in ["yes", "no", "up", "down", "true", "false"]:
-            # These are OK
-            real_outcomes += 1
-        elif not is_placeholder and len(outcome_str) > 1:
-            real_outcomes += 1
-    
-    # Need at least 1 real outcome
-    return real_outcomes > 0
+@st.cache_resource
+def get_prefetcher():
+    # Warms the shared history cache for cards the user is likely to open
+    return Prefetcher(get_data_service())
 
+@st.cache_resource
+def get_search_service():
+    # Shared prefix cache and debounced upstream search
+    return SearchService(get_data_service())
 
-def render_market_card(event, key_prefix=""):
-    """Render a cyberpunk-style neon card - pure HTML for the card body."""
-    title = event.get("title", "Untitled")
-    markets = event.get("markets", [])
+@st.cache_resource
+def get_card_click_listener():
+    # Opens clicked feed cards in this session; a followed link would start
+    # a new one, losing loaded pages and live state. None on Streamlit
+    # versions without st.components.v2, where cards fall back to links
+    try:
+        from streamlit.components.v2 import component
+    except ImportError:
+        return None
+    return component("pm_card_clicks", js=CARD_CLICK_JS)
 
-    if not markets:
-        return
+@st.cache_resource
+def get_metrics_server():
+    # Opt-in Prometheus endpoint; each Streamlit process needs its own port
+    port = os.environ.get("POLYMARKET_METRICS_PORT")
+    if not port:
+        return None
+    try:
+        return start_http_server(int(port))
+    except (OSError, ValueError) as e:
+        print(f"Error starting metrics server on port {port}: {e}")
+        return None
 
-    volume = safe_float(markets[0].get("volume", 0))
-
-    # Use parse_markets_from_event so outcomes/prices are properly decoded from JSON strings
-    parsed = parse_markets_from_event(event)
-    first_market = parsed[0] if parsed else None
-    outcomes = first_market.get("outcomes", []) if first_market else []
-    prices = first_market.get("outcome_prices", []) if first_market else []
-
-    # Build outcome pills in pure HTML
-    pills_html = ""
-    for i, outcome in enumerate(outcomes[:4]):
-        price = safe_float(prices[i] if i < len(prices) else 0, 0)
-        if price > 0.6:
-            border_color = "#00f5ff"
-            glow = "0, 245, 255"
-            bg = "rgba(0, 245, 255, 0.15)"
-            text_color = "#00f5ff"
-        elif price > 0.4:
-            border_color = "#ffff00"
-            glow = "255, 255, 0"
-            bg = "rgba(255, 255, 0, 0.15)"
-            text_color = "#ffff00"
-        else:
-            border_color = "#ff00ff"
-            glow = "255, 0, 255"
-            bg = "rgba(255, 0, 255, 0.15)"
-            text_color = "#ff00ff"
-
-        pills_html += (
-            f'<div style="flex:1;background:{bg};border:2px solid {border_color};color:{text_color};'
-            f'padding:0.75rem 0.5rem;border-radius:10px;text-align:center;font-weight:700;'
-            f'font-size:0.85rem;box-shadow:0 0 15px rgba({glow},0.4);text-transform:uppercase;'
-            f'letter-spacing:1px;min-width:80px;">'
-            f'<div style="color:{text_color};">{outcome}</div>'
-            f'<div style="font-size:1.2rem;margin-top:4px;color:{text_color};">{format_price(price)}</div>'
-            f'</div>'
-        )
+# Events kept in the shared catalog index
+CATALOG_MAX_EVENTS = 5_000
+# Screener catalog: events loaded, and seconds before it is reloaded
+SCREENER_MAX_EVENTS = 10_000
+SCREENER_TTL_SECS = 600
+# Screener rows shown
+SCREENER_ROWS = 200
+# Screener sort options: label -> (column, descending)
+SCREENER_SORTS = {
+    "24h volume ↓": ("volume_24h", True),
+    "Volume ↓": ("volume", True),
+    "Liquidity ↓": ("liquidity", True),
+    "Price ↓": ("yes_price", True),
+    "Price ↑": ("yes_price", False),
+    "Spread ↑": ("spread", False),
+    "24h change ↓": ("price_change_24h", True),
+    "24h change ↑": ("price_change_24h", False),
+    "Ending soonest": ("end_ts", False),
+    "Event A-Z": ("event_title", False),
+}
 
-    card = (
-        f'<div style="background:linear-gradient(135deg,rgba(26,26,46,0.97),rgba(16,20,55,0.97));'
-        f'border:2px solid #00f5ff;border-radius:16px;padding:1.5rem;margin-bottom:1rem;'
-        f'box-shadow:0 0 25px rgba(0,245,255,0.25),0 0 50px rgba(255,0,255,0.15);">'
-        f'<div style="font-size:1.15rem;font-weight:600;color:#ffffff;line-height:1.4;'
-        f'margin-bottom:1.2rem;text-shadow:0 0 8px rgba(0,245,255,0.4);">{title}</div>'
-        f'<div style="display:flex;gap:0.75rem;margin-bottom:1.2rem;flex-wrap:wrap;">{pills_html}</div>'
-        f'<div style="color:#00f5ff;font-size:0.85rem;font-weight:600;letter-spacing:1px;">'
-        f'&#x1F48E; {format_volume(volume)} VOL</div>'
-        f'</div>'
-    )
-    st.markdown(card, unsafe_allow_html=True)
+# Catches plain left clicks on any feed card (event delegation, so cards
+# rendered later are covered) and reports the card's event id
+CARD_CLICK_JS = """
+export default function(component) {
+    const { setTriggerValue } = component;
+    const onClick = (e) => {
+        const card = e.target.closest && e.target.closest("a.pm-card[data-event]");
+        if (!card || e.button !== 0 || e.ctrlKey || e.metaKey || e.shiftKey || e.altKey) {
+            return;
+        }
+        e.preventDefault();
+        setTriggerValue("open", card.dataset.event);
+    };
+    document.addEventListener("click", onClick);
+    return () => document.removeEventListener("click", onClick);
+}
+"""
 
-    if st.button("⚡ ENTER", key=f"{key_prefix}_{event.get('id', title)}", use_container_width=True):
-        st.session_state.selected_event = event
-        st.rerun()
+# Seconds between live price refreshes on the detail page
+LIVE_REFRESH_SECS = 2
+# Cards whose detail chart is prefetched on landing render
+PREFETCH_TOP_N = 8
+# Seconds between checks for pending search results
+SEARCH_POLL_SECS = 0.5
+# Newer Streamlit commits the search box while typing, after a pause.
+# live=True (250 ms) rather than a duration string: Streamlit parses
+# strings with pandas, which would load pandas and numpy on first render
+SEARCH_INPUT_KWARGS = {"live": True} if "live" in inspect.signature(st.text_input).parameters else {}
 
+@st.cache_resource(ttl=SCREENER_TTL_SECS, show_spinner="⚡ LOADING THE MARKET CATALOG...")
+def get_screener():
+    # Whole open catalog as columns; NumPy loads only when the page is opened
+    from screener import load_screener
+    return load_screener(get_gamma_client(), SCREENER_MAX_EVENTS)
 
+
+RENDER_SECONDS = REGISTRY.histogram(
+    "polymarket_render_seconds",
+    "Run time of each page and fragment render function.",
+    ("page",),
+)
+
+
+def timed_render(func):
+    """Record each call's duration in RENDER_SECONDS, labelled by function name."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with RENDER_SECONDS.time(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+# Live feed, prefetcher and search are fetched where used, so a cold
+# landing render doesn't build them
+catalog = get_catalog_index()
+data = get_data_service()
+get_metrics_server()
+
+# Session state
+if "selected_event" not in st.session_state:
+    st.session_state.selected_event = None
+if "search_query" not in st.session_state:
+    st.session_state.search_query = st.query_params.get("q", "")
+    st.session_state.search_input = st.session_state.search_query
+if "feed_pages" not in st.session_state:
+    st.session_state.feed_pages = 1
+if "live_key" not in st.session_state:
+    st.session_state.live_key = uuid.uuid4().hex
+
+
+@timed_render
 def render_landing():
     """Cyberpunk landing page."""
     # Epic cyberpunk title
@@ -511,15 +225,29 @@ def render_landing():
     </div>
     """, unsafe_allow_html=True)
     
-    # Search with neon glow
-    col1, col2 = st.columns([4, 1])
+    # Search with neon glow; results update as the user types
+    col1, col2, col3, col4 = st.columns([4, 1, 1, 1])
     with col1:
-        query = st.text_input("Search", placeholder="🔍 SCAN THE MATRIX...", label_visibility="collapsed", key="search_input")
+        st.text_input(
+            "Search",
+            placeholder="🔍 SCAN THE MATRIX...",
+            label_visibility="collapsed",
+            key="search_input",
+            on_change=set_search_query,
+            **SEARCH_INPUT_KWARGS
+        )
     with col2:
-        if st.button("⚡ SEARCH", use_container_width=True):
-            if query:
-                st.session_state.search_query = query
-                st.rerun()
+        st.button("⚡ SEARCH", use_container_width=True, on_click=set_search_query)
+    with col3:
+        if st.button("⟳ REFRESH", use_container_width=True, key="refresh_landing"):
+            data.invalidate("search" if st.session_state.search_query else "popular")
+            st.rerun()
+    with col4:
+        if st.button("📊 SCREENER", use_container_width=True):
+            st.query_params["page"] = "screener"
+            st.rerun()
+    
+    listen_for_card_clicks()
     
     # Results
     if st.session_state.search_query:
@@ -531,20 +259,12 @@ def render_landing():
             text-transform: uppercase;
             letter-spacing: 2px;
         ">
-            ⟨ SEARCH RESULTS: {st.session_state.search_query} ⟩
+            ⟨ SEARCH RESULTS: {html.escape(st.session_state.search_query)} ⟩
         </h2>
         """, unsafe_allow_html=True)
         
-        if st.button("⬅ BACK TO NEXUS"):
-            st.session_state.search_query = ""
-            st.rerun()
-        
-        results = gamma.search_events_public(st.session_state.search_query, 20)
-        if results:
-            for idx, event in enumerate(results):
-                render_market_card(event, f"search_{idx}")
-        else:
-            st.info("🔴 NO SIGNALS DETECTED")
+        st.button("⬅ BACK TO NEXUS", on_click=clear_search_query)
+        render_search_results()
     else:
         st.markdown("""
         <h2 style="
@@ -562,62 +282,186 @@ def render_landing():
         """, unsafe_allow_html=True)
         
         with st.spinner("⚡ SYNCING WITH THE GRID..."):
-            events = gamma.get_popular_events(40)
+            pages, more = load_feed(data, st.session_state.feed_pages)
+        prefetch_charts(pages[0] if pages else [])
+        
+        # One batched HTML element per page; cards open ?event=<id>
+        st.markdown(FEED_CSS, unsafe_allow_html=True)
+        for page in pages:
+            catalog.add_events(page)
+            st.markdown(feed_html(page), unsafe_allow_html=True)
         
-        if events:
-            # Filter placeholders
-            real_events = []
-            for event in events:
-                markets = parse_markets_from_event(event)
-                has_real_market = any(is_real_market(m) for m in markets)
-                if has_real_market:
-                    real_events.append(event)
-            
-            for idx, event in enumerate(real_events[:20]):
-                render_market_card(event, f"pop_{idx}")
+        if more and st.button("⬇ LOAD MORE SIGNALS", use_container_width=True):
+            st.session_state.feed_pages += 1
+            st.rerun()
+
+
+def listen_for_card_clicks():
+    """Mount the card click listener (no-op where it is unavailable)."""
+    listener = get_card_click_listener()
+    if listener is not None:
+        listener(key="card_clicks", on_open_change=open_clicked_card)
+
+
+def open_clicked_card():
+    """Card click callback: select the event before the rerun renders."""
+    event_id = (st.session_state.get("card_clicks") or {}).get("open")
+    if event_id:
+        st.query_params["event"] = event_id
+
+
+def set_search_query():
+    """Search box callback: make its text the current search."""
+    query = st.session_state.search_input.strip()
+    st.session_state.search_query = query
+    if query:
+        st.query_params["q"] = query
+        get_search_service().request(st.session_state.live_key, query)
+    else:
+        st.query_params.pop("q", None)
+        get_search_service().cancel(st.session_state.live_key)
+
 
+def clear_search_query():
+    """Back-to-feed callback."""
+    st.session_state.search_input = ""
+    set_search_query()
 
+
+@timed_render
+def render_search_results():
+    """Search results; polls in a fragment only while an upstream search is pending."""
+    query = st.session_state.search_query
+    result = current_search_result(query)
+    if result.final:
+        show_search_results(query, result)
+    else:
+        poll_search_results()
+
+
+@st.fragment(run_every=SEARCH_POLL_SECS)
+@timed_render
+def poll_search_results():
+    """Pending search: re-checks every SEARCH_POLL_SECS until it lands."""
+    query = st.session_state.search_query
+    result = current_search_result(query)
+    if result.final:
+        # Re-render the page without this polling fragment
+        st.rerun()
+    show_search_results(query, result)
+
+
+def current_search_result(query: str):
+    """This session's answer for ``query`` (re-requested if it was lost)."""
+    result = get_search_service().result(st.session_state.live_key)
+    if result.query != normalize_query(query):
+        # Session restored from ?q= (or a new worker); start the search here
+        result = get_search_service().request(st.session_state.live_key, query)
+    return result
+
+
+def show_search_results(query: str, result):
+    """Result cards, or the empty / pending notice."""
+    results = result.events
+    if result.final and st.session_state.get("indexed_query") != result.query:
+        st.session_state.indexed_query = result.query
+        catalog.add_events(results)
+        prefetch_charts(results)
+    if results:
+        st.markdown(FEED_CSS + feed_html(results, {"q": query}), unsafe_allow_html=True)
+    elif result.final:
+        st.info("🔴 NO SIGNALS DETECTED")
+    if not result.final:
+        st.caption("⚡ SCANNING THE GRID...")
+
+
+def prefetch_charts(events):
+    """Start warming the default chart of the first PREFETCH_TOP_N events."""
+    tokens = []
+    for event in events[:PREFETCH_TOP_N]:
+        real_markets = get_real_markets(event)
+        if real_markets and real_markets[0].clob_token_ids:
+            tokens.append(real_markets[0].clob_token_ids[0])
+    get_prefetcher().prefetch(st.session_state.live_key, tokens)
+
+
+@timed_render
 def render_event_detail():
     """Event detail page."""
-    event = st.session_state.selected_event
+    event = get_event(st.session_state.selected_event)
+    # The landing page's guesses are moot now; a fetch already running
+    # for this event's chart is shared with the render below
+    get_prefetcher().cancel(st.session_state.live_key)
     
-    if st.button("← Back"):
-        st.session_state.selected_event = None
-        st.rerun()
+    col1, col2 = st.columns([5, 1])
+    with col1:
+        if st.button("← Back"):
+            st.session_state.selected_event = None
+            st.query_params.pop("event", None)
+            release_live_prices()
+            st.rerun()
+    with col2:
+        if st.button("⟳ REFRESH", use_container_width=True, key="refresh_detail"):
+            data.invalidate("history")
+            st.rerun()
     
-    st.title(event.get("title", "Event"))
+    st.title(event.raw.get("title", "Event"))
     
-    if event.get("description"):
-        st.markdown(event["description"])
+    if event.description:
+        st.markdown(event.description)
     
     st.divider()
     
     # Stats
-    markets = event.get("markets", [])
-    total_vol = sum(safe_float(m.get("volume", 0)) for m in markets)
-    total_liq = sum(safe_float(m.get("liquidity", 0)) for m in markets)
-    
     col1, col2, col3 = st.columns(3)
-    col1.metric("Volume", format_volume(total_vol))
-    col2.metric("Liquidity", format_volume(total_liq))
-    col3.metric("Markets", len(markets))
+    col1.metric("Volume", format_volume(event.volume))
+    col2.metric("Liquidity", format_volume(event.liquidity))
+    col3.metric("Markets", len(event.markets))
     
     st.divider()
     
     # Markets
     st.subheader("Markets")
     
-    parsed = parse_markets_from_event(event)
-    real_markets = [m for m in parsed if is_real_market(m)]
+    real_markets = get_real_markets(event)
     
     if not real_markets:
         st.info("No markets available")
         return
     
+    render_live_markets(real_markets)
+    
+    # Chart
+    st.markdown("""
+    <h2 style="
+        font-family: 'Orbitron', sans-serif;
+        color: #ff00ff;
+        text-shadow: 0 0 20px rgba(255, 0, 255, 0.8);
+        text-transform: uppercase;
+        letter-spacing: 2px;
+        margin-top: 2rem;
+    ">
+        📊 PRICE HISTORY MATRIX
+    </h2>
+    """, unsafe_allow_html=True)
+    
+    render_price_chart(real_markets)
+
+
+@st.fragment(run_every=LIVE_REFRESH_SECS)
+@timed_render
+def render_live_markets(real_markets):
+    """Market questions with live outcome prices; reruns on its own every tick."""
+    live = get_live_feed()
+    live.watch(st.session_state.live_key, [t for m in real_markets for t in m.clob_token_ids])
+    st.session_state.live_watching = True
+    ticks = live.get_prices([t for m in real_markets for t in m.clob_token_ids[:4]])
+    
     for market in real_markets:
-        question = market.get("question", "")
-        outcomes = market.get("outcomes", [])
-        prices = market.get("outcome_prices", [])
+        question = market.question
+        outcomes = market.outcomes
+        prices = market.outcome_prices
+        tokens = market.clob_token_ids
         
         # Cyberpunk question styling
         st.markdown(f"""
@@ -638,95 +482,187 @@ def render_event_detail():
         cols = st.columns(len(outcomes) if len(outcomes) <= 4 else 4)
         for i, outcome in enumerate(outcomes[:4]):
             with cols[i]:
-                price = safe_float(prices[i] if i < len(prices) else 0, 0)
-                st.metric(outcome, format_price(price))
+                snapshot = prices[i] if i < len(prices) else 0
+                tick = ticks.get(tokens[i], {}) if i < len(tokens) else {}
+                price = live_price(tick, snapshot)
+                delta = f"{(price - snapshot) * 100:+.1f}¢" if tick and price != snapshot else None
+                st.metric(outcome, format_price(price), delta)
         
         st.divider()
+
+
+@st.fragment(run_every=LIVE_REFRESH_SECS)
+@timed_render
+def render_price_chart(real_markets):
+    """History chart with a live tail; reruns on its own every tick."""
+    col1, col2 = st.columns([3, 1])
     
-    # Chart
-    st.markdown("""
-    <h2 style="
-        font-family: 'Orbitron', sans-serif;
-        color: #ff00ff;
-        text-shadow: 0 0 20px rgba(255, 0, 255, 0.8);
-        text-transform: uppercase;
-        letter-spacing: 2px;
-        margin-top: 2rem;
-    ">
-        📊 PRICE HISTORY MATRIX
-    </h2>
-    """, unsafe_allow_html=True)
-    
-    if real_markets:
-        col1, col2 = st.columns([3, 1])
-        
-        with col1:
-            selected_idx = 0
-            if len(real_markets) > 1:
-                options = [m.get("question", f"Market {i}")[:60] for i, m in enumerate(real_markets)]
+    with col1:
+        selected_idx = 0
+        overlay = False
+        if len(real_markets) > 1:
+            overlay = st.toggle("OVERLAY ALL MARKETS", key="overlay_toggle")
+            if not overlay:
+                options = [(m.question or f"Market {i}")[:60] for i, m in enumerate(real_markets)]
                 st.markdown('<p style="color: #00f5ff; font-weight: 600; margin-bottom: 0.5rem;">SELECT MARKET:</p>', unsafe_allow_html=True)
                 selected = st.selectbox("Market", options, label_visibility="collapsed", key="market_select")
                 selected_idx = options.index(selected)
-        
-        with col2:
-            st.markdown('<p style="color: #00f5ff; font-weight: 600; margin-bottom: 0.5rem;">TIME RANGE:</p>', unsafe_allow_html=True)
-            interval = st.selectbox(
-                "Interval", 
-                ["1d", "all", "max"], 
-                format_func=lambda x: {"1d": "⚡ 1 DAY", "all": "⚡ 1 WEEK", "max": "⚡ ALL TIME"}[x],
-                label_visibility="collapsed",
-                key="interval_select"
-            )
-        
-        market = real_markets[selected_idx]
-        token_ids = market.get("clob_token_ids", [])
-        
-        if token_ids:
-            history = clob.get_price_history(token_ids[0], interval)
-            if history:
-                times = [datetime.fromtimestamp(t) for t, p in history]
-                prices = [p * 100 for t, p in history]
-                
-                fig = go.Figure()
-                fig.add_trace(go.Scatter(
-                    x=times, y=prices,
-                    mode='lines',
-                    line=dict(color='#00f5ff', width=3),
-                    fill='tozeroy',
-                    fillcolor='rgba(0, 245, 255, 0.2)',
-                    hovertemplate='%{y:.1f}%<extra></extra>'
-                ))
-                
-                fig.update_layout(
-                    height=400,
-                    margin=dict(l=0, r=0, t=20, b=0),
-                    xaxis=dict(
-                        showgrid=True, 
-                        gridcolor='rgba(0, 245, 255, 0.1)',
-                        color='#00f5ff'
-                    ),
-                    yaxis=dict(
-                        range=[0, 100], 
-                        showgrid=True, 
-                        gridcolor='rgba(255, 0, 255, 0.1)',
-                        color='#ff00ff'
-                    ),
-                    plot_bgcolor='rgba(10, 14, 39, 0.8)',
-                    paper_bgcolor='rgba(10, 14, 39, 0.8)',
-                    font=dict(family='Rajdhani', color='#00f5ff')
-                )
-                
+    
+    with col2:
+        st.markdown('<p style="color: #00f5ff; font-weight: 600; margin-bottom: 0.5rem;">TIME RANGE:</p>', unsafe_allow_html=True)
+        interval = st.selectbox(
+            "Interval", 
+            ["1d", "all", "max"], 
+            format_func=lambda x: {"1d": "⚡ 1 DAY", "all": "⚡ 1 WEEK", "max": "⚡ ALL TIME"}[x],
+            label_visibility="collapsed",
+            key="interval_select"
+        )
+    
+    if overlay:
+        render_overlay_chart(real_markets, interval)
+        return
+    
+    market = real_markets[selected_idx]
+    token_ids = market.clob_token_ids
+    
+    if token_ids:
+        history = data.price_history(token_ids[0], interval)
+        if history:
+            # Live tail: extend the cached history to the latest tick
+            tick = get_live_feed().get_prices([token_ids[0]])[token_ids[0]]
+            tail = (tick.get("updated") or time.time(), live_price(tick, history[-1][1])) if tick else None
+            with live_history_figure(token_ids[0], interval, history, tail) as fig:
                 st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.info("🔴 NO DATA AVAILABLE FOR THIS TIMEFRAME")
         else:
-            st.info("🔴 NO CHART DATA AVAILABLE")
+            st.info("🔴 NO DATA AVAILABLE FOR THIS TIMEFRAME")
+    else:
+        st.info("🔴 NO CHART DATA AVAILABLE")
+
+
+def resolve_selected_event():
+    """Sync the selected event with the ?event=<id> query parameter."""
+    event_id = st.query_params.get("event")
+    if not event_id:
+        return
+    selected = st.session_state.selected_event
+    if selected is not None and get_event(selected).id == event_id:
+        return
+    model = catalog.get_event(event_id)
+    if model is None:
+        # Direct link to an event this process hasn't loaded yet
+        raw = data.event(event_id)
+        model = catalog.add_event(raw) if raw else None
+    if model is None:
+        st.query_params.pop("event", None)
+    st.session_state.selected_event = model
+
+
+@timed_render
+def render_overlay_chart(real_markets, interval):
+    """Every real market's Yes token on one chart."""
+    charted = [m for m in real_markets if m.clob_token_ids]
+    yes_tokens = [m.clob_token_ids[0] for m in charted]
+    # One concurrent round of fetches instead of one per market
+    histories = data.price_histories(yes_tokens, interval)
+    series = [(m.label[:40], histories[t]) for m, t in zip(charted, yes_tokens) if histories[t]]
+    if not series:
+        st.info("🔴 NO DATA AVAILABLE FOR THIS TIMEFRAME")
+        return
+    labels, values = zip(*series)
+    event = get_event(st.session_state.selected_event)
+    st.plotly_chart(overlay_figure(event.id, interval, labels, values), use_container_width=True)
+
+
+@timed_render
+def render_screener():
+    """Filter and sort every open market; picking a row opens its event."""
+    from screener import Filter
+    
+    if st.button("← Back"):
+        st.query_params.pop("page", None)
+        st.rerun()
+    st.title("📊 MARKET SCREENER")
+    try:
+        screener = get_screener()
+    except (requests.RequestException, ValueError) as e:
+        # Not cached, so the next rerun tries the walk again
+        print(f"Error loading screener catalog: {e}")
+        st.info("🔴 COULD NOT LOAD THE MARKET CATALOG, TRY AGAIN SHORTLY")
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        text = st.text_input("Question contains", key="screen_text")
+        price = st.slider("Price", 0.0, 1.0, (0.0, 1.0), 0.01, key="screen_price")
+    with col2:
+        min_volume = st.number_input("Min 24h volume ($)", 0, step=1000, key="screen_volume")
+        min_liquidity = st.number_input("Min liquidity ($)", 0, step=1000, key="screen_liquidity")
+    with col3:
+        max_spread = st.slider("Max spread (¢)", 0, 20, 20, key="screen_spread")
+        change = st.slider("24h change (¢)", -50, 50, (-50, 50), key="screen_change")
+    with col4:
+        ends = st.selectbox("Ends within", ["Any time", "1 day", "7 days", "30 days", "90 days"], key="screen_ends")
+        sorts = st.multiselect("Sort by", list(SCREENER_SORTS), ["24h volume ↓"], key="screen_sort")
+    
+    # Widgets left at their full range add no condition
+    filters = []
+    if text.strip():
+        filters.append(Filter("question", "contains", text.strip()))
+    if price != (0.0, 1.0):
+        filters.append(Filter("yes_price", "between", price))
+    if min_volume:
+        filters.append(Filter("volume_24h", ">=", min_volume))
+    if min_liquidity:
+        filters.append(Filter("liquidity", ">=", min_liquidity))
+    if max_spread < 20:
+        filters.append(Filter("spread", "<=", max_spread / 100))
+    if change != (-50, 50):
+        filters.append(Filter("price_change_24h", "between", (change[0] / 100, change[1] / 100)))
+    if ends != "Any time":
+        # Whole minutes, so the cached mask is reused across reruns
+        now = time.time() // 60 * 60
+        filters.append(Filter("end_ts", "between", (now, now + int(ends.split()[0]) * 86400)))
+    result = screener.screen(filters, [SCREENER_SORTS[label] for label in sorts])
+    
+    page = screener.rows(result, SCREENER_ROWS)
+    st.caption(
+        f"{result.total:,} of {len(screener):,} markets · screened in {result.seconds * 1000:.1f} ms · "
+        f"catalog loaded {time.strftime('%H:%M', time.localtime(screener.loaded_at))}"
+    )
+    table = {
+        "Event": page["event_title"].tolist(),
+        "Market": page["question"].tolist(),
+        "Price": [format_price(p) for p in page["yes_price"].tolist()],
+        "24h volume": [format_volume(v) for v in page["volume_24h"].tolist()],
+        "Liquidity": [format_volume(v) for v in page["liquidity"].tolist()],
+        "Spread": [f"{s * 100:.1f}¢" if s == s else "" for s in page["spread"].tolist()],
+        "24h change": [f"{c * 100:+.1f}¢" if c == c else "" for c in page["price_change_24h"].tolist()],
+        "Ends": [time.strftime("%Y-%m-%d", time.gmtime(t)) if t == t else "" for t in page["end_ts"].tolist()],
+    }
+    selection = st.dataframe(table, hide_index=True, use_container_width=True,
+                             on_select="rerun", selection_mode="single-row", key="screen_table")
+    picked = selection.selection.rows if selection else []
+    if picked:
+        st.query_params["event"] = page["event_id"][picked[0]]
+        st.rerun()
+
+
+def release_live_prices():
+    """Drop this session's live subscriptions, if it ever made any."""
+    if st.session_state.pop("live_watching", False):
+        get_live_feed().release(st.session_state.live_key)
 
 
 def main():
+    st.markdown(APP_CSS, unsafe_allow_html=True)
+    resolve_selected_event()
     if st.session_state.selected_event:
         render_event_detail()
+    elif st.query_params.get("page") == "screener":
+        release_live_prices()
+        render_screener()
     else:
+        release_live_prices()
         render_landing()
 
 
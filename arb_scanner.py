@@ -0,0 +1,292 @@
+"""
+Live cross-market consistency scanner: flags prices that don't add up.
+
+    python arb_scanner.py --top-events 200 --min-edge 0.01
+
+Outcome prices of an event should be consistent:
+
+    over_round   mutually exclusive (negRisk) event whose Yes bids sum
+                 above 1: selling every Yes pays out at most 1
+    under_round  negRisk event whose Yes asks, every market quoted, sum
+                 below 1: buying every Yes pays exactly 1
+    pair_over    binary market with Yes bid + No bid above 1
+    pair_under   binary market with Yes ask + No ask below 1
+    crossed      one token's best bid above its best ask
+
+An opportunity's ``edge`` is how far past 1 (or past the ask) it is, per
+share; it is flagged while the edge exceeds ``min_edge``.
+
+Each event keeps its markets' best bid/ask in per-outcome vectors, plus
+running sums of the Yes sides. A tick updates one slot and the sums, then
+re-checks only that token, its market and its event, so scanning the
+whole catalog costs the same per tick as scanning one event.
+"""
+import argparse
+import math
+import signal
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from token_index import CatalogIndex
+from utils import Event
+from ws_client import extract_price_update
+
+# Re-add the Yes sums from scratch after this many incremental updates,
+# so float error cannot accumulate
+_RESUM_EVERY = 1024
+
+
+class Opportunity(NamedTuple):
+    """One flagged inconsistency."""
+    kind: str
+    event_id: str
+    # -1 for event-level kinds
+    market_index: int
+    # -1 unless kind is "crossed"
+    outcome_index: int
+    edge: float
+    # Token ids involved
+    legs: Tuple[str, ...]
+    ts: float
+
+
+class _EventBook:
+    """Best bid/ask per market and outcome of one event, with Yes sums."""
+
+    __slots__ = ("model", "bids", "asks", "bid_sum", "bid_count", "ask_sum", "ask_count", "updates")
+
+    def __init__(self, model: Event, quotes: Dict[str, Tuple[float, float]]):
+        self.model = model
+        self.bids = [[quotes.get(t, (math.nan, math.nan))[0] for t in m.clob_token_ids] for m in model.markets]
+        self.asks = [[quotes.get(t, (math.nan, math.nan))[1] for t in m.clob_token_ids] for m in model.markets]
+        self.resum()
+
+    def resum(self):
+        yes_bids = [b[0] for b in self.bids if b and not math.isnan(b[0])]
+        yes_asks = [a[0] for a in self.asks if a and not math.isnan(a[0])]
+        self.bid_sum, self.bid_count = math.fsum(yes_bids), len(yes_bids)
+        self.ask_sum, self.ask_count = math.fsum(yes_asks), len(yes_asks)
+        self.updates = 0
+
+    def set_quote(self, market_index: int, outcome_index: int, bid: float, ask: float):
+        """Store a token's quote, keeping the Yes sums current."""
+        if outcome_index == 0:
+            old_bid = self.bids[market_index][0]
+            old_ask = self.asks[market_index][0]
+            self.bid_sum, self.bid_count = _replace(self.bid_sum, self.bid_count, old_bid, bid)
+            self.ask_sum, self.ask_count = _replace(self.ask_sum, self.ask_count, old_ask, ask)
+        self.bids[market_index][outcome_index] = bid
+        self.asks[market_index][outcome_index] = ask
+        self.updates += 1
+        if self.updates >= _RESUM_EVERY:
+            self.resum()
+
+
+def _replace(total: float, count: int, old: float, new: float) -> Tuple[float, int]:
+    """Swap one term of a sum of non-NaN values (NaN = absent)."""
+    if not math.isnan(old):
+        total -= old
+        count -= 1
+    if not math.isnan(new):
+        total += new
+        count += 1
+    return total, count
+
+
+class ArbScanner:
+    """
+    Scans live quotes of every token in a CatalogIndex for inconsistencies.
+
+    Attach to a WSClient or WSConnectionManager with ``add_listener(scanner)``
+    and subscribe ``catalog.token_ids()``. Callbacks added with
+    ``add_listener`` get each Opportunity when it is first flagged.
+    """
+
+    def __init__(self, catalog: CatalogIndex, min_edge: float = 0.005):
+        """
+        Args:
+            catalog: Index of the events to scan (kept up to date by the caller)
+            min_edge: Smallest edge per share that is flagged
+        """
+        self.catalog = catalog
+        self.min_edge = min_edge
+        self.books: Dict[str, _EventBook] = {}
+        # Latest (bid, ask) per token, for rebuilding books of re-indexed events
+        self.quotes: Dict[str, Tuple[float, float]] = {}
+        self.opportunities: Dict[Tuple[str, str, int, int], Opportunity] = {}
+        self.listeners: List[Callable[[Opportunity], None]] = []
+        self.stats = {"ticks": 0, "flagged": 0}
+        self.lock = threading.Lock()
+
+    def __call__(self, event: Dict, recv_ts: float):
+        """WSClient listener entry point."""
+        self.update(event, recv_ts)
+
+    def add_listener(self, callback: Callable[[Opportunity], None]):
+        self.listeners.append(callback)
+
+    def update(self, event: Dict, recv_ts: Optional[float] = None):
+        """
+        Fold one WebSocket event in and re-check what it affects.
+
+        Args:
+            event: Decoded book or price_change event (trades are ignored);
+                a book without bids or asks empties that side
+            recv_ts: Receive timestamp (defaults to now)
+        """
+        msg_type, asset_id, fields = extract_price_update(event)
+        if not asset_id:
+            return
+        if msg_type != "book" and "best_bid" not in fields and "best_ask" not in fields:
+            return
+        ref = self.catalog.lookup(asset_id)
+        if ref is None:
+            return
+        model = self.catalog.get_event(ref.event_id)
+        if model is None:
+            return
+        ts = recv_ts if recv_ts is not None else time.time()
+
+        with self.lock:
+            self.stats["ticks"] += 1
+            if msg_type == "book":
+                # A snapshot replaces both sides; one it leaves out is empty
+                old_bid = old_ask = math.nan
+            else:
+                old_bid, old_ask = self.quotes.get(asset_id, (math.nan, math.nan))
+            bid = fields.get("best_bid", old_bid)
+            ask = fields.get("best_ask", old_ask)
+            # A zero price is an empty side
+            bid = bid if bid > 0 else math.nan
+            ask = ask if ask > 0 else math.nan
+            self.quotes[asset_id] = (bid, ask)
+
+            book = self.books.get(model.id)
+            if book is None or book.model is not model:
+                # New event, or the catalog re-indexed it with other markets
+                self._drop_event(model.id)
+                book = self.books[model.id] = _EventBook(model, self.quotes)
+            else:
+                book.set_quote(ref.market_index, ref.outcome_index, bid, ask)
+
+            flagged = []
+            m, o = ref.market_index, ref.outcome_index
+            self._check(flagged, ("crossed", model.id, m, o), bid - ask, (asset_id,), ts)
+            tokens = model.markets[m].clob_token_ids
+            if len(tokens) == 2:
+                bids, asks = book.bids[m], book.asks[m]
+                self._check(flagged, ("pair_over", model.id, m, -1), bids[0] + bids[1] - 1, tokens, ts)
+                self._check(flagged, ("pair_under", model.id, m, -1), 1 - asks[0] - asks[1], tokens, ts)
+            if o == 0 and model.neg_risk and len(model.markets) > 1:
+                self._check_event(flagged, book, ts)
+            self.stats["flagged"] += len(flagged)
+
+        for opportunity in flagged:
+            for listener in self.listeners:
+                try:
+                    listener(opportunity)
+                except Exception as e:
+                    print(f"Error in arbitrage listener: {e}")
+
+    def get_opportunities(self, min_edge: Optional[float] = None) -> List[Opportunity]:
+        """
+        Currently flagged opportunities, largest edge first.
+
+        Args:
+            min_edge: Only those with at least this edge (default: all flagged)
+        """
+        with self.lock:
+            found = list(self.opportunities.values())
+        if min_edge is not None:
+            found = [o for o in found if o.edge >= min_edge]
+        return sorted(found, key=lambda o: o.edge, reverse=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.stats, events=len(self.books), open=len(self.opportunities))
+
+    def _check_event(self, flagged: List[Opportunity], book: _EventBook, ts: float):
+        """Event-level Yes sums (lock held)."""
+        model = book.model
+        yes_tokens = tuple(m.clob_token_ids[0] for m in model.markets if m.clob_token_ids)
+        # Selling every quoted Yes is safe whatever the rest do
+        over = book.bid_sum - 1 if book.bid_count else math.nan
+        # Buying every Yes only pays if every outcome is covered
+        under = 1 - book.ask_sum if book.ask_count == len(model.markets) else math.nan
+        self._check(flagged, ("over_round", model.id, -1, -1), over, yes_tokens, ts)
+        self._check(flagged, ("under_round", model.id, -1, -1), under, yes_tokens, ts)
+
+    def _check(self, flagged: List[Opportunity], key: Tuple[str, str, int, int], edge: float,
+               legs: Tuple[str, ...], ts: float):
+        """Flag, refresh or clear one opportunity; NaN edges clear (lock held)."""
+        if edge > self.min_edge:
+            kind, event_id, market_index, outcome_index = key
+            opportunity = Opportunity(kind, event_id, market_index, outcome_index, edge, tuple(legs), ts)
+            if key not in self.opportunities:
+                flagged.append(opportunity)
+            self.opportunities[key] = opportunity
+        else:
+            self.opportunities.pop(key, None)
+
+    def _drop_event(self, event_id: str):
+        """Forget an event's book and opportunities (lock held)."""
+        self.books.pop(event_id, None)
+        for key in [k for k in self.opportunities if k[1] == event_id]:
+            del self.opportunities[key]
+
+
+def format_opportunity(opportunity: Opportunity, catalog: CatalogIndex) -> str:
+    """One-line description, with the event title and market label."""
+    event = catalog.get_event(opportunity.event_id)
+    where = event.title if event is not None else opportunity.event_id
+    if event is not None and 0 <= opportunity.market_index < len(event.markets):
+        where += f" / {event.markets[opportunity.market_index].label}"
+    return f"{opportunity.kind:<11} edge {opportunity.edge * 100:5.2f}¢  {where}"
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Flag live Polymarket prices that don't add up.")
+    parser.add_argument("--top-events", type=int, default=200, help="scan this many popular events")
+    parser.add_argument("--min-edge", type=float, default=0.005, help="smallest edge per share to flag")
+    parser.add_argument("--per-connection", type=int, default=500, help="assets per WebSocket connection")
+    parser.add_argument("--report-every", type=float, default=30.0, help="seconds between summaries")
+    args = parser.parse_args(argv)
+
+    import requests
+    from gamma_client import GammaClient
+    from ws_manager import WSConnectionManager
+
+    catalog = CatalogIndex()
+    gamma = GammaClient()
+    try:
+        while len(catalog) < args.top_events:
+            page = list(gamma.iter_popular_events(min(500, args.top_events - len(catalog)), len(catalog)))
+            if not page:
+                break
+            catalog.add_events(page)
+    except (requests.RequestException, ValueError) as e:
+        if not len(catalog):
+            parser.exit(1, f"Error loading events: {e}\n")
+        print(f"Error loading events, scanning the first {len(catalog)} only: {e}")
+
+    scanner = ArbScanner(catalog, args.min_edge)
+    scanner.add_listener(lambda o: print(format_opportunity(o, catalog)))
+    manager = WSConnectionManager(max_assets_per_connection=args.per_connection)
+    manager.add_listener(scanner)
+    manager.subscribe(catalog.token_ids())
+    print(f"Scanning {len(catalog)} events ({len(catalog.tokens)} tokens)")
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    while not stop.wait(args.report_every):
+        stats = scanner.get_stats()
+        print(f"{stats['ticks']} ticks, {stats['open']} open opportunities")
+        for opportunity in scanner.get_opportunities()[:10]:
+            print("  " + format_opportunity(opportunity, catalog))
+    manager.disconnect()
+
+
+if __name__ == "__main__":
+    main()
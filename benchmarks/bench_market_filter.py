@@ -0,0 +1,120 @@
+"""
+Benchmark the placeholder-market filter against the original implementation.
+
+    python -m benchmarks.bench_market_filter
+"""
+import json
+import random
+import re
+import time
+
+import market_filter
+from utils import get_event
+
+
+def legacy_is_real_market(market_dict):
+    """The pre-market_filter implementation from app.py, kept for comparison."""
+    question = market_dict.get("question", "").lower()
+    outcomes = market_dict.get("outcomes", [])
+
+    if not outcomes or len(outcomes) == 0:
+        return False
+
+    question_placeholder_patterns = [
+        r'\bindividual\s+[a-z0-9]\b',
+        r'\bleader\s+\d+\b',
+        r'\bperson\s+[a-z0-9]\b',
+        r'\bcandidate\s+[a-z]\b',
+        r'\boption\s+[a-z0-9]\b',
+        r'\bchoice\s+[a-z0-9]\b',
+        r'\bteam\s+[a-z0-9]\b',
+        r'\bplayer\s+[a-z0-9]\b',
+        r'\bcompany\s+[a-z0-9]\b',
+    ]
+    for pattern in question_placeholder_patterns:
+        if re.search(pattern, question):
+            return False
+
+    if any(kw in question for kw in ["test market", "placeholder", "example", "dummy", "sample"]):
+        return False
+
+    real_outcomes = 0
+    for outcome in outcomes:
+        outcome_str = str(outcome).strip().lower()
+        placeholder_patterns = [
+            r'^(individual|leader|person|candidate|option|choice|team|player|company)\s*[a-z0-9]$',
+            r'^(individual|leader|person|candidate|option|choice|team|player|company)\s*\d+$',
+            r'^[a-z]$',
+            r'^\d+$',
+        ]
+        is_placeholder = any(re.match(pattern, outcome_str) for pattern in placeholder_patterns)
+        if outcome_str in ["yes", "no", "up", "down", "true", "false"]:
+            real_outcomes += 1
+        elif not is_placeholder and len(outcome_str) > 1:
+            real_outcomes += 1
+    return real_outcomes > 0
+
+
+def make_events(n_events: int = 40, markets_per_event: int = 25, seed: int = 7):
+    """Synthetic landing-page events, with some placeholder markets mixed in."""
+    rng = random.Random(seed)
+    names = ["Smith", "Jones", "Garcia", "Lee", "Patel", "Nguyen", "Kim", "Brown"]
+    events = []
+    for i in range(n_events):
+        markets = []
+        for j in range(markets_per_event):
+            if rng.random() < 0.2:
+                question = f"Will Person {chr(97 + j % 26)} win election {i}?"
+            else:
+                question = f"Will {rng.choice(names)} win the {2026 + j % 4} race in district {i}?"
+            markets.append({
+                "id": f"{i}-{j}",
+                "question": question,
+                "outcomes": json.dumps(["Yes", "No"]),
+                "outcomePrices": json.dumps(["0.4", "0.6"]),
+                "clobTokenIds": json.dumps([f"{i}{j}1", f"{i}{j}2"]),
+            })
+        events.append({"id": str(i), "title": f"Event {i}", "markets": markets})
+    return events
+
+
+def _time(fn, repeat: int) -> float:
+    """Best-of-``repeat`` wall time in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    events = make_events()
+    markets = [m for e in events for m in get_event(e).markets]
+    legacy_markets = [
+        {"question": m.question, "outcomes": list(m.outcomes)} for m in markets
+    ]
+
+    mismatches = sum(
+        legacy_is_real_market(d) != market_filter.is_real_market(m)
+        for d, m in zip(legacy_markets, markets)
+    )
+
+    legacy = _time(lambda: [legacy_is_real_market(d) for d in legacy_markets], 5)
+
+    def cold():
+        market_filter.clear_cache()
+        market_filter.filter_real_events(events)
+
+    cold_time = _time(cold, 5)
+    market_filter.filter_real_events(events)
+    warm_time = _time(lambda: market_filter.filter_real_events(events), 20)
+
+    print(f"{len(events)} events, {len(markets)} markets, {mismatches} verdict mismatches")
+    print(f"legacy is_real_market   {legacy * 1e3:8.3f} ms")
+    print(f"filter_real_events cold {cold_time * 1e3:8.3f} ms  ({legacy / cold_time:5.1f}x)")
+    print(f"filter_real_events warm {warm_time * 1e3:8.3f} ms  ({legacy / warm_time:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
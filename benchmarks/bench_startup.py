@@ -0,0 +1,132 @@
+"""
+Benchmark cold start: module import time and time to first render of app.py.
+
+    python -m benchmarks.bench_startup [--runs 5]
+
+Every measurement runs in a fresh interpreter so nothing is already
+imported. The first render uses Streamlit's AppTest with the Gamma and
+CLOB clients stubbed (synthetic events, empty histories), so it needs no
+network and measures only this process's work.
+"""
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "app.py")
+
+# Third-party packages that should only load when their feature is used.
+# (plotly.graph_objects is not listed: streamlit itself imports it.)
+LAZY_PACKAGES = ["numpy", "websocket"]
+
+_RENDER_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from benchmarks.bench_market_filter import make_events
+import gamma_client, clob_client
+events = make_events(n_events=120, markets_per_event=3)
+gamma_client.GammaClient.get_popular_events = lambda self, limit=20, offset=0: events[offset:offset + limit]
+gamma_client.GammaClient.search_events_public = lambda self, query, limit_per_type=20: []
+clob_client.CLOBClient.get_price_history = lambda self, token_id, interval="1d": []
+from streamlit.testing.v1 import AppTest
+ready = time.perf_counter()
+at = AppTest.from_file({app!r}, default_timeout=60).run()
+done = time.perf_counter()
+assert not at.exception, at.exception
+loaded = [name for name in {lazy!r} if name in sys.modules]
+print(ready - start, done - ready, done - start, ",".join(loaded))
+"""
+
+
+def app_modules() -> List[str]:
+    """Top-level modules app.py imports."""
+    with open(APP, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def import_profile(modules: List[str]) -> Dict[str, int]:
+    """
+    Cumulative import time (microseconds) per module, from -X importtime.
+
+    The "<total>" entry sums the top-level (non-nested) imports only, so
+    nothing is counted twice.
+
+    Args:
+        modules: Modules imported (in order) by the child interpreter
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    profile = {"<total>": 0}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        profile[name.strip()] = int(cumulative)
+        if name.startswith(" ") and not name.startswith("  "):
+            profile["<total>"] += int(cumulative)
+    return profile
+
+
+def first_render() -> List[str]:
+    """One cold AppTest run; returns [setup s, render s, total s, lazy modules loaded]."""
+    script = _RENDER_SCRIPT.format(root=ROOT, app=APP, lazy=LAZY_PACKAGES)
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+    return (result.stdout.strip().splitlines() or [""])[-1].split(" ")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure app cold-start time.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    args = parser.parse_args(argv)
+
+    modules = app_modules()
+    local = [m for m in modules if os.path.exists(os.path.join(ROOT, m + ".py"))]
+
+    totals, streamlit_only = [], []
+    per_module: Dict[str, List[int]] = {m: [] for m in local}
+    lazy_loaded = set()
+    for _ in range(args.runs):
+        profile = import_profile(modules)
+        totals.append(profile["<total>"])
+        streamlit_only.append(profile.get("streamlit", 0))
+        for m in local:
+            per_module[m].append(profile.get(m, 0))
+        lazy_loaded.update(p for p in LAZY_PACKAGES if p in profile)
+
+    print(f"app.py imports ({args.runs} fresh interpreters, median)")
+    print(f"  all imports        {statistics.median(totals) / 1e3:8.1f} ms")
+    print(f"  streamlit          {statistics.median(streamlit_only) / 1e3:8.1f} ms")
+    for m in sorted(local, key=lambda m: -statistics.median(per_module[m])):
+        print(f"  {m:<18} {statistics.median(per_module[m]) / 1e3:8.1f} ms")
+    print(f"  eager heavy deps: {', '.join(sorted(lazy_loaded)) or 'none'}")
+
+    runs = [first_render() for _ in range(args.runs)]
+    render = statistics.median(float(r[1]) for r in runs)
+    total = statistics.median(float(r[2]) for r in runs)
+    loaded = sorted({name for r in runs if len(r) > 3 and r[3] for name in r[3].split(",")})
+    print("first render (landing page, stubbed clients, median)")
+    print(f"  AppTest run        {render * 1e3:8.1f} ms")
+    print(f"  incl. setup        {total * 1e3:8.1f} ms")
+    print(f"  heavy deps loaded: {', '.join(loaded) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
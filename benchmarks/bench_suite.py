@@ -0,0 +1,339 @@
+"""
+Microbenchmark suite for the parsing, filtering, WebSocket, alert, arbitrage, screener and chart hot paths.
+
+    python -m benchmarks.bench_suite                     # run, save, compare to baseline
+    python -m benchmarks.bench_suite --save-baseline     # also make this run the baseline
+    python -m benchmarks.bench_suite -k ws. --repeat 20  # subset, more repeats
+    python -m benchmarks.bench_suite --startup           # include the cold-start benchmark
+
+Payloads come from benchmarks.fixtures (recorded if present, else
+synthetic). Each case is timed ``--repeat`` times and reported as the
+median time per item. Every run is written to
+``benchmarks/results/<timestamp>.json``. When a baseline exists, cases
+whose best per-item time (least disturbed by other load) grew by more
+than ``--threshold`` are listed and the exit status is 1, so CI can
+gate on it.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from benchmarks.fixtures import Fixtures, load_fixtures
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+BASELINE = os.path.join(RESULTS_DIR, "baseline.json")
+# Relative slowdown of a case's best time that counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+
+class Case(NamedTuple):
+    """One benchmark: ``fn`` processes ``items`` items per call."""
+    name: str
+    fn: Callable[[], Any]
+    items: int
+    # Untimed, run before every timed call (e.g. to clear a cache)
+    setup: Optional[Callable[[], Any]] = None
+
+
+def build_cases(fx: Fixtures) -> List[Case]:
+    """The suite's cases over one set of fixtures."""
+    import alerts
+    import arb_scanner
+    import bulk_parser
+    import charts
+    import market_filter
+    import utils
+    from benchmarks.bench_market_filter import legacy_is_real_market
+    from screener import Filter, Screener
+    from token_index import CatalogIndex
+    from ws_client import WSClient
+
+    events = fx.events
+    utils.clear_event_cache()
+    markets = [m for e in events for m in utils.get_event(e).markets]
+    legacy_markets = [{"question": m.question, "outcomes": list(m.outcomes)} for m in markets]
+
+    # Raw numeric fields as the API sends them: strings, numbers, blanks
+    raw_numbers = []
+    for event in events:
+        raw_numbers.append(event.get("volume"))
+        for market in event.get("markets") or []:
+            raw_numbers.extend([market.get("volume"), market.get("liquidity"), market.get("volume24hr"),
+                                market.get("bestBid"), market.get("lastPrice"), market.get("outcomePrices")])
+    volumes = [utils.safe_float(v) for v in raw_numbers]
+
+    ws_events = fx.ws_events
+    frames = [json.dumps(event) for event in ws_events]
+    history = fx.history
+    clients = {}
+
+    def fresh_client():
+        clients["ws"] = WSClient()
+
+    def parse_all():
+        for event in events:
+            utils.parse_markets_from_event(event)
+
+    def token_ids_all():
+        for event in events:
+            utils.get_all_token_ids(event)
+
+    def process_all():
+        process = clients["ws"]._process_message
+        ts = time.time()
+        for event in ws_events:
+            process(event, ts)
+
+    def cached_figures():
+        for _ in range(1000):
+            charts.history_figure("bench", "max", history)
+
+    # The same 1k live rules among 9k or 99k that never fire (both enough
+    # to index every asset): per-tick cost should not grow with rule count
+    alert_assets = sorted({event.get("asset_id") for event in ws_events if event.get("asset_id")})
+
+    def random_rules(rng, count, offset, dormant):
+        for i in range(offset, offset + count):
+            kind = rng.choice(alerts.KINDS)
+            if dormant:
+                threshold = rng.uniform(1.5, 2.0) if kind != "move" else rng.uniform(1e3, 2e3)
+            else:
+                threshold = rng.random() if kind == "price" else rng.uniform(0.01, 0.5)
+            yield alerts.AlertRule(str(i), rng.choice(alert_assets), kind, threshold, rng.choice(alerts.DIRECTIONS),
+                                   window=rng.choice([60, 300]) if kind == "move" else 0)
+
+    engines = {}
+    for n_rules in (10_000, 100_000):
+        engine = engines[n_rules] = alerts.AlertEngine([alerts.MemorySink()])
+        engine.add_rules(random_rules(random.Random(1), 1_000, 0, False))
+        engine.add_rules(random_rules(random.Random(2), n_rules - 1_000, 1_000, True))
+
+    def alerts_all(n_rules):
+        engine = engines[n_rules]
+        ts = time.time()
+        for event in ws_events:
+            engine.update(event, ts)
+        engine.sinks[0].drain()
+
+    # The same ticks, re-pointed at tokens of the fixture catalog
+    arb_catalog = CatalogIndex()
+    arb_catalog.add_events(events)
+    catalog_tokens = arb_catalog.token_ids()
+    token_for = {asset: catalog_tokens[i * 7 % len(catalog_tokens)] for i, asset in enumerate(alert_assets)}
+    arb_events = [dict(event, asset_id=token_for[event["asset_id"]]) for event in ws_events
+                  if event.get("asset_id") in token_for]
+
+    def fresh_scanner():
+        clients["arb"] = arb_scanner.ArbScanner(arb_catalog)
+
+    def scan_all():
+        update = clients["arb"].update
+        ts = time.time()
+        for event in arb_events:
+            update(event, ts)
+
+    screener = Screener(bulk_parser.parse_events_bulk(events))
+    screen_filters = [Filter("yes_price", "between", (0.2, 0.8)), Filter("volume_24h", ">=", 100.0),
+                      Filter("spread", "<=", 0.05), Filter("question", "contains", "smith")]
+    screen_sort = [("volume_24h", True), ("yes_price", False)]
+
+    def clear_screener():
+        screener._masks.clear()
+        screener._orders.clear()
+
+    def frames_all():
+        handle = clients["ws"]._handle_frame
+        ts = time.time()
+        for frame in frames:
+            handle(frame, ts)
+
+    return [
+        Case("utils.parse_markets_from_event.cold", parse_all, len(events), utils.clear_event_cache),
+        Case("utils.parse_markets_from_event.warm", parse_all, len(events)),
+        Case("utils.get_all_token_ids.warm", token_ids_all, len(events)),
+        Case("bulk_parser.parse_events_bulk", lambda: bulk_parser.parse_events_bulk(events), len(events)),
+        Case("market_filter.is_real_market.cold", lambda: [market_filter.is_real_market(m) for m in markets],
+             len(markets), market_filter.clear_cache),
+        Case("market_filter.is_real_market.warm", lambda: [market_filter.is_real_market(m) for m in markets],
+             len(markets)),
+        Case("market_filter.legacy_is_real_market", lambda: [legacy_is_real_market(d) for d in legacy_markets],
+             len(legacy_markets)),
+        Case("utils.safe_float.bulk", lambda: [utils.safe_float(v) for v in raw_numbers], len(raw_numbers)),
+        Case("utils.format_volume.bulk", lambda: [utils.format_volume(v) for v in volumes], len(volumes)),
+        Case("ws.process_message", process_all, len(ws_events), fresh_client),
+        Case("ws.handle_frame", frames_all, len(frames), fresh_client),
+        Case("alerts.update.10k_rules", lambda: alerts_all(10_000), len(ws_events)),
+        Case("alerts.update.100k_rules", lambda: alerts_all(100_000), len(ws_events)),
+        Case("arb_scanner.update", scan_all, len(arb_events), fresh_scanner),
+        Case("screener.screen.cold", lambda: screener.screen(screen_filters, screen_sort), len(screener.table),
+             clear_screener),
+        Case("screener.screen.warm", lambda: screener.screen(screen_filters, screen_sort), len(screener.table)),
+        Case("charts.history_arrays", lambda: charts.history_arrays(history), len(history)),
+        Case("charts.build_history_figure", lambda: charts.build_history_figure(history), len(history)),
+        Case("charts.history_figure.warm", cached_figures, 1000),
+    ]
+
+
+def run_case(case: Case, repeat: int) -> Dict[str, float]:
+    """
+    Time a case; one untimed warm-up call first (imports, lazy init).
+
+    The garbage collector is paused during timed calls, as timeit does.
+    """
+    if case.setup:
+        case.setup()
+    case.fn()
+    times = []
+    for _ in range(repeat):
+        if case.setup:
+            case.setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            case.fn()
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    median = statistics.median(times)
+    return {
+        "items": case.items,
+        "repeat": repeat,
+        "median_s": median,
+        "min_s": min(times),
+        "per_item_us": median / case.items * 1e6 if case.items else 0.0,
+        "best_per_item_us": min(times) / case.items * 1e6 if case.items else 0.0,
+        "items_per_s": case.items / median if median else 0.0,
+    }
+
+
+def startup_result(runs: int) -> Dict[str, float]:
+    """Cold first render (see bench_startup), as a suite result."""
+    from benchmarks.bench_startup import first_render
+
+    renders = [float(first_render()[1]) for _ in range(runs)]
+    median = statistics.median(renders)
+    return {"items": 1, "repeat": runs, "median_s": median, "min_s": min(renders),
+            "per_item_us": median * 1e6, "best_per_item_us": min(renders) * 1e6, "items_per_s": 1 / median}
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> Dict[str, str]:
+    """
+    Cases whose best per-item time is slower than baseline by more than
+    ``threshold``.
+
+    Args:
+        results: This run's results by case name
+        baseline: Baseline results by case name
+        threshold: Allowed relative slowdown (0.15 = 15%)
+
+    Returns:
+        Regressed case name -> description
+    """
+    regressions = {}
+    for name, result in results.items():
+        old = baseline.get(name)
+        if not old or not old.get("best_per_item_us"):
+            continue
+        ratio = result["best_per_item_us"] / old["best_per_item_us"]
+        if ratio > 1 + threshold:
+            regressions[name] = (
+                f"{name}: {old['best_per_item_us']:.3f} -> {result['best_per_item_us']:.3f} us/item ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def git_revision() -> str:
+    """Short commit hash of the working tree, or "" outside git."""
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the hot-path microbenchmarks.")
+    parser.add_argument("-k", "--filter", help="only cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=9, help="timed calls per case")
+    parser.add_argument("--baseline", default=BASELINE, help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown counted as a regression")
+    parser.add_argument("--save-baseline", action="store_true", help="write this run to --baseline too")
+    parser.add_argument("--output", help="results file (default: results/<timestamp>.json)")
+    parser.add_argument("--startup", action="store_true", help="include the cold-start first render")
+    args = parser.parse_args(argv)
+
+    fx = load_fixtures()
+    cases = [c for c in build_cases(fx) if not args.filter or args.filter in c.name]
+    print("fixtures: " + ", ".join(f"{k}={v}" for k, v in fx.sources.items()))
+    print(f"{'case':<40} {'median':>10} {'per item':>12} {'items/s':>12}")
+
+    results = {}
+    for case in cases:
+        result = results[case.name] = run_case(case, args.repeat)
+        print(f"{case.name:<40} {result['median_s'] * 1e3:8.2f}ms {result['per_item_us']:10.3f}us "
+              f"{result['items_per_s']:12,.0f}")
+    if args.startup and (not args.filter or args.filter in "startup.first_render"):
+        result = results["startup.first_render"] = startup_result(max(3, args.repeat // 2))
+        print(f"{'startup.first_render':<40} {result['median_s'] * 1e3:8.2f}ms")
+
+    baseline = None
+    regressions: Dict[str, str] = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("fixtures") != fx.sources:
+            print("warning: baseline was recorded with different fixtures")
+        regressions = compare(results, baseline["results"], args.threshold)
+        # Re-time flagged cases once, so a burst of load elsewhere on the
+        # machine isn't reported as a regression
+        by_name = {case.name: case for case in cases}
+        for name in regressions:
+            if name in by_name:
+                retry = run_case(by_name[name], args.repeat)
+                best = min(results[name]["best_per_item_us"], retry["best_per_item_us"])
+                results[name]["best_per_item_us"] = best
+        regressions = compare(results, baseline["results"], args.threshold)
+
+    run = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "fixtures": fx.sources,
+        },
+        "results": results,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("%Y%m%d-%H%M%S") + ".json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(run, f, indent=2)
+    print(f"results written to {output}")
+
+    status = 0
+    if baseline is not None:
+        for line in regressions.values():
+            print(f"REGRESSION {line}")
+        if regressions:
+            status = 1
+        else:
+            print(f"no regressions over {args.threshold:.0%} against {args.baseline}")
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+        print(f"baseline saved to {args.baseline}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
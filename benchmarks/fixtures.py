@@ -0,0 +1,228 @@
+"""
+Benchmark fixture payloads: recorded from the live APIs, or synthetic.
+
+    python -m benchmarks.fixtures --events 1000 --ws-seconds 30
+
+records into ``benchmarks/fixtures/``:
+
+    events.json     raw Gamma /events pages (unprojected)
+    history.json    one CLOB price history, [[t, p], ...]
+    ws/             tick journal of market channel events (tick_recorder)
+
+``load_fixtures`` uses whichever recorded files exist and fills the rest
+with deterministic synthetic payloads shaped like the real ones, so the
+suite runs anywhere and two runs on one machine are comparable.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from typing import Dict, List, NamedTuple, Tuple
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+_NAMES = ["Smith", "Jones", "Garcia", "Lee", "Patel", "Nguyen", "Kim", "Brown", "Silva", "Khan"]
+
+
+class Fixtures(NamedTuple):
+    """Payloads the benchmark suite runs over."""
+    events: List[Dict]
+    history: List[Tuple[int, float]]
+    ws_events: List[Dict]
+    # "recorded" or "synthetic" per payload
+    sources: Dict[str, str]
+
+
+def synthetic_events(n_events: int = 1000, markets_per_event: int = 8, seed: int = 7) -> List[Dict]:
+    """
+    Gamma-shaped events: JSON-string list fields, string numbers, and a
+    fifth of markets being placeholders ("Person C", bare-letter outcomes).
+    """
+    rng = random.Random(seed)
+    events = []
+    for i in range(n_events):
+        markets = []
+        for j in range(rng.randint(1, markets_per_event * 2 - 1)):
+            placeholder = rng.random() < 0.2
+            if placeholder:
+                question = f"Will Person {chr(65 + j % 26)} win election {i}?"
+                outcomes = [chr(65 + j % 26), "Other"] if rng.random() < 0.5 else ["Yes", "No"]
+            else:
+                question = f"Will {rng.choice(_NAMES)} win the {2026 + j % 4} race in district {i}?"
+                outcomes = ["Yes", "No"]
+            yes = round(rng.random(), 3)
+            markets.append({
+                "id": str(500_000 + i * 100 + j),
+                "question": question,
+                "groupItemTitle": question.split(" win")[0][5:],
+                "outcomes": json.dumps(outcomes),
+                "outcomePrices": json.dumps([str(yes), str(round(1 - yes, 3))]),
+                "clobTokenIds": json.dumps([str(rng.getrandbits(250)), str(rng.getrandbits(250))]),
+                "volume": f"{rng.lognormvariate(9, 2.5):.6f}",
+                "volume24hr": rng.lognormvariate(6, 2.5),
+                "liquidity": f"{rng.lognormvariate(8, 2):.4f}",
+                "bestBid": round(max(yes - 0.01, 0), 3),
+                "bestAsk": round(min(yes + 0.01, 1), 3),
+                # Derived, not drawn, so the rest of the payload stays put
+                "oneDayPriceChange": round((yes - 0.5) / 10, 4),
+                "endDate": f"{2026 + j % 4}-{1 + i % 12:02d}-{1 + j % 28:02d}T12:00:00Z",
+                "active": True,
+                "closed": False,
+            })
+        events.append({
+            "id": str(20_000 + i),
+            "slug": f"event-{i}",
+            "title": f"District {i} election winner",
+            "description": "Resolves to the certified winner. " * 4,
+            "volume": rng.lognormvariate(11, 2),
+            "liquidity": rng.lognormvariate(9, 2),
+            "negRisk": len(markets) > 2,
+            "markets": markets,
+        })
+    return events
+
+
+def synthetic_history(n_points: int = 20_000, seed: int = 7) -> List[Tuple[int, float]]:
+    """Minute-spaced random-walk price history."""
+    rng = random.Random(seed)
+    t = 1_700_000_000
+    price = 0.5
+    history = []
+    for _ in range(n_points):
+        price = min(max(price + rng.gauss(0, 0.004), 0.001), 0.999)
+        history.append((t, round(price, 4)))
+        t += 60
+    return history
+
+
+def synthetic_ws_events(n_events: int = 50_000, n_assets: int = 500, seed: int = 7) -> List[Dict]:
+    """Market channel mix: mostly price_change, some book and last_trade_price."""
+    rng = random.Random(seed)
+    assets = [str(rng.getrandbits(250)) for _ in range(n_assets)]
+    ts = 1_700_000_000_000
+    events = []
+    for _ in range(n_events):
+        asset = rng.choice(assets)
+        mid = rng.random()
+        ts += rng.randint(0, 20)
+        roll = rng.random()
+        if roll < 0.75:
+            events.append({
+                "event_type": "price_change", "asset_id": asset, "market": "0x" + asset[:16],
+                "price": f"{mid:.3f}", "size": f"{rng.uniform(1, 500):.2f}", "side": rng.choice(["BUY", "SELL"]),
+                "best_bid": f"{max(mid - 0.01, 0):.3f}", "best_ask": f"{min(mid + 0.01, 1):.3f}",
+                "timestamp": str(ts),
+            })
+        elif roll < 0.9:
+            events.append({
+                "event_type": "book", "asset_id": asset, "market": "0x" + asset[:16],
+                "bids": [{"price": f"{max(mid - 0.01 * k, 0):.2f}", "size": "100"} for k in range(1, 11)],
+                "asks": [{"price": f"{min(mid + 0.01 * k, 1):.2f}", "size": "100"} for k in range(1, 11)],
+                "timestamp": str(ts),
+            })
+        else:
+            events.append({
+                "event_type": "last_trade_price", "asset_id": asset, "market": "0x" + asset[:16],
+                "price": f"{mid:.3f}", "size": "25", "side": "BUY", "timestamp": str(ts),
+            })
+    return events
+
+
+def load_fixtures(fixture_dir: str = FIXTURE_DIR) -> Fixtures:
+    """
+    Recorded payloads where present, synthetic otherwise.
+
+    Args:
+        fixture_dir: Directory written by ``record``
+    """
+    sources = {}
+    events_path = os.path.join(fixture_dir, "events.json")
+    if os.path.exists(events_path):
+        with open(events_path, encoding="utf-8") as f:
+            events = json.load(f)
+        sources["events"] = "recorded"
+    else:
+        events = synthetic_events()
+        sources["events"] = "synthetic"
+
+    history_path = os.path.join(fixture_dir, "history.json")
+    if os.path.exists(history_path):
+        with open(history_path, encoding="utf-8") as f:
+            history = [tuple(point) for point in json.load(f)]
+        sources["history"] = "recorded"
+    else:
+        history = synthetic_history()
+        sources["history"] = "synthetic"
+
+    ws_dir = os.path.join(fixture_dir, "ws")
+    ws_events = []
+    if os.path.isdir(ws_dir):
+        from tick_recorder import read_journal
+        ws_events = [event for _, event in read_journal(ws_dir)]
+    if ws_events:
+        sources["ws"] = "recorded"
+    else:
+        ws_events = synthetic_ws_events()
+        sources["ws"] = "synthetic"
+    return Fixtures(events, history, ws_events, sources)
+
+
+def record(fixture_dir: str, n_events: int, ws_seconds: float, interval: str):
+    """
+    Record fixtures from the live APIs (needs network access).
+
+    Args:
+        fixture_dir: Output directory
+        n_events: Events to fetch, most active first
+        ws_seconds: Seconds of market channel traffic to journal (0 skips)
+        interval: Price history interval
+    """
+    from clob_client import CLOBClient
+    from gamma_client import GammaClient
+    from utils import get_all_token_ids
+
+    os.makedirs(fixture_dir, exist_ok=True)
+    gamma = GammaClient()
+    events = []
+    while len(events) < n_events:
+        page = list(gamma.iter_popular_events(min(500, n_events - len(events)), len(events), project=False))
+        events.extend(page)
+        if not page:
+            break
+    with open(os.path.join(fixture_dir, "events.json"), "w", encoding="utf-8") as f:
+        json.dump(events, f)
+    print(f"Recorded {len(events)} events")
+
+    tokens = [t for event in events for t in get_all_token_ids(event)]
+    if tokens:
+        history = CLOBClient().get_price_history(tokens[0], interval)
+        with open(os.path.join(fixture_dir, "history.json"), "w", encoding="utf-8") as f:
+            json.dump(history, f)
+        print(f"Recorded {len(history)} history points")
+
+    if ws_seconds > 0 and tokens:
+        from tick_recorder import TickRecorder
+        from ws_manager import WSConnectionManager
+
+        recorder = TickRecorder(journal_dir=os.path.join(fixture_dir, "ws"))
+        manager = WSConnectionManager(recorder=recorder)
+        manager.subscribe(tokens)
+        time.sleep(ws_seconds)
+        manager.disconnect()
+        recorder.close()
+        print(f"Recorded {recorder.events_recorded} WebSocket events")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record benchmark fixtures from the live APIs.")
+    parser.add_argument("--out", default=FIXTURE_DIR, help="fixture directory")
+    parser.add_argument("--events", type=int, default=1000, help="events to record")
+    parser.add_argument("--ws-seconds", type=float, default=30.0, help="seconds of WebSocket traffic (0 skips)")
+    parser.add_argument("--interval", default="max", help="price history interval")
+    args = parser.parse_args(argv)
+    record(args.out, args.events, args.ws_seconds, args.interval)
+
+
+if __name__ == "__main__":
+    main()
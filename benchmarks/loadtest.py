@@ -0,0 +1,517 @@
+"""
+Multi-session load test against local stand-in APIs.
+
+    python -m benchmarks.loadtest --sessions 20 --duration 60 --latency 0.08
+    python -m benchmarks.loadtest --sweep 10,20,40,80 --slo 1.0
+
+Starts benchmarks.mock_api in a child process (or uses ``--mock-url``),
+builds the app's shared services the way app.py's cache_resource getters
+do, and runs one thread per simulated session. Sessions land on the
+feed, load more pages, type searches, open events, switch chart
+intervals and the overlay, and go back, with think time in between;
+while on a detail page the live price and chart fragments rerun every
+LIVE_REFRESH_SECS, as the browser makes them.
+
+Each page step runs the same calls as the matching app.py render
+function: data service, catalog, prefetcher, search service, live feed,
+feed HTML and chart figures. Streamlit's own script rerun and delta
+serialization are not included (AppTest cannot run sessions
+concurrently), so the numbers are an upper bound on what one worker
+process serves.
+
+Reported: page views per second, p50/p99 latency per page, upstream
+API calls in total and per session, and the shared cache hit ratio.
+``--sweep`` repeats the run per session count with fresh services and
+reports the largest count whose p99 page latency stays within
+``--slo`` seconds: the capacity of one worker.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+import uuid
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional
+
+from plotly.io import to_json
+
+from charts import live_history_figure, overlay_figure
+from clob_client import CLOBClient
+from data_cache import CachedDataService, normalize_query
+from feed import FEED_CSS, feed_html, load_feed
+from gamma_client import GammaClient
+from live_feed import LiveFeed, live_price
+from market_filter import get_real_markets
+from prefetch import Prefetcher
+from search_service import SearchService
+from token_index import CatalogIndex
+from utils import format_price, get_event
+from ws_client import WSClient
+from ws_manager import WSConnectionManager
+
+# Mirrors app.py
+LIVE_REFRESH_SECS = 2
+PREFETCH_TOP_N = 8
+SEARCH_POLL_SECS = 0.5
+INTERVALS = ["1d", "all", "max"]
+
+# Pause after which the search box commits what has been typed
+TYPING_PAUSE_SECS = 0.3
+# Queries typed by sessions; all match the mock's synthetic catalog
+SEARCH_QUERIES = [
+    "district 12", "district 4", "smith", "garcia 2027", "election winner",
+    "lee district", "patel", "kim 2028", "district 7 winner", "nguyen",
+]
+# Next action and its weight, on the feed and on a detail page
+LANDING_ACTIONS = [("enter", 0.5), ("search", 0.25), ("load_more", 0.1), ("landing", 0.15)]
+DETAIL_ACTIONS = [("interval", 0.3), ("overlay", 0.1), ("select_market", 0.15), ("back", 0.45)]
+# Steps that are not page views (fragment reruns, intermediate keystrokes)
+BACKGROUND_STEPS = frozenset(["live_tick", "search_keystroke"])
+
+
+class Services(NamedTuple):
+    """The shared, per-process objects app.py builds with cache_resource."""
+    data: CachedDataService
+    catalog: CatalogIndex
+    live: LiveFeed
+    prefetcher: Prefetcher
+    search: SearchService
+
+
+def build_services(base_url: str, ws_url: str) -> Services:
+    """
+    Services wired to the stand-in APIs, as app.py's getters wire them.
+
+    Args:
+        base_url: Gamma and CLOB API root
+        ws_url: Market channel WebSocket URL
+    """
+    data = CachedDataService(GammaClient(base_url), CLOBClient(base_url))
+
+    def manager_factory(**kwargs) -> WSConnectionManager:
+        return WSConnectionManager(client_factory=lambda: WSClient(url=ws_url), **kwargs)
+
+    # A table name no feeder publishes, so prices come over the WebSocket
+    live = LiveFeed(table_name=f"polymarket_loadtest_{os.getpid()}", manager_factory=manager_factory)
+    return Services(data, CatalogIndex(), live, Prefetcher(data), SearchService(data))
+
+
+def close_services(services: Services):
+    services.live.close()
+    services.prefetcher.shutdown()
+
+
+class Recorder:
+    """Thread-safe latency samples and error counts per step."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def record(self, step: str, seconds: float):
+        with self.lock:
+            self.latencies[step].append(seconds)
+
+    def error(self, step: str):
+        with self.lock:
+            self.errors[step] += 1
+
+
+class Session:
+    """One simulated browser tab, driven by its own thread."""
+
+    def __init__(self, services: Services, recorder: Recorder, stop: threading.Event,
+                 think: float, seed: int):
+        """
+        Args:
+            services: Shared services
+            recorder: Where step latencies go
+            stop: Set when the run is over
+            think: Mean think time between actions, seconds
+            seed: Seed for this session's choices
+        """
+        self.services = services
+        self.recorder = recorder
+        self.stop = stop
+        self.think_time = think
+        self.rng = random.Random(seed)
+        self.key = uuid.uuid4().hex
+        self.feed_pages = 1
+        self.more = False
+        self.listing: List[Dict] = []
+        self.indexed_query: Optional[str] = None
+        self.event = None
+        self.real_markets = []
+        self.interval = INTERVALS[0]
+        self.overlay = False
+        self.market_idx = 0
+        self.live_watching = False
+
+    def run(self):
+        self.step("landing", self.landing)
+        while not self.stop.is_set():
+            self.think()
+            if self.stop.is_set():
+                break
+            actions = DETAIL_ACTIONS if self.event is not None else LANDING_ACTIONS
+            action = self.rng.choices([a for a, _ in actions], [w for _, w in actions])[0]
+            getattr(self, "do_" + action)()
+        self.release_live()
+        self.services.prefetcher.cancel(self.key)
+        self.services.search.cancel(self.key)
+
+    def step(self, name: str, fn, *args):
+        """Run and time one page step; errors are counted, not raised."""
+        start = time.perf_counter()
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"Error in {name}: {e}")
+            self.recorder.error(name)
+            return
+        self.recorder.record(name, time.perf_counter() - start)
+
+    def think(self):
+        """Idle; on a detail page the live fragments keep rerunning."""
+        end = time.monotonic() + self.rng.expovariate(1 / self.think_time)
+        while True:
+            now = time.monotonic()
+            wake = min(end, now + LIVE_REFRESH_SECS) if self.event is not None else end
+            if self.stop.wait(max(wake - now, 0)) or wake >= end:
+                return
+            self.step("live_tick", self.live_tick)
+
+    # Actions
+
+    def do_landing(self):
+        self.step("landing", self.landing)
+
+    def do_load_more(self):
+        if not self.more:
+            return self.do_landing()
+        self.feed_pages += 1
+        self.step("load_more", self.landing)
+
+    def do_search(self):
+        query = self.rng.choice(SEARCH_QUERIES)
+        # The box commits whenever typing pauses: a prefix or two, then all
+        cuts = sorted(self.rng.sample(range(3, len(query)), min(2, len(query) - 3)))
+        for cut in cuts:
+            self.step("search_keystroke", self.search_results, query[:cut], False)
+            if self.stop.wait(TYPING_PAUSE_SECS):
+                return
+        self.step("search", self.search_results, query, True)
+
+    def do_enter(self):
+        if not self.listing:
+            return self.do_landing()
+        # Users mostly open cards near the top
+        raw = self.listing[min(int(self.rng.expovariate(1 / 5)), len(self.listing) - 1)]
+        self.step("enter", self.enter, get_event(raw).id)
+
+    def do_interval(self):
+        self.interval = self.rng.choice([i for i in INTERVALS if i != self.interval])
+        self.step("interval", self.price_chart)
+
+    def do_overlay(self):
+        if len(self.real_markets) < 2:
+            return self.do_interval()
+        self.overlay = not self.overlay
+        self.step("overlay", self.price_chart)
+
+    def do_select_market(self):
+        if len(self.real_markets) < 2 or self.overlay:
+            return self.do_interval()
+        self.market_idx = self.rng.randrange(len(self.real_markets))
+        self.step("select_market", self.price_chart)
+
+    def do_back(self):
+        self.step("back", self.back)
+
+    # Pages, mirroring app.py's render functions
+
+    def landing(self):
+        """render_landing without a search query."""
+        data, catalog = self.services.data, self.services.catalog
+        pages, self.more = load_feed(data, self.feed_pages)
+        self.prefetch_charts(pages[0] if pages else [])
+        html = [FEED_CSS]
+        for page in pages:
+            catalog.add_events(page)
+            html.append(feed_html(page))
+        self.listing = [event for page in pages for event in page]
+
+    def search_results(self, query: str, wait: bool):
+        """render_search_results; with ``wait``, the reruns until results land."""
+        search = self.services.search
+        search.request(self.key, query)
+        while True:
+            result = search.result(self.key)
+            if result.query != normalize_query(query):
+                result = search.request(self.key, query)
+            if result.final and self.indexed_query != result.query:
+                self.indexed_query = result.query
+                self.services.catalog.add_events(result.events)
+                self.prefetch_charts(result.events)
+            if result.events:
+                feed_html(result.events, {"q": query})
+            if result.final or not wait or self.stop.wait(SEARCH_POLL_SECS):
+                break
+        if wait:
+            self.listing = result.events
+
+    def prefetch_charts(self, events):
+        tokens = []
+        for event in events[:PREFETCH_TOP_N]:
+            real_markets = get_real_markets(event)
+            if real_markets and real_markets[0].clob_token_ids:
+                tokens.append(real_markets[0].clob_token_ids[0])
+        self.services.prefetcher.prefetch(self.key, tokens)
+
+    def enter(self, event_id: str):
+        """resolve_selected_event, then render_event_detail."""
+        catalog = self.services.catalog
+        model = catalog.get_event(event_id)
+        if model is None:
+            raw = self.services.data.event(event_id)
+            model = catalog.add_event(raw) if raw else None
+        if model is None:
+            return
+        self.event = model
+        self.interval, self.overlay, self.market_idx = INTERVALS[0], False, 0
+        self.services.prefetcher.cancel(self.key)
+        self.real_markets = get_real_markets(model)
+        if self.real_markets:
+            self.live_markets()
+            self.price_chart()
+
+    def back(self):
+        self.event = None
+        self.real_markets = []
+        self.release_live()
+        self.landing()
+
+    def live_tick(self):
+        """One rerun of both detail fragments."""
+        if self.real_markets:
+            self.live_markets()
+            self.price_chart()
+
+    def live_markets(self):
+        """render_live_markets."""
+        live = self.services.live
+        live.watch(self.key, [t for m in self.real_markets for t in m.clob_token_ids])
+        self.live_watching = True
+        ticks = live.get_prices([t for m in self.real_markets for t in m.clob_token_ids[:4]])
+        for market in self.real_markets:
+            prices, tokens = market.outcome_prices, market.clob_token_ids
+            for i, _ in enumerate(market.outcomes[:4]):
+                snapshot = prices[i] if i < len(prices) else 0
+                tick = ticks.get(tokens[i], {}) if i < len(tokens) else {}
+                format_price(live_price(tick, snapshot))
+
+    def price_chart(self):
+        """render_price_chart (and render_overlay_chart)."""
+        data = self.services.data
+        if self.overlay:
+            charted = [m for m in self.real_markets if m.clob_token_ids]
+            yes_tokens = [m.clob_token_ids[0] for m in charted]
+            histories = data.price_histories(yes_tokens, self.interval)
+            series = [(m.label[:40], histories[t]) for m, t in zip(charted, yes_tokens) if histories[t]]
+            if series:
+                labels, values = zip(*series)
+                overlay_figure(self.event.id, self.interval, labels, values)
+            return
+        token_ids = self.real_markets[self.market_idx].clob_token_ids
+        if not token_ids:
+            return
+        history = data.price_history(token_ids[0], self.interval)
+        if history:
+            tick = self.services.live.get_prices([token_ids[0]])[token_ids[0]]
+            tail = (tick.get("updated") or time.time(), live_price(tick, history[-1][1])) if tick else None
+            with live_history_figure(token_ids[0], self.interval, history, tail) as fig:
+                # What st.plotly_chart does with it
+                to_json(fig.to_dict(), validate=False)
+
+    def release_live(self):
+        if self.live_watching:
+            self.live_watching = False
+            self.services.live.release(self.key)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100); 0.0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered))) - 1))]
+
+
+def start_mock(latency: float, jitter: float, n_events: int):
+    """
+    Run benchmarks.mock_api in a child process, so serving it doesn't
+    compete with the sessions for this process's GIL.
+
+    Returns:
+        (process, base URL)
+    """
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.mock_api", "--port", "0", "--latency", str(latency),
+         "--jitter", str(jitter), "--events", str(n_events)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    line = proc.stdout.readline()
+    if not line.startswith("listening on "):
+        proc.kill()
+        raise RuntimeError(f"mock API failed to start: {line!r}")
+    return proc, line.split()[-1]
+
+
+def mock_control(base_url: str, action: str) -> Dict[str, int]:
+    """GET /_stats or /_reset on the mock."""
+    with urllib.request.urlopen(f"{base_url}/_{action}", timeout=10) as response:
+        return json.loads(response.read())
+
+
+def run_load(base_url: str, sessions: int, duration: float, think: float = 3.0,
+             ramp: float = 2.0, seed: int = 7) -> Dict:
+    """
+    One load run with fresh services (cold caches, as a new worker).
+
+    Args:
+        base_url: Mock API root
+        sessions: Concurrent sessions
+        duration: Seconds to run after the first session starts
+        think: Mean think time between actions, seconds
+        ramp: Seconds over which session starts are spread
+        seed: Base seed for session behaviour
+
+    Returns:
+        Summary dict (see ``print_summary``)
+    """
+    ws_url = base_url.replace("http://", "ws://", 1) + "/ws/market"
+    services = build_services(base_url, ws_url)
+    recorder = Recorder()
+    stop = threading.Event()
+    mock_control(base_url, "reset")
+
+    threads = []
+    start = time.perf_counter()
+    for i in range(sessions):
+        session = Session(services, recorder, stop, think, seed + i)
+        thread = threading.Thread(target=session.run, name=f"session-{i}", daemon=True)
+        thread.start()
+        threads.append(thread)
+        if stop.wait(ramp / sessions):
+            break
+    stop.wait(max(duration - (time.perf_counter() - start), 0))
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    upstream = mock_control(base_url, "stats")
+    cache = services.data.stats()
+    prefetch = services.prefetcher.get_stats()
+    search = services.search.get_stats()
+    close_services(services)
+
+    pages = {}
+    for step, values in sorted(recorder.latencies.items()):
+        pages[step] = {"count": len(values), "p50_s": percentile(values, 50), "p99_s": percentile(values, 99),
+                       "errors": recorder.errors.get(step, 0)}
+    views = [v for step, values in recorder.latencies.items() if step not in BACKGROUND_STEPS for v in values]
+    http_calls = {k: v for k, v in upstream.items() if not k.startswith("ws_")}
+    total_calls = sum(http_calls.values())
+    return {
+        "sessions": sessions,
+        "elapsed_s": elapsed,
+        "page_views": len(views),
+        "page_views_per_s": len(views) / elapsed,
+        "steps_per_s": sum(p["count"] for p in pages.values()) / elapsed,
+        "p50_s": percentile(views, 50),
+        "p99_s": percentile(views, 99),
+        "errors": sum(recorder.errors.values()),
+        "pages": pages,
+        "upstream": upstream,
+        "upstream_calls": total_calls,
+        "upstream_per_session": total_calls / sessions if sessions else 0.0,
+        "cache_hit_ratio": cache.get("hit_ratio", 0.0),
+        "prefetch": prefetch,
+        "search": search,
+    }
+
+
+def print_summary(result: Dict):
+    print(f"\n{result['sessions']} sessions, {result['elapsed_s']:.1f}s: "
+          f"{result['page_views']} page views ({result['page_views_per_s']:.1f}/s), "
+          f"{result['steps_per_s']:.1f} steps/s incl. fragment reruns, {result['errors']} errors")
+    print(f"{'page':<18} {'count':>7} {'p50':>9} {'p99':>9} {'errors':>7}")
+    for step, page in result["pages"].items():
+        print(f"{step:<18} {page['count']:>7} {page['p50_s'] * 1e3:7.1f}ms {page['p99_s'] * 1e3:7.1f}ms "
+              f"{page['errors']:>7}")
+    print(f"{'all page views':<18} {result['page_views']:>7} {result['p50_s'] * 1e3:7.1f}ms "
+          f"{result['p99_s'] * 1e3:7.1f}ms")
+    calls = ", ".join(f"{k} {v}" for k, v in sorted(result["upstream"].items()))
+    print(f"upstream: {result['upstream_calls']} HTTP calls, {result['upstream_per_session']:.1f}/session ({calls})")
+    print(f"cache hit ratio {result['cache_hit_ratio']:.1%}; prefetch {result['prefetch'].get('fetched', 0)} fetched; "
+          f"search {result['search'].get('upstream', 0)} upstream of {result['search'].get('requests', 0)} requests")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the app's data paths with concurrent sessions.")
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent sessions")
+    parser.add_argument("--sweep", help="comma-separated session counts to run in turn")
+    parser.add_argument("--slo", type=float, default=1.0, help="p99 page latency target for --sweep, seconds")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds per run")
+    parser.add_argument("--think", type=float, default=3.0, help="mean think time between actions, seconds")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which sessions start")
+    parser.add_argument("--latency", type=float, default=0.08, help="mock API response latency, seconds")
+    parser.add_argument("--jitter", type=float, default=0.04, help="extra uniform mock latency, seconds")
+    parser.add_argument("--events", type=int, default=500, help="mock catalog size")
+    parser.add_argument("--mock-url", help="use a running benchmarks.mock_api instead of starting one")
+    parser.add_argument("--seed", type=int, default=7, help="session behaviour seed")
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    counts = [int(n) for n in args.sweep.split(",")] if args.sweep else [args.sessions]
+    proc = None
+    base_url = args.mock_url
+    if not base_url:
+        proc, base_url = start_mock(args.latency, args.jitter, args.events)
+        print(f"mock API at {base_url} (latency {args.latency * 1e3:.0f}ms +{args.jitter * 1e3:.0f}ms)")
+    try:
+        results = []
+        for count in counts:
+            result = run_load(base_url.rstrip("/"), count, args.duration, args.think, args.ramp, args.seed)
+            print_summary(result)
+            results.append(result)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    if len(results) > 1:
+        print(f"\n{'sessions':>8} {'views/s':>9} {'p50':>9} {'p99':>9} {'calls/sess':>11} {'hit ratio':>10}")
+        for r in results:
+            print(f"{r['sessions']:>8} {r['page_views_per_s']:9.1f} {r['p50_s'] * 1e3:7.1f}ms "
+                  f"{r['p99_s'] * 1e3:7.1f}ms {r['upstream_per_session']:11.1f} {r['cache_hit_ratio']:10.1%}")
+    passing = [r["sessions"] for r in results if r["p99_s"] <= args.slo and not r["errors"]]
+    if passing:
+        print(f"capacity: {max(passing)} sessions per worker at p99 <= {args.slo:.2f}s")
+    else:
+        print(f"capacity: below {min(counts)} sessions per worker at p99 <= {args.slo:.2f}s")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
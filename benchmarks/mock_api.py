@@ -0,0 +1,293 @@
+"""
+Local stand-in for the Gamma, CLOB and market WebSocket APIs.
+
+    python -m benchmarks.mock_api --port 8800 --latency 0.08
+
+One HTTP server answers the Gamma routes (/events, /events/<id>,
+/public-search), the CLOB route (/prices-history) and the market channel
+(WebSocket upgrade on /ws/market), from synthetic fixtures. Every
+request waits ``latency`` (+ uniform ``jitter``) seconds first, so the
+client sees upstream-like round trips without the server burning CPU.
+
+Control routes, not delayed: GET /_stats returns request counts per
+endpoint as JSON; GET /_reset zeroes them.
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import struct
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.fixtures import synthetic_events
+from http_metrics import endpoint_label
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+# Points per history interval, roughly what the CLOB returns
+HISTORY_POINTS = {"1d": 288, "1w": 1000, "all": 1000, "max": 3000}
+
+
+class MockData:
+    """Pre-encoded responses over a synthetic catalog."""
+
+    def __init__(self, n_events: int = 500, seed: int = 7):
+        """
+        Args:
+            n_events: Events in the catalog
+            seed: Fixture seed
+        """
+        self.events = synthetic_events(n_events, seed=seed)
+        self.by_id = {}
+        for event in self.events:
+            self.by_id[event["id"]] = event
+            self.by_id[event["slug"]] = event
+        self.search_text = [
+            " ".join([e["title"], e["slug"]] + [m["question"] for m in e["markets"]]).casefold()
+            for e in self.events
+        ]
+        self._pages: Dict[Tuple[int, int], bytes] = {}
+        self._histories: Dict[Tuple[str, str], bytes] = {}
+        self.lock = threading.Lock()
+
+    def popular(self, limit: int, offset: int) -> bytes:
+        key = (limit, offset)
+        with self.lock:
+            body = self._pages.get(key)
+        if body is None:
+            body = json.dumps(self.events[offset:offset + limit]).encode()
+            with self.lock:
+                self._pages[key] = body
+        return body
+
+    def event(self, event_id: str) -> Optional[bytes]:
+        event = self.by_id.get(event_id)
+        return json.dumps(event).encode() if event is not None else None
+
+    def search(self, query: str, limit: int) -> bytes:
+        terms = query.casefold().split()
+        hits = [e for e, text in zip(self.events, self.search_text) if all(t in text for t in terms)]
+        return json.dumps({"events": hits[:limit]}).encode()
+
+    def history(self, token_id: str, interval: str) -> bytes:
+        key = (token_id, interval)
+        with self.lock:
+            body = self._histories.get(key)
+        if body is None:
+            rng = random.Random(f"{token_id}/{interval}")
+            points = HISTORY_POINTS.get(interval, 1000)
+            price = rng.random()
+            t = 1_700_000_000
+            history = []
+            for _ in range(points):
+                price = min(max(price + rng.gauss(0, 0.01), 0.001), 0.999)
+                history.append({"t": t, "p": round(price, 4)})
+                t += 300
+            body = json.dumps({"history": history}).encode()
+            with self.lock:
+                self._histories[key] = body
+        return body
+
+
+class MockServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer carrying the mock's data, settings and counters."""
+
+    daemon_threads = True
+
+    def __init__(self, address, data: MockData, latency: float, jitter: float, tick_interval: float):
+        super().__init__(address, MockHandler)
+        self.data = data
+        self.latency = latency
+        self.jitter = jitter
+        self.tick_interval = tick_interval
+        self.counts: Counter = Counter()
+        self.counts_lock = threading.Lock()
+
+    def count(self, key: str, amount: int = 1):
+        with self.counts_lock:
+            self.counts[key] += amount
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        server: MockServer = self.server
+        if url.path == "/_stats":
+            with server.counts_lock:
+                return self._send(200, json.dumps(dict(server.counts)).encode())
+        if url.path == "/_reset":
+            with server.counts_lock:
+                server.counts.clear()
+            return self._send(200, b"{}")
+        if url.path == "/ws/market" and self.headers.get("Upgrade", "").lower() == "websocket":
+            return self._websocket()
+
+        server.count(endpoint_label(url.path))
+        time.sleep(server.latency + random.random() * server.jitter)
+        data = server.data
+        if url.path == "/events":
+            return self._send(200, data.popular(int(params.get("limit", 20)), int(params.get("offset", 0))))
+        if url.path.startswith("/events/"):
+            body = data.event(url.path[len("/events/"):])
+            return self._send(200, body) if body is not None else self._send(404, b"{}")
+        if url.path == "/public-search":
+            return self._send(200, data.search(params.get("q", ""), int(params.get("limit_per_type", 20))))
+        if url.path == "/prices-history":
+            return self._send(200, data.history(params.get("market", ""), params.get("interval", "1d")))
+        self._send(404, b"{}")
+
+    def _send(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _websocket(self):
+        """Minimal RFC 6455 server: subscriptions in, price_change frames out."""
+        server: MockServer = self.server
+        key = self.headers.get("Sec-WebSocket-Key", "")
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+        self.send_response(101)
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        server.count("ws_connections")
+
+        assets: List[str] = []
+        write_lock = threading.Lock()
+        closed = threading.Event()
+
+        def send(payload: bytes, opcode: int = 0x1):
+            with write_lock:
+                self.wfile.write(_encode_frame(payload, opcode))
+                self.wfile.flush()
+
+        def ticker():
+            rng = random.Random()
+            while not closed.wait(server.tick_interval):
+                if not assets:
+                    continue
+                events = []
+                for asset in rng.sample(assets, min(20, len(assets))):
+                    mid = rng.random()
+                    events.append({
+                        "event_type": "price_change", "asset_id": asset,
+                        "best_bid": f"{max(mid - 0.01, 0):.3f}", "best_ask": f"{min(mid + 0.01, 1):.3f}",
+                        "timestamp": str(int(time.time() * 1000)),
+                    })
+                try:
+                    send(json.dumps(events).encode())
+                except OSError:
+                    break
+                server.count("ws_frames")
+
+        threading.Thread(target=ticker, daemon=True).start()
+        try:
+            while True:
+                frame = _read_frame(self.rfile)
+                if frame is None:
+                    break
+                opcode, payload = frame
+                if opcode == 0x8:
+                    send(payload[:2], 0x8)
+                    break
+                if opcode == 0x9:
+                    send(payload, 0xA)
+                elif opcode == 0x1:
+                    message = json.loads(payload)
+                    ids = message.get("assets_ids") or []
+                    server.count("ws_subscribe_messages")
+                    if message.get("operation") == "unsubscribe":
+                        dropped = set(ids)
+                        assets[:] = [a for a in assets if a not in dropped]
+                    else:
+                        assets.extend(a for a in ids if a not in assets)
+        except (OSError, ValueError):
+            pass
+        finally:
+            closed.set()
+            self.close_connection = True
+
+
+def _read_frame(rfile) -> Optional[Tuple[int, bytes]]:
+    """Read one client frame (masked, unfragmented); None at EOF."""
+    head = rfile.read(2)
+    if len(head) < 2:
+        return None
+    opcode = head[0] & 0x0F
+    length = head[1] & 0x7F
+    if length == 126:
+        length = struct.unpack(">H", rfile.read(2))[0]
+    elif length == 127:
+        length = struct.unpack(">Q", rfile.read(8))[0]
+    mask = rfile.read(4) if head[1] & 0x80 else b""
+    payload = rfile.read(length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+def _encode_frame(payload: bytes, opcode: int = 0x1) -> bytes:
+    """One unmasked, final server frame."""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack(">BB", 0x80 | opcode, length)
+    elif length < 65536:
+        header = struct.pack(">BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack(">BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+def serve(port: int = 0, latency: float = 0.05, jitter: float = 0.0, n_events: int = 500,
+          tick_interval: float = 0.5, host: str = "127.0.0.1") -> MockServer:
+    """
+    Start the mock on a background thread.
+
+    Args:
+        port: TCP port (0 picks a free one)
+        latency: Seconds added to every API response
+        jitter: Extra uniform random delay, up to this many seconds
+        n_events: Synthetic catalog size
+        tick_interval: Seconds between WebSocket price frames
+        host: Interface to bind
+
+    Returns:
+        The running MockServer (``server_address[1]`` is the port)
+    """
+    server = MockServer((host, port), MockData(n_events), latency, jitter, tick_interval)
+    threading.Thread(target=server.serve_forever, name="mock-api", daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve stand-in Gamma/CLOB/WebSocket APIs.")
+    parser.add_argument("--port", type=int, default=0, help="TCP port (0 picks one)")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra uniform random delay, seconds")
+    parser.add_argument("--events", type=int, default=500, help="synthetic catalog size")
+    parser.add_argument("--tick-interval", type=float, default=0.5, help="seconds between WebSocket frames")
+    args = parser.parse_args(argv)
+    server = serve(args.port, args.latency, args.jitter, args.events, args.tick_interval)
+    print(f"listening on http://127.0.0.1:{server.server_address[1]}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
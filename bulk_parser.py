@@ -0,0 +1,406 @@
+"""
+Bulk columnar parsing of Gamma events into a NumPy-backed market table.
+"""
+import json
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from utils import Market, safe_float
+
+
+# Raw numeric market field -> (column name, value when missing)
+_NUMERIC_FIELDS = {
+    "volume": ("volume", 0.0),
+    "liquidity": ("liquidity", 0.0),
+    "volume24hr": ("volume_24h", 0.0),
+    "bestBid": ("best_bid", np.nan),
+    "bestAsk": ("best_ask", np.nan),
+    "spread": ("spread", np.nan),
+    "oneDayPriceChange": ("price_change_24h", np.nan),
+}
+
+
+class MarketTable:
+    """
+    One row per market, stored as parallel NumPy columns.
+
+    Scalar columns are 1-D arrays. Outcome prices are stored Arrow-style as
+    a flat ``price_values`` array plus ``price_offsets`` (length rows + 1),
+    so markets may have any number of outcomes. Row ``i`` prices are
+    ``price_values[price_offsets[i]:price_offsets[i + 1]]``.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        """
+        Args:
+            columns: Column name -> array; all per-row arrays share a length
+        """
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns["question"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    @property
+    def column_names(self) -> List[str]:
+        """Per-row column names (excludes the flat price_values array)."""
+        return [name for name in self.columns if name != "price_values"]
+
+    def outcome_prices(self, row: int) -> np.ndarray:
+        """Outcome prices of one row."""
+        offsets = self.columns["price_offsets"]
+        return self.columns["price_values"][offsets[row]:offsets[row + 1]]
+
+    def take(self, indices: np.ndarray) -> "MarketTable":
+        """
+        New table with the given rows, in the given order.
+
+        Args:
+            indices: Integer row indices
+
+        Returns:
+            MarketTable
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        offsets = self.columns["price_offsets"]
+        starts = offsets[indices]
+        lengths = offsets[indices + 1] - starts
+        new_offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=new_offsets[1:])
+        # Gather the ragged price slices with one fancy index
+        flat = np.repeat(starts - new_offsets[:-1], lengths) + np.arange(new_offsets[-1])
+
+        columns = {}
+        for name, column in self.columns.items():
+            if name == "price_offsets":
+                columns[name] = new_offsets
+            elif name == "price_values":
+                columns[name] = column[flat]
+            else:
+                columns[name] = column[indices]
+        return MarketTable(columns)
+
+    def filter(self, mask: np.ndarray) -> "MarketTable":
+        """
+        New table with the rows where ``mask`` is True.
+
+        Args:
+            mask: Boolean array with one entry per row
+        """
+        return self.take(np.flatnonzero(mask))
+
+    def sort_by(self, column: str, descending: bool = False) -> "MarketTable":
+        """
+        New table sorted by a column (stable; NaNs last).
+
+        Args:
+            column: Column name
+            descending: Sort high to low
+        """
+        values = self.columns[column]
+        if descending and values.dtype.kind in "fiu":
+            order = np.argsort(-values, kind="stable")
+        else:
+            order = np.argsort(values, kind="stable")
+            if descending:
+                order = order[::-1]
+        return self.take(order)
+
+    def top(self, n: int, column: str) -> "MarketTable":
+        """
+        The ``n`` rows with the largest values of a numeric column, descending.
+
+        Uses argpartition, so it is O(rows) rather than a full sort.
+        """
+        values = self.columns[column]
+        if n >= len(values):
+            return self.sort_by(column, descending=True)
+        values = np.nan_to_num(values, nan=-np.inf)
+        part = np.argpartition(-values, n)[:n]
+        return self.take(part[np.argsort(-values[part], kind="stable")])
+
+    def group_sum(self, column: str, by: str = "event_id") -> Dict[str, float]:
+        """
+        Sum a numeric column per group.
+
+        Args:
+            column: Numeric column to sum
+            by: Grouping column
+
+        Returns:
+            Group key -> sum
+        """
+        keys, inverse = np.unique(self.columns[by], return_inverse=True)
+        sums = np.bincount(inverse, weights=self.columns[column], minlength=len(keys))
+        return dict(zip(keys.tolist(), sums.tolist()))
+
+    def to_records(self, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Convert rows to dictionaries (for display of small results).
+
+        Args:
+            limit: Convert at most this many rows
+        """
+        n = len(self) if limit is None else min(limit, len(self))
+        names = self.column_names
+        records = []
+        for i in range(n):
+            record = {name: _scalar(self.columns[name][i]) for name in names if name != "price_offsets"}
+            record["outcome_prices"] = self.outcome_prices(i).tolist()
+            records.append(record)
+        return records
+
+    @classmethod
+    def concat(cls, tables: Sequence["MarketTable"]) -> "MarketTable":
+        """Stack tables with identical columns."""
+        tables = [t for t in tables if len(t)]
+        if not tables:
+            return empty_table()
+        if len(tables) == 1:
+            return tables[0]
+        columns = {}
+        for name in tables[0].columns:
+            if name == "price_offsets":
+                lengths = np.concatenate([np.diff(t.columns[name]) for t in tables])
+                offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+                np.cumsum(lengths, out=offsets[1:])
+                columns[name] = offsets
+            else:
+                columns[name] = np.concatenate([t.columns[name] for t in tables])
+        return cls(columns)
+
+
+def to_float_array(values: Sequence, default: float = 0.0) -> np.ndarray:
+    """
+    Vectorized ``safe_float`` over a sequence.
+
+    Clean input (numbers and numeric strings) converts in one NumPy call;
+    only a batch containing None, '' or junk falls back to per-value parsing.
+
+    Args:
+        values: Values to convert
+        default: Value for anything that isn't numeric
+
+    Returns:
+        float64 array
+    """
+    try:
+        result = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.fromiter((safe_float(v, default) for v in values), dtype=np.float64, count=len(values))
+    if np.isnan(default):
+        # NumPy already maps None to NaN
+        return result
+    # NumPy maps None to NaN; give those the default like safe_float does
+    missing = np.flatnonzero(np.isnan(result))
+    for i in missing:
+        result[i] = safe_float(values[i], default)
+    return result
+
+
+def to_timestamp_array(values: Sequence) -> np.ndarray:
+    """
+    Vectorized parse of ISO-8601 dates and datetimes to Unix seconds.
+
+    Gamma sends UTC times with a trailing "Z", which NumPy's datetime64
+    parser won't take; it is stripped so a clean batch converts in one
+    call. Anything else (offsets, junk) falls back to per-value parsing.
+    Markets of an event mostly share an end date, so each distinct
+    string is parsed once.
+
+    Args:
+        values: Raw field values (strings, None, anything else)
+
+    Returns:
+        float64 array, NaN where a value is missing or unparseable
+    """
+    codes: Dict[str, int] = {}
+    index = np.fromiter((codes.setdefault(v, len(codes)) if isinstance(v, str) and v else -1 for v in values),
+                        dtype=np.int64, count=len(values))
+    cleaned = [v[:-1] if v.endswith("Z") else v for v in codes]
+    # NumPy would apply (and warn about) explicit UTC offsets
+    if any("+" in v[10:] or "-" in v[10:] for v in cleaned):
+        stamps = np.array([_parse_datetime(v) for v in cleaned], dtype="datetime64[s]")
+    else:
+        try:
+            stamps = np.array(cleaned, dtype="datetime64[s]")
+        except ValueError:
+            stamps = np.array([_parse_datetime(v) for v in cleaned], dtype="datetime64[s]")
+    parsed = stamps.astype(np.int64).astype(np.float64)
+    parsed[np.isnat(stamps)] = np.nan
+    # Index -1 (missing) picks the trailing NaN
+    return np.append(parsed, np.nan)[index]
+
+
+def _parse_datetime(value: Optional[str]) -> np.datetime64:
+    """One ISO-8601 value as UTC datetime64[s] (NaT if unparseable)."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return np.datetime64("NaT")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(parsed, "s")
+
+
+def bulk_decode_lists(values: Sequence) -> List[list]:
+    """
+    Decode many JSON-list strings with a single ``json.loads`` call.
+
+    Args:
+        values: Raw field values (JSON strings, lists, or anything else)
+
+    Returns:
+        One list per input, [] where a value can't be decoded
+    """
+    try:
+        # Fast path: every value is a non-empty JSON list string
+        batch = json.loads("[" + ",".join(values) + "]")
+        if len(batch) == len(values):
+            return [item if isinstance(item, list) else [] for item in batch]
+    except (TypeError, ValueError):
+        pass
+
+    decoded: List[list] = [[] for _ in values]
+    string_idx = []
+    strings = []
+    for i, value in enumerate(values):
+        if isinstance(value, str):
+            if value:
+                string_idx.append(i)
+                strings.append(value)
+        elif isinstance(value, list):
+            decoded[i] = value
+
+    if not strings:
+        return decoded
+    try:
+        batch = json.loads("[" + ",".join(strings) + "]")
+        if len(batch) != len(strings):
+            raise ValueError("element count changed")
+    except ValueError:
+        # One malformed value poisons the batch; decode individually
+        batch = []
+        for s in strings:
+            try:
+                batch.append(json.loads(s))
+            except ValueError:
+                batch.append(None)
+    for i, item in zip(string_idx, batch):
+        decoded[i] = item if isinstance(item, list) else []
+    return decoded
+
+
+def parse_events_bulk(events: Iterable[Dict], chunk_size: int = 10_000) -> MarketTable:
+    """
+    Parse raw Gamma events into a columnar MarketTable.
+
+    Accepts any iterable (including a streaming generator); events are
+    consumed in chunks so raw dicts need not all be held at once.
+
+    Args:
+        events: Raw event dictionaries from Gamma API
+        chunk_size: Markets per internal batch
+
+    Returns:
+        MarketTable with columns event_id, event_title, event_slug,
+        market_id, market_index, question, outcomes, token_ids,
+        yes_token_id, n_outcomes, yes_price, price_offsets, price_values,
+        volume, liquidity, volume_24h, best_bid, best_ask, spread,
+        price_change_24h and end_ts (Unix seconds; the event's end date
+        when the market has none). Missing quotes, spreads and changes
+        are NaN
+    """
+    tables = []
+    batch: List[tuple] = []
+    for event in events:
+        if not isinstance(event, dict):
+            continue
+        for index, market in enumerate(event.get("markets") or []):
+            if isinstance(market, dict):
+                batch.append((event, index, market))
+        if len(batch) >= chunk_size:
+            tables.append(_parse_batch(batch))
+            batch = []
+    if batch:
+        tables.append(_parse_batch(batch))
+    return MarketTable.concat(tables)
+
+
+def _parse_batch(batch: List[tuple]) -> MarketTable:
+    """Build a table from (event, market index, market) triples."""
+    n = len(batch)
+    markets = [m for _, _, m in batch]
+
+    outcomes = bulk_decode_lists([m.get("outcomes") for m in markets])
+    prices = bulk_decode_lists([m.get("outcomePrices") for m in markets])
+    tokens = bulk_decode_lists([m.get("clobTokenIds") for m in markets])
+    for i, market in enumerate(markets):
+        if not prices[i] or not outcomes[i] or not tokens[i]:
+            # Rare shapes (bare strings, alternate price fields) take the
+            # same path as the single-event parser
+            parsed = Market(market)
+            outcomes[i] = list(parsed.outcomes)
+            prices[i] = list(parsed.outcome_prices)
+            tokens[i] = list(parsed.clob_token_ids)
+
+    lengths = np.fromiter((len(p) for p in prices), dtype=np.int64, count=n)
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    price_values = to_float_array([p for row in prices for p in row])
+
+    yes_price = np.full(n, np.nan)
+    has_price = lengths > 0
+    yes_price[has_price] = price_values[offsets[:-1][has_price]]
+
+    token_ids = np.empty(n, dtype=object)
+    token_ids[:] = [tuple(map(str, row)) for row in tokens]
+    outcome_names = np.empty(n, dtype=object)
+    outcome_names[:] = [tuple(row) for row in outcomes]
+
+    columns = {
+        "event_id": _object_column([str(e.get("id") or "") for e, _, _ in batch]),
+        "event_title": _object_column([e.get("title") or "" for e, _, _ in batch]),
+        "event_slug": _object_column([e.get("slug") or "" for e, _, _ in batch]),
+        "market_id": _object_column([str(m.get("id") or "") for m in markets]),
+        "market_index": np.fromiter((i for _, i, _ in batch), dtype=np.int32, count=n),
+        "question": _object_column([m.get("question") or "" for m in markets]),
+        "outcomes": outcome_names,
+        "token_ids": token_ids,
+        "yes_token_id": _object_column([row[0] if row else "" for row in token_ids]),
+        "n_outcomes": np.fromiter((len(o) for o in outcomes), dtype=np.int16, count=n),
+        "yes_price": yes_price,
+        "price_offsets": offsets,
+        "price_values": price_values,
+    }
+    for field, (name, default) in _NUMERIC_FIELDS.items():
+        columns[name] = to_float_array([m.get(field) for m in markets], default)
+    # Derive missing spreads from the quotes
+    columns["spread"] = np.where(np.isnan(columns["spread"]), columns["best_ask"] - columns["best_bid"],
+                                 columns["spread"])
+    columns["end_ts"] = to_timestamp_array([m.get("endDate") or e.get("endDate") for e, _, m in batch])
+    return MarketTable(columns)
+
+
+def empty_table() -> MarketTable:
+    """A MarketTable with no rows."""
+    return _parse_batch([])
+
+
+def _object_column(values: list) -> np.ndarray:
+    """1-D object array (np.array would turn tuples into a 2-D array)."""
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    return column
+
+
+def _scalar(value):
+    """NumPy scalar -> Python value."""
+    return value.item() if isinstance(value, np.generic) else value
@@ -0,0 +1,340 @@
+"""
+Price history chart building with a per-series figure cache.
+"""
+import base64
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+    import plotly.graph_objects as go
+
+
+# Above this many points the history trace is drawn with WebGL
+WEBGL_THRESHOLD = 2000
+FIGURE_CACHE_SIZE = 64
+# Grid points per series on the overlay chart
+OVERLAY_POINTS = 500
+OVERLAY_COLORS = [
+    '#00f5ff', '#ff00ff', '#ffff00', '#00ff88', '#ff8800',
+    '#8888ff', '#ff4466', '#66ffff', '#ccff00', '#ff99ff',
+]
+
+_LAYOUT = dict(
+    height=400,
+    margin=dict(l=0, r=0, t=20, b=0),
+    xaxis=dict(
+        type='date',
+        showgrid=True,
+        gridcolor='rgba(0, 245, 255, 0.1)',
+        color='#00f5ff'
+    ),
+    yaxis=dict(
+        range=[0, 100],
+        showgrid=True,
+        gridcolor='rgba(255, 0, 255, 0.1)',
+        color='#ff00ff'
+    ),
+    plot_bgcolor='rgba(10, 14, 39, 0.8)',
+    paper_bgcolor='rgba(10, 14, 39, 0.8)',
+    font=dict(family='Rajdhani', color='#00f5ff'),
+    showlegend=False,
+)
+
+# Figures (live figures: (template, idle copies) pairs), keyed by series identity
+_figures: "OrderedDict[Tuple, Any]" = OrderedDict()
+_figures_lock = threading.Lock()
+
+
+# numpy and plotly are imported on first use: the landing page draws no
+# charts, and importing numpy alone costs a cold process ~60 ms
+def _go():
+    """plotly.graph_objects, imported on first use."""
+    import plotly.graph_objects as go
+    return go
+
+
+def history_arrays(history: Sequence[Tuple[int, float]]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Convert (timestamp, price) pairs to plot arrays.
+
+    Args:
+        history: (unix seconds, price 0-1) pairs from CLOBClient
+
+    Returns:
+        (epoch milliseconds, price in percent) float64 arrays
+    """
+    import numpy as np
+    if not len(history):
+        return np.empty(0), np.empty(0)
+    points = np.asarray(history, dtype=np.float64)
+    return points[:, 0] * 1000.0, points[:, 1] * 100.0
+
+
+def typed_array(values: "np.ndarray") -> dict:
+    """
+    Plotly's base64 typed-array form of a float array.
+
+    This is what plotly.io.to_json would emit for the array; building it
+    once lets every later serialization copy a string instead of
+    re-encoding the array.
+    """
+    import numpy as np
+    data = np.ascontiguousarray(values, dtype="<f8").tobytes()
+    return {"dtype": "f8", "bdata": base64.b64encode(data).decode("ascii")}
+
+
+def series_version(history: Sequence[Tuple[int, float]]) -> Tuple:
+    """Cheap identity of a history series: length plus its last point."""
+    return (len(history), tuple(history[-1])) if len(history) else (0,)
+
+
+def build_history_figure(
+    history: Sequence[Tuple[int, float]],
+    webgl_threshold: int = WEBGL_THRESHOLD,
+) -> "go.Figure":
+    """
+    Build the price history figure (uncached).
+
+    The history arrays are stored already serialized (typed_array), so
+    serializing the figure again costs a string copy per array.
+
+    Args:
+        history: (unix seconds, price 0-1) pairs
+        webgl_threshold: Use Scattergl for series longer than this
+
+    Returns:
+        Plotly Figure
+    """
+    go = _go()
+    x, y = history_arrays(history)
+    trace = go.Scattergl if len(x) > webgl_threshold else go.Scatter
+    fig = go.Figure(trace(
+        x=typed_array(x), y=typed_array(y),
+        mode='lines',
+        line=dict(color='#00f5ff', width=3),
+        fill='tozeroy',
+        fillcolor='rgba(0, 245, 255, 0.2)',
+        hovertemplate='%{y:.1f}%<extra></extra>'
+    ))
+    fig.update_layout(**_LAYOUT)
+    return fig
+
+
+def history_figure(token_id: str, interval: str, history: Sequence[Tuple[int, float]]) -> "go.Figure":
+    """
+    Cached figure for a token's history.
+
+    Keyed by (token, interval, series version), so reruns over unchanged
+    data return the same Figure without rebuilding it. Treat the result
+    as read-only.
+
+    Args:
+        token_id: CLOB token ID
+        interval: History interval
+        history: (unix seconds, price 0-1) pairs
+
+    Returns:
+        Plotly Figure
+    """
+    key = (token_id, interval, series_version(history))
+    with _figures_lock:
+        fig = _figures.get(key)
+        if fig is not None:
+            _figures.move_to_end(key)
+            return fig
+    fig = build_history_figure(history)
+    with _figures_lock:
+        _figures[key] = fig
+        while len(_figures) > FIGURE_CACHE_SIZE:
+            _figures.popitem(last=False)
+    return fig
+
+
+@contextmanager
+def live_history_figure(
+    token_id: str,
+    interval: str,
+    history: Sequence[Tuple[int, float]],
+    tail_point: Optional[Tuple[float, float]] = None,
+) -> Iterator["go.Figure"]:
+    """
+    Cached history figure whose live segment ends at ``tail_point``.
+
+    The figure (history plus a two-point tail trace) is built once per
+    series version, with the history already serialized (see
+    build_history_figure); each call only rewrites the tail's
+    coordinates, so a live tick re-encodes two points instead of the
+    whole series.
+
+    st.plotly_chart only accepts figures, not JSON, so the cache holds
+    figures rather than JSON strings. Each concurrent caller checks out
+    its own copy (the copies share the serialized history strings), so
+    sessions never wait on each other's renders. Render the figure inside
+    the ``with`` block; it is returned to the cache afterwards.
+
+    Args:
+        token_id: CLOB token ID
+        interval: History interval
+        history: (unix seconds, price 0-1) pairs, not empty
+        tail_point: Live point (unix seconds, price 0-1); None hides the tail
+
+    Yields:
+        Plotly Figure
+    """
+    key = ("live", token_id, interval, series_version(history))
+    fig = None
+    with _figures_lock:
+        entry = _figures.get(key)
+        if entry is not None:
+            _figures.move_to_end(key)
+            if entry[1]:
+                fig = entry[1].pop()
+    if entry is None:
+        template = build_history_figure(history)
+        template.add_trace(_go().Scatter(
+            x=[], y=[],
+            mode='lines+markers',
+            line=dict(color='#ff00ff', width=3, dash='dot'),
+            marker=dict(size=[0, 10], color='#ff00ff'),
+            hovertemplate='LIVE %{y:.1f}%<extra></extra>'
+        ))
+        with _figures_lock:
+            entry = _figures.setdefault(key, (template, []))
+            while len(_figures) > FIGURE_CACHE_SIZE:
+                _figures.popitem(last=False)
+    if fig is None:
+        fig = _go().Figure(entry[0])
+    if tail_point is None:
+        fig.data[1].update(x=[], y=[])
+    else:
+        last_point = history[-1]
+        fig.data[1].update(
+            x=[last_point[0] * 1000.0, tail_point[0] * 1000.0],
+            y=[last_point[1] * 100.0, tail_point[1] * 100.0],
+        )
+    try:
+        yield fig
+    finally:
+        with _figures_lock:
+            entry[1].append(fig)
+
+
+def align_histories(
+    histories: Sequence[Sequence[Tuple[int, float]]],
+    points: int = OVERLAY_POINTS,
+) -> Tuple["np.ndarray", List["np.ndarray"]]:
+    """
+    Resample several histories onto one shared time grid.
+
+    Each series takes its last known price at every grid time (NaN before
+    its first point), which also downsamples long series to ``points``.
+
+    Args:
+        histories: (unix seconds, price 0-1) series
+        points: Grid size
+
+    Returns:
+        (grid in epoch milliseconds, one percent array per series)
+    """
+    import numpy as np
+    arrays = [history_arrays(h) for h in histories]
+    present = [x for x, _ in arrays if len(x)]
+    if not present:
+        return np.empty(0), [np.empty(0) for _ in arrays]
+    start = min(x[0] for x in present)
+    end = max(x[-1] for x in present)
+    grid = np.linspace(start, end, points) if end > start else np.array([start])
+    series = []
+    for x, y in arrays:
+        if not len(x):
+            series.append(np.full(len(grid), np.nan))
+            continue
+        idx = np.searchsorted(x, grid, side="right") - 1
+        values = y[np.clip(idx, 0, None)]
+        values[idx < 0] = np.nan
+        series.append(values)
+    return grid, series
+
+
+def build_overlay_figure(
+    labels: Sequence[str],
+    histories: Sequence[Sequence[Tuple[int, float]]],
+    points: int = OVERLAY_POINTS,
+) -> "go.Figure":
+    """
+    One line per series on a shared grid (uncached).
+
+    Args:
+        labels: Legend name per series
+        histories: (unix seconds, price 0-1) series
+        points: Grid points per series
+
+    Returns:
+        Plotly Figure
+    """
+    go = _go()
+    grid, series = align_histories(histories, points)
+    trace = go.Scattergl if len(grid) * len(series) > WEBGL_THRESHOLD else go.Scatter
+    fig = go.Figure([
+        trace(
+            x=grid, y=values,
+            name=label,
+            mode='lines',
+            line=dict(color=OVERLAY_COLORS[i % len(OVERLAY_COLORS)], width=2),
+            hovertemplate='%{fullData.name}: %{y:.1f}%<extra></extra>'
+        )
+        for i, (label, values) in enumerate(zip(labels, series))
+    ])
+    fig.update_layout(**_LAYOUT)
+    fig.update_layout(
+        height=500,
+        showlegend=True,
+        hovermode='x unified',
+        legend=dict(bgcolor='rgba(10, 14, 39, 0.6)'),
+    )
+    return fig
+
+
+def overlay_figure(
+    key: str,
+    interval: str,
+    labels: Sequence[str],
+    histories: Sequence[Sequence[Tuple[int, float]]],
+) -> "go.Figure":
+    """
+    Cached overlay figure, keyed by (key, interval, every series version).
+
+    Args:
+        key: Chart identity (e.g. the event id)
+        interval: History interval
+        labels: Legend name per series
+        histories: (unix seconds, price 0-1) series
+
+    Returns:
+        Plotly Figure (read-only)
+    """
+    cache_key = ("overlay", key, interval, tuple(labels), tuple(series_version(h) for h in histories))
+    with _figures_lock:
+        fig = _figures.get(cache_key)
+        if fig is not None:
+            _figures.move_to_end(cache_key)
+            return fig
+    fig = build_overlay_figure(labels, histories)
+    with _figures_lock:
+        _figures[cache_key] = fig
+        while len(_figures) > FIGURE_CACHE_SIZE:
+            _figures.popitem(last=False)
+    return fig
+
+
+def clear_cache(token_id: Optional[str] = None):
+    """Forget cached figures (all, or those of one token or overlay key)."""
+    with _figures_lock:
+        if token_id is None:
+            _figures.clear()
+            return
+        for key in [k for k in _figures if token_id in k[:2]]:
+            del _figures[key]
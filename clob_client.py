@@ -4,14 +4,22 @@ CLOB API client for Polymarket price history and market data.
 import requests
 from typing import List, Tuple, Dict, Optional
 
+from http_metrics import instrument_session
+
 
 class CLOBClient:
     """Client for interacting with Polymarket's CLOB API."""
     
     BASE_URL = "https://clob.polymarket.com"
     
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(self, base_url: Optional[str] = None):
+        """
+        Args:
+            base_url: API root (BASE_URL by default; e.g. a local stand-in)
+        """
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
+        self.session = instrument_session(requests.Session(), "clob")
         self.session.headers.update({
             'Accept': 'application/json',
         })
@@ -32,24 +40,46 @@ class CLOBClient:
             List of (unix_timestamp, price) tuples
         """
         try:
-            response = self.session.get(
-                f"{self.BASE_URL}/prices-history",
-                params={
-                    "market": token_id,
-                    "interval": interval
-                },
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            # Convert to list of tuples
-            history = data.get("history", [])
-            return [(point["t"], point["p"]) for point in history]
+            return self.fetch_price_history(token_id, interval)
         except requests.RequestException as e:
             print(f"Error fetching price history for {token_id}: {e}")
             return []
     
+    def fetch_price_history(
+        self,
+        token_id: str,
+        interval: str = "1d"
+    ) -> List[Tuple[int, float]]:
+        """
+        Fetch historical prices for a token, raising on failure.
+        
+        Same as get_price_history, for callers that retry (e.g. on HTTP 429).
+        
+        Args:
+            token_id: CLOB token ID
+            interval: Time interval ('1d', '1w', 'max')
+            
+        Returns:
+            List of (unix_timestamp, price) tuples
+            
+        Raises:
+            requests.RequestException: On connection errors and non-2xx responses
+        """
+        response = self.session.get(
+            f"{self.BASE_URL}/prices-history",
+            params={
+                "market": token_id,
+                "interval": interval
+            },
+            timeout=10
+        )
+        response.raise_for_status()
+        data = response.json()
+        
+        # Convert to list of tuples
+        history = data.get("history", [])
+        return [(point["t"], point["p"]) for point in history]
+    
     def get_market_data(self, token_id: str) -> Optional[Dict]:
         """
         Get current market data for a token.
@@ -0,0 +1,325 @@
+"""
+Process-wide TTL caching for Gamma and CLOB data calls.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from metrics import format_family, format_labels
+
+
+class TTLCache:
+    """
+    Size-bounded LRU cache whose entries expire after a per-entry TTL.
+
+    ``get_or_load`` is single-flight: concurrent misses on the same key
+    wait for one loader call instead of each hitting upstream. Hits and
+    misses are also counted per kind, the first element of tuple keys.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 60.0):
+        """
+        Args:
+            maxsize: Maximum number of entries before LRU eviction
+            ttl: Default time-to-live in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, threading.Event] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # {kind: [hits, misses]}
+        self.kinds: Dict[Hashable, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default=None):
+        """Cached value for ``key``, or ``default`` if missing or expired."""
+        with self.lock:
+            found, value = self._lookup(key)
+        return value if found else default
+
+    def contains(self, key: Hashable) -> bool:
+        """Whether a live entry exists (not counted as a hit or miss)."""
+        with self.lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[0] > time.monotonic()
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value with an optional per-entry TTL."""
+        with self.lock:
+            self._store(key, value, self.ttl if ttl is None else ttl)
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None,
+        ttl_for: Optional[Callable[[Any], float]] = None,
+    ) -> Any:
+        """
+        Return the cached value, calling ``loader`` once on a miss.
+
+        Args:
+            key: Cache key
+            loader: Zero-argument function producing the value
+            ttl: Time-to-live for the loaded value
+            ttl_for: Function of the loaded value returning its TTL
+                (overrides ``ttl``; e.g. shorter TTLs for empty results)
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        while True:
+            with self.lock:
+                found, value = self._lookup(key)
+                if found:
+                    return value
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    waiter = self._inflight[key] = threading.Event()
+                    break
+            # Someone else is loading this key; wait, then re-check
+            waiter.wait()
+
+        try:
+            value = loader()
+            entry_ttl = ttl_for(value) if ttl_for else (self.ttl if ttl is None else ttl)
+            with self.lock:
+                self._store(key, value, entry_ttl)
+            return value
+        finally:
+            with self.lock:
+                self._inflight.pop(key, None)
+            waiter.set()
+
+    def invalidate(self, predicate: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """
+        Drop entries.
+
+        Args:
+            predicate: Drop only keys for which this returns True
+                (None drops everything)
+
+        Returns:
+            Number of entries dropped
+        """
+        with self.lock:
+            if predicate is None:
+                dropped = len(self._data)
+                self._data.clear()
+                return dropped
+            keys = [k for k in self._data if predicate(k)]
+            for k in keys:
+                del self._data[k]
+            return len(keys)
+
+    def stats(self) -> Dict[str, float]:
+        """Entry count, hits, misses, evictions and hit ratio."""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def kind_stats(self) -> Dict[Hashable, Dict[str, float]]:
+        """Hits, misses and hit ratio per key kind."""
+        with self.lock:
+            return {
+                kind: {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+                }
+                for kind, (hits, misses) in self.kinds.items()
+            }
+
+    def render_prometheus(self, prefix: str = "polymarket_cache", labels: Optional[Dict[str, str]] = None) -> str:
+        """
+        Render lookups per kind and result, entries and evictions.
+
+        Args:
+            prefix: Metric name prefix
+            labels: Extra labels for every sample (e.g. the cache name)
+
+        Returns:
+            Exposition text ending in a newline
+        """
+        labels = dict(labels or {})
+        with self.lock:
+            lookups = []
+            for kind, (hits, misses) in self.kinds.items():
+                lookups.append(f"{prefix}_lookups_total{format_labels({**labels, 'kind': kind, 'result': 'hit'})} {hits}")
+                lookups.append(f"{prefix}_lookups_total{format_labels({**labels, 'kind': kind, 'result': 'miss'})} {misses}")
+            entries = len(self._data)
+            evictions = self.evictions
+        lines = format_family(f"{prefix}_lookups_total", "counter", "Cache lookups by key kind and result.", lookups)
+        lines += format_family(f"{prefix}_entries", "gauge", "Live cache entries.",
+                               [f"{prefix}_entries{format_labels(labels)} {entries}"])
+        lines += format_family(f"{prefix}_evictions_total", "counter", "Entries evicted for space.",
+                               [f"{prefix}_evictions_total{format_labels(labels)} {evictions}"])
+        return "\n".join(lines) + "\n"
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        """Find a live entry and mark it recently used (lock held)."""
+        kind = key[0] if isinstance(key, tuple) and key else ""
+        counts = self.kinds.get(kind)
+        if counts is None:
+            counts = self.kinds[kind] = [0, 0]
+        entry = self._data.get(key)
+        if entry is not None:
+            expires, value = entry
+            if expires > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                counts[0] += 1
+                return True, value
+            del self._data[key]
+        self.misses += 1
+        counts[1] += 1
+        return False, None
+
+    def _store(self, key: Hashable, value: Any, ttl: float):
+        """Insert an entry and evict beyond maxsize (lock held)."""
+        if ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+def normalize_query(query: str) -> str:
+    """Cache key form of a search query: trimmed, casefolded, single-spaced."""
+    return " ".join((query or "").split()).casefold()
+
+
+class CachedDataService:
+    """
+    The app's data calls, cached per process and therefore shared by every
+    Streamlit session served by it.
+
+    Keys contain only what changes the upstream answer: the event limit,
+    the normalized search query, and (token, interval) for histories.
+    Empty results, which the clients also return on errors, are kept only
+    briefly so a failed call is retried soon.
+    """
+
+    POPULAR_TTL = 60.0
+    SEARCH_TTL = 120.0
+    HISTORY_TTL = {"1d": 60.0, "1w": 300.0, "all": 300.0, "max": 600.0}
+    EMPTY_TTL = 5.0
+
+    def __init__(self, gamma, clob, maxsize: int = 1024, max_workers: int = 32):
+        """
+        Args:
+            gamma: GammaClient
+            clob: CLOBClient
+            maxsize: Maximum cached entries across all call types
+            max_workers: Threads for concurrent multi-token history fetches
+        """
+        self.gamma = gamma
+        self.clob = clob
+        self.cache = TTLCache(maxsize=maxsize)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="history")
+
+    def popular_events(self, limit: int = 20, offset: int = 0) -> List[Dict]:
+        """Cached GammaClient.get_popular_events (one entry per page)."""
+        return self.cache.get_or_load(
+            ("popular", limit, offset),
+            lambda: self.gamma.get_popular_events(limit, offset),
+            ttl_for=lambda v: self.POPULAR_TTL if v else self.EMPTY_TTL,
+        )
+
+    def event(self, event_id: str) -> Optional[Dict]:
+        """Cached GammaClient.get_event."""
+        return self.cache.get_or_load(
+            ("event", str(event_id)),
+            lambda: self.gamma.get_event(str(event_id)),
+            ttl_for=lambda v: self.POPULAR_TTL if v else self.EMPTY_TTL,
+        )
+
+    def search_events(self, query: str, limit_per_type: int = 20) -> List[Dict]:
+        """Cached GammaClient.search_events_public."""
+        key = normalize_query(query)
+        if not key:
+            return []
+        return self.cache.get_or_load(
+            ("search", key, limit_per_type),
+            lambda: self.gamma.search_events_public(key, limit_per_type),
+            ttl_for=lambda v: self.SEARCH_TTL if v else self.EMPTY_TTL,
+        )
+
+    def peek_search(self, query: str, limit_per_type: int = 20) -> Optional[List[Dict]]:
+        """Cached search results, or None (never calls upstream)."""
+        key = ("search", normalize_query(query), limit_per_type)
+        if not self.cache.contains(key):
+            return None
+        return self.cache.get(key)
+
+    def price_history(self, token_id: str, interval: str = "1d") -> List[Tuple[int, float]]:
+        """Cached CLOBClient.get_price_history."""
+        ttl = self.HISTORY_TTL.get(interval, 300.0)
+        return self.cache.get_or_load(
+            ("history", token_id, interval),
+            lambda: self.clob.get_price_history(token_id, interval),
+            ttl_for=lambda v: ttl if v else self.EMPTY_TTL,
+        )
+
+    def price_histories(self, token_ids: List[str], interval: str = "1d") -> Dict[str, List[Tuple[int, float]]]:
+        """
+        Cached histories for several tokens, fetching the misses concurrently.
+
+        Args:
+            token_ids: CLOB token IDs
+            interval: Time interval
+
+        Returns:
+            Token ID -> history, in the order given
+        """
+        token_ids = list(dict.fromkeys(token_ids))
+        futures = {
+            t: self.executor.submit(self.price_history, t, interval)
+            for t in token_ids if not self.has_price_history(t, interval)
+        }
+        return {
+            t: futures[t].result() if t in futures else self.price_history(t, interval)
+            for t in token_ids
+        }
+
+    def has_price_history(self, token_id: str, interval: str = "1d") -> bool:
+        """Whether a history is cached (without counting a lookup)."""
+        return self.cache.contains(("history", token_id, interval))
+
+    def invalidate(self, kind: Optional[str] = None) -> int:
+        """
+        Drop cached data.
+
+        Args:
+            kind: 'popular', 'event', 'search' or 'history' (None drops everything)
+
+        Returns:
+            Number of entries dropped
+        """
+        if kind is None:
+            return self.cache.invalidate()
+        return self.cache.invalidate(lambda key: key[0] == kind)
+
+    def stats(self) -> Dict[str, float]:
+        """Cache statistics."""
+        return self.cache.stats()
+
+    def render_prometheus(self, prefix: str = "polymarket_cache") -> str:
+        """Cache metrics in the Prometheus text format (see TTLCache)."""
+        return self.cache.render_prometheus(prefix, {"cache": "data"})
@@ -0,0 +1,485 @@
+"""
+Headless bulk export of the open-event catalog and its price histories.
+
+    python export_cli.py --out exports/2024-06-01 --format parquet --interval 1d --interval max
+
+Writes partitioned datasets under ``--out``:
+
+    markets/part-00000.csv            one row per market
+    history/interval=1d/part-00000.csv  (token_id, t, p) rows
+
+and a ``manifest.json`` recording finished tokens, so an interrupted run
+continues where it stopped when started again with the same ``--out``.
+The markets dataset is written to ``markets.partial/`` and renamed into
+place once complete; ``--fresh`` deletes every dataset and starts over.
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import shutil
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Sequence, Set
+
+import requests
+
+from bulk_parser import parse_events_bulk
+from clob_client import CLOBClient
+from gamma_client import GammaClient
+from http_metrics import record_retry
+from metrics import start_http_server
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = None
+    pq = None
+
+
+MARKET_COLUMNS = [
+    "event_id", "event_title", "event_slug", "market_id", "market_index",
+    "question", "token_ids", "yes_token_id", "n_outcomes", "yes_price",
+    "volume", "liquidity",
+]
+HISTORY_COLUMNS = ["token_id", "t", "p"]
+# HTTP statuses worth retrying
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+class RateLimiter:
+    """Thread-safe token bucket: at most ``rate`` acquisitions per second."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Args:
+            rate: Sustained acquisitions per second
+            burst: Bucket size (defaults to one second's worth)
+        """
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_for = (1 - self.tokens) / self.rate
+            time.sleep(wait_for)
+
+    def penalize(self, seconds: float):
+        """Stop handing out tokens for ``seconds`` (e.g. after HTTP 429)."""
+        with self.lock:
+            self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+class PartitionedWriter:
+    """
+    Streams rows into numbered part files, ``max_rows`` rows per part.
+
+    Only the current part's rows are held in memory. Part numbering
+    continues after existing files, so resumed runs append new parts.
+    """
+
+    def __init__(self, directory: str, columns: Sequence[str], fmt: str = "csv", max_rows: int = 200_000):
+        """
+        Args:
+            directory: Dataset directory (created if missing)
+            columns: Column names
+            fmt: 'csv' or 'parquet'
+            max_rows: Rows per part file
+        """
+        if fmt == "parquet" and pa is None:
+            raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.columns = list(columns)
+        self.fmt = fmt
+        self.max_rows = max_rows
+        self.rows: List[tuple] = []
+        self.rows_written = 0
+        self.last_part: Optional[str] = None
+        self.part = len([f for f in os.listdir(directory) if f.startswith("part-") and f.endswith("." + fmt)])
+
+    def write(self, rows: Sequence[tuple]) -> bool:
+        """
+        Buffer rows, writing a part file once ``max_rows`` are buffered.
+
+        Returns:
+            True if a part file was written
+        """
+        self.rows.extend(rows)
+        if len(self.rows) >= self.max_rows:
+            self.flush()
+            return True
+        return False
+
+    def flush(self):
+        """Write buffered rows to a new part file."""
+        if not self.rows:
+            return
+        path = os.path.join(self.directory, f"part-{self.part:05d}.{self.fmt}")
+        tmp = path + ".tmp"
+        if self.fmt == "parquet":
+            columns = list(zip(*self.rows))
+            table = pa.table({name: list(col) for name, col in zip(self.columns, columns)})
+            pq.write_table(table, tmp, compression="zstd")
+        else:
+            with open(tmp, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(self.columns)
+                writer.writerows(self.rows)
+        # Readers never see half-written parts
+        os.replace(tmp, path)
+        self.last_part = os.path.basename(path)
+        self.part += 1
+        self.rows_written += len(self.rows)
+        self.rows = []
+
+
+class Manifest:
+    """
+    Resume state: which (interval, token) histories are safely on disk.
+
+    Each history part is recorded together with the tokens it completes,
+    in one save. A part renamed into place just before a crash is not in
+    the manifest, so ``prune_parts`` deletes it and its tokens are fetched
+    again instead of being written twice.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.state = {"markets_done": False, "done": {}, "parts": {}}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.state = json.load(f)
+            self.state.setdefault("parts", {})
+
+    def done(self, interval: str) -> Set[str]:
+        return set(self.state["done"].get(interval, []))
+
+    def mark_done(self, interval: str, token_ids: Sequence[str], part: Optional[str] = None):
+        """
+        Record finished tokens and, if given, the part file holding their rows.
+        """
+        self.state["done"].setdefault(interval, []).extend(token_ids)
+        if part is not None:
+            self.state["parts"].setdefault(interval, []).append(part)
+        self.save()
+
+    def prune_parts(self, interval: str, directory: str) -> int:
+        """
+        Delete part files in ``directory`` that the manifest doesn't record.
+
+        Returns:
+            Number of files deleted
+        """
+        recorded = self.state["parts"].get(interval)
+        if recorded is None and self.state["done"].get(interval):
+            # Written before parts were recorded; nothing to compare against
+            return 0
+        recorded = set(recorded or [])
+        removed = 0
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                if name.startswith("part-") and name not in recorded:
+                    os.remove(os.path.join(directory, name))
+                    removed += 1
+        return removed
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp, self.path)
+
+
+def retry_delay(error: Exception, attempt: int, limiter: Optional[RateLimiter]) -> Optional[float]:
+    """
+    Backoff before retrying a failed request, or None if it isn't worth retrying.
+
+    Connection errors, bodies that don't decode and RETRY_STATUSES are
+    retried with jittered exponential backoff; HTTP 429 honours
+    Retry-After and holds back ``limiter`` for that long.
+    """
+    response = getattr(error, "response", None)
+    status = response.status_code if response is not None else None
+    if status is not None and status not in RETRY_STATUSES:
+        return None
+    delay = min(30.0, 0.5 * 2 ** attempt) * (0.5 + random.random())
+    if status == 429:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            delay = float(retry_after)
+        if limiter is not None:
+            limiter.penalize(delay)
+    return delay
+
+
+def iter_catalog(gamma: GammaClient, page_size: int = 500, max_events: Optional[int] = None,
+                 limiter: Optional[RateLimiter] = None, retries: int = 5) -> Iterator[Dict]:
+    """
+    Walk every open event, page by page, streaming each page.
+
+    A page that fails is requested again after a backoff, skipping the
+    events already yielded from it. The walk only ends normally once a
+    short page arrives (or ``max_events`` is reached).
+
+    Args:
+        gamma: GammaClient
+        page_size: Events per request
+        max_events: Stop after this many events
+        limiter: Rate limiter each page request acquires
+        retries: Retries per page before giving up
+
+    Yields:
+        Event dictionaries
+
+    Raises:
+        requests.RequestException, ValueError: If a page still fails after ``retries``
+    """
+    offset = 0
+    while True:
+        count = 0
+        for attempt in range(retries + 1):
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                seen = 0
+                for event in gamma.iter_events({
+                    "limit": page_size,
+                    "offset": offset,
+                    "closed": "false",
+                    "order": "id",
+                    "ascending": "true"
+                }):
+                    seen += 1
+                    if seen <= count:
+                        continue
+                    yield event
+                    count += 1
+                    if max_events is not None and offset + count >= max_events:
+                        return
+                break
+            except (requests.RequestException, ValueError) as e:
+                delay = retry_delay(e, attempt, limiter)
+                if delay is None or attempt == retries:
+                    raise
+                print(f"Error reading catalog page at offset {offset}, retrying: {e}")
+                record_retry("gamma", "/events")
+                time.sleep(delay)
+        if count < page_size:
+            return
+        offset += page_size
+
+
+class HistoryFetcher:
+    """Rate-limited, retrying price history fetches with one session per thread."""
+
+    def __init__(self, limiter: RateLimiter, retries: int = 5):
+        self.limiter = limiter
+        self.retries = retries
+        self.local = threading.local()
+        self.stats = {"requests": 0, "retries": 0, "failed": 0}
+        self.lock = threading.Lock()
+
+    def fetch(self, token_id: str, interval: str) -> Optional[List[tuple]]:
+        """
+        History rows for one token, or None after exhausting retries.
+        """
+        clob = getattr(self.local, "clob", None)
+        if clob is None:
+            clob = self.local.clob = CLOBClient()
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            with self.lock:
+                self.stats["requests"] += 1
+            try:
+                history = clob.fetch_price_history(token_id, interval)
+                return [(token_id, int(t), float(p)) for t, p in history]
+            except requests.RequestException as e:
+                delay = retry_delay(e, attempt, self.limiter)
+                if delay is None:
+                    print(f"Error fetching price history for {token_id}: {e}")
+                    break
+                if attempt < self.retries:
+                    with self.lock:
+                        self.stats["retries"] += 1
+                    record_retry("clob", "/prices-history")
+                    time.sleep(delay)
+            except (KeyError, TypeError, ValueError) as e:
+                # A malformed point fails this token only, not the export
+                print(f"Error parsing price history for {token_id}: {e!r}")
+                break
+        with self.lock:
+            self.stats["failed"] += 1
+        return None
+
+
+def export_markets(gamma: GammaClient, out: str, fmt: str, page_size: int, max_events: Optional[int],
+                   part_rows: int, write: bool = True, limiter: Optional[RateLimiter] = None) -> List[str]:
+    """
+    Walk the catalog, writing the markets dataset, and return every token id.
+
+    Parts go to a staging directory that replaces ``markets/`` only once
+    the walk completes, so a run that dies midway leaves no partial copy
+    for the next run to append to.
+
+    Args:
+        write: False to only collect token ids (markets already exported)
+        limiter: Rate limiter for catalog page requests
+
+    Raises:
+        requests.RequestException, ValueError: If the catalog walk fails
+    """
+    final = os.path.join(out, "markets")
+    staging = final + ".partial"
+    writer = None
+    if write:
+        shutil.rmtree(staging, ignore_errors=True)
+        writer = PartitionedWriter(staging, MARKET_COLUMNS, fmt, part_rows)
+    tokens: List[str] = []
+    batch: List[Dict] = []
+
+    def write_batch():
+        table = parse_events_bulk(batch)
+        columns = [table[name] for name in MARKET_COLUMNS]
+        token_col = MARKET_COLUMNS.index("token_ids")
+        rows = []
+        for token_ids in table["token_ids"]:
+            tokens.extend(token_ids)
+        if writer is None:
+            return
+        for row in zip(*columns):
+            row = [v.item() if hasattr(v, "item") else v for v in row]
+            row[token_col] = json.dumps(list(row[token_col]))
+            rows.append(tuple(row))
+        writer.write(rows)
+
+    for event in iter_catalog(gamma, page_size, max_events, limiter):
+        batch.append(event)
+        if len(batch) >= page_size:
+            write_batch()
+            batch = []
+    if batch:
+        write_batch()
+    if writer is not None:
+        writer.flush()
+        shutil.rmtree(final, ignore_errors=True)
+        os.replace(staging, final)
+        print(f"markets: {writer.rows_written} rows, {len(tokens)} tokens")
+    return list(dict.fromkeys(tokens))
+
+
+def export_histories(tokens: Sequence[str], interval: str, out: str, fmt: str, manifest: Manifest,
+                     fetcher: HistoryFetcher, workers: int, part_rows: int):
+    """
+    Fetch and write histories for ``tokens`` not yet in the manifest.
+
+    At most ``workers * 4`` fetches are in flight, so memory stays bounded
+    by that window plus one part file's rows.
+    """
+    done = manifest.done(interval)
+    todo = [t for t in tokens if t not in done]
+    print(f"history {interval}: {len(todo)} tokens to fetch ({len(done)} already exported)")
+    directory = os.path.join(out, "history", f"interval={interval}")
+    pruned = manifest.prune_parts(interval, directory)
+    if pruned:
+        print(f"history {interval}: removed {pruned} part(s) not recorded in the manifest")
+    writer = PartitionedWriter(directory, HISTORY_COLUMNS, fmt, part_rows)
+    buffered: List[str] = []
+    finished = 0
+    start = time.monotonic()
+
+    def collect(futures):
+        nonlocal finished
+        for future in futures:
+            token_id, rows = future.result()
+            finished += 1
+            if rows is None:
+                continue
+            buffered.append(token_id)
+            if writer.write(rows):
+                # Only tokens whose rows are on disk count as done
+                manifest.mark_done(interval, buffered, writer.last_part)
+                buffered.clear()
+            if finished % 500 == 0:
+                rate = finished / max(time.monotonic() - start, 1e-9)
+                print(f"  {finished}/{len(todo)} tokens ({rate:.1f}/s)")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = set()
+        for token_id in todo:
+            if len(in_flight) >= workers * 4:
+                completed, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(completed)
+            in_flight.add(executor.submit(lambda t=token_id: (t, fetcher.fetch(t, interval))))
+        collect(wait(in_flight).done)
+
+    written = writer.rows_written
+    writer.flush()
+    if buffered:
+        manifest.mark_done(interval, buffered, writer.last_part if writer.rows_written > written else None)
+    print(f"history {interval}: {writer.rows_written} rows written")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Export Polymarket open events and price histories.")
+    parser.add_argument("--out", required=True, help="output directory (reuse it to resume)")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="part file format")
+    parser.add_argument("--interval", action="append", help="history interval, repeatable (default: 1d)")
+    parser.add_argument("--workers", type=int, default=16, help="concurrent history requests")
+    parser.add_argument("--rate", type=float, default=25.0, help="maximum history requests per second")
+    parser.add_argument("--page-size", type=int, default=500, help="events per catalog request")
+    parser.add_argument("--max-events", type=int, help="stop the catalog walk after this many events")
+    parser.add_argument("--part-rows", type=int, default=200_000, help="rows per part file")
+    parser.add_argument("--fresh", action="store_true", help="delete existing datasets and manifest and start over")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port while running")
+    args = parser.parse_args(argv)
+
+    if args.metrics_port is not None:
+        start_http_server(args.metrics_port)
+    os.makedirs(args.out, exist_ok=True)
+    manifest_path = os.path.join(args.out, "manifest.json")
+    if args.fresh:
+        # New parts are numbered after existing ones, so old parts must go too
+        for name in ("markets", "markets.partial", "history"):
+            shutil.rmtree(os.path.join(args.out, name), ignore_errors=True)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+    manifest = Manifest(manifest_path)
+    started = time.monotonic()
+
+    # The token list is always rebuilt from the catalog; resumed runs
+    # don't append a second copy of the markets dataset
+    limiter = RateLimiter(args.rate)
+    try:
+        tokens = export_markets(GammaClient(), args.out, args.format, args.page_size, args.max_events,
+                                args.part_rows, write=not manifest.state["markets_done"], limiter=limiter)
+    except (requests.RequestException, ValueError) as e:
+        # markets_done stays unset, so the next run walks the catalog again
+        parser.exit(1, f"Catalog walk failed, rerun with the same --out to resume: {e}\n")
+    if not manifest.state["markets_done"]:
+        manifest.state["markets_done"] = True
+        manifest.save()
+
+    fetcher = HistoryFetcher(limiter)
+    for interval in args.interval or ["1d"]:
+        export_histories(tokens, interval, args.out, args.format, manifest, fetcher, args.workers, args.part_rows)
+
+    print(f"done in {time.monotonic() - started:.0f}s: {fetcher.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Batched HTML rendering and pagination for the landing feed.
+"""
+import html
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from market_filter import filter_real_events
+from utils import get_event, format_price, format_volume
+
+
+# Raw events requested per feed page (placeholder events are filtered out)
+PAGE_SIZE = 40
+
+# Shared card styles; cards reference these classes instead of inlining
+# the same declarations on every element
+FEED_CSS = """
+<style>
+.pm-feed { display: flex; flex-direction: column; gap: 1rem; }
+.pm-card {
+    display: block;
+    background: linear-gradient(135deg, rgba(26,26,46,0.97), rgba(16,20,55,0.97));
+    border: 2px solid #00f5ff;
+    border-radius: 16px;
+    padding: 1.5rem;
+    box-shadow: 0 0 25px rgba(0,245,255,0.25), 0 0 50px rgba(255,0,255,0.15);
+    text-decoration: none !important;
+    transition: transform 0.15s ease, box-shadow 0.15s ease;
+}
+.pm-card:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 0 35px rgba(0,245,255,0.45), 0 0 70px rgba(255,0,255,0.25);
+}
+.pm-title {
+    font-size: 1.15rem;
+    font-weight: 600;
+    color: #ffffff;
+    line-height: 1.4;
+    margin-bottom: 1.2rem;
+    text-shadow: 0 0 8px rgba(0,245,255,0.4);
+}
+.pm-pills { display: flex; gap: 0.75rem; margin-bottom: 1.2rem; flex-wrap: wrap; }
+.pm-pill {
+    flex: 1;
+    min-width: 80px;
+    padding: 0.75rem 0.5rem;
+    border: 2px solid;
+    border-radius: 10px;
+    text-align: center;
+    font-weight: 700;
+    font-size: 0.85rem;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}
+.pm-pill b { display: block; font-size: 1.2rem; margin-top: 4px; }
+.pm-hi { color: #00f5ff; border-color: #00f5ff; background: rgba(0,245,255,0.15); box-shadow: 0 0 15px rgba(0,245,255,0.4); }
+.pm-mid { color: #ffff00; border-color: #ffff00; background: rgba(255,255,0,0.15); box-shadow: 0 0 15px rgba(255,255,0,0.4); }
+.pm-lo { color: #ff00ff; border-color: #ff00ff; background: rgba(255,0,255,0.15); box-shadow: 0 0 15px rgba(255,0,255,0.4); }
+.pm-foot { display: flex; justify-content: space-between; color: #00f5ff; font-size: 0.85rem; font-weight: 600; letter-spacing: 1px; }
+.pm-enter { color: #ff00ff; }
+</style>
+"""
+
+_CARD_CACHE_SIZE = 2048
+_card_cache: "OrderedDict[Tuple, str]" = OrderedDict()
+_card_lock = threading.Lock()
+
+
+def _pill_class(price: float) -> str:
+    if price > 0.6:
+        return "pm-hi"
+    if price > 0.4:
+        return "pm-mid"
+    return "pm-lo"
+
+
+def card_html(event, link_params: Optional[Dict[str, str]] = None) -> str:
+    """
+    HTML for one event card, linking to ``?event=<id>``.
+
+    The card's ``data-event`` attribute lets the app open it in the current
+    session; the link itself is the fallback (and serves "open in new tab").
+    Cards are memoized per event content, so unchanged events cost a dict
+    lookup on rerun.
+
+    Args:
+        event: Event dictionary from Gamma API (or a parsed Event)
+        link_params: Extra query parameters to keep in the card link
+
+    Returns:
+        HTML string ('' for events without markets)
+    """
+    model = get_event(event)
+    if not model.markets:
+        return ""
+    params = {**(link_params or {}), "event": model.id}
+    key = (model.id, model.fingerprint, tuple(sorted(params.items())))
+    cached = _card_cache.get(key)
+    if cached is not None:
+        return cached
+
+    first_market = model.markets[0]
+    prices = first_market.outcome_prices
+    pills = []
+    for i, outcome in enumerate(first_market.outcomes[:4]):
+        price = prices[i] if i < len(prices) else 0
+        pills.append(
+            f'<div class="pm-pill {_pill_class(price)}">{html.escape(str(outcome))}'
+            f'<b>{format_price(price)}</b></div>'
+        )
+    card = (
+        f'<a class="pm-card" href="?{html.escape(urlencode(params))}" target="_self" '
+        f'data-event="{html.escape(model.id)}">'
+        f'<div class="pm-title">{html.escape(model.title)}</div>'
+        f'<div class="pm-pills">{"".join(pills)}</div>'
+        f'<div class="pm-foot"><span>&#x1F48E; {format_volume(first_market.volume)} VOL</span>'
+        f'<span class="pm-enter">⚡ ENTER</span></div>'
+        f'</a>'
+    )
+    with _card_lock:
+        _card_cache[key] = card
+        if len(_card_cache) > _CARD_CACHE_SIZE:
+            _card_cache.popitem(last=False)
+    return card
+
+
+def feed_html(events: Iterable, link_params: Optional[Dict[str, str]] = None) -> str:
+    """
+    One HTML block holding every card, rendered with a single st.markdown.
+
+    Args:
+        events: Event dictionaries (or parsed Events)
+        link_params: Extra query parameters to keep in card links
+
+    Returns:
+        HTML string
+    """
+    cards = "".join(card_html(e, link_params) for e in events)
+    return f'<div class="pm-feed">{cards}</div>'
+
+
+def load_feed(data, pages: int, page_size: int = PAGE_SIZE) -> Tuple[List[List], bool]:
+    """
+    The first ``pages`` pages of the popular feed.
+
+    Events repeated on a later page (the ranking can shift between page
+    fetches) are dropped.
+
+    Args:
+        data: CachedDataService (pages are cached individually)
+        pages: Number of pages to load
+        page_size: Raw events per page
+
+    Returns:
+        (one list of real events per page, whether more pages may exist)
+    """
+    loaded = []
+    seen = set()
+    for page in range(pages):
+        raw = data.popular_events(page_size, offset=page * page_size)
+        events = []
+        for event in filter_real_events(raw):
+            event_id = get_event(event).id
+            if event_id not in seen:
+                seen.add(event_id)
+                events.append(event)
+        loaded.append(events)
+        if len(raw) < page_size:
+            return loaded, False
+    return loaded, True
@@ -0,0 +1,213 @@
+"""
+Latency and throughput instrumentation for the WebSocket feed.
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+from metrics import (
+    FAST_BUCKETS,
+    LATENCY_BUCKETS,
+    Histogram,
+    RateWindow,
+    format_family,
+    format_histogram,
+    format_labels,
+    format_value,
+)
+
+
+class FeedMetrics:
+    """
+    Counters and histograms describing how fresh and how busy the feed is.
+
+    Recorded per event type: exchange-to-receive latency, messages/sec and
+    bytes/sec. Recorded per frame: handler time. Also lock wait time,
+    reconnects and disconnect gap durations. Every recording call is a
+    lock acquire plus a few array adds, cheap enough to leave on.
+
+    Read with ``snapshot()`` (dict) or ``render_prometheus()`` (text).
+    """
+
+    def __init__(self, rate_window: int = 60):
+        """
+        Args:
+            rate_window: Seconds averaged by the messages/sec and bytes/sec rates
+        """
+        self.rate_window = rate_window
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.messages: Dict[str, RateWindow] = {}
+        self.bytes: Dict[str, RateWindow] = {}
+        self.latency: Dict[str, Histogram] = {}
+        self.handler_time = Histogram(FAST_BUCKETS)
+        self.lock_wait = Histogram(FAST_BUCKETS)
+        self.gap_duration = Histogram(LATENCY_BUCKETS)
+        self.frames = RateWindow(rate_window)
+        self.parse_errors = 0
+        self.connects = 0
+        self.reconnects = 0
+        self.disconnects = 0
+        self.connected_since: Optional[float] = None
+        self._disconnected_at: Optional[float] = None
+
+    def record_frame(self, events: List[Dict], nbytes: int, recv_ts: float, handler_seconds: float):
+        """
+        Record one received WebSocket frame.
+
+        Args:
+            events: Decoded events in the frame
+            nbytes: Raw frame size; split evenly across its events
+            recv_ts: Receive timestamp
+            handler_seconds: Time spent decoding and processing the frame
+        """
+        share = nbytes / len(events) if events else nbytes
+        with self.lock:
+            self.frames.add(1, recv_ts)
+            self.handler_time.observe(handler_seconds)
+            for event in events:
+                if not isinstance(event, dict):
+                    continue
+                msg_type = event.get("event_type") or event.get("type") or "unknown"
+                messages = self.messages.get(msg_type)
+                if messages is None:
+                    messages = self.messages[msg_type] = RateWindow(self.rate_window)
+                    self.bytes[msg_type] = RateWindow(self.rate_window)
+                    self.latency[msg_type] = Histogram(LATENCY_BUCKETS)
+                messages.add(1, recv_ts)
+                self.bytes[msg_type].add(share, recv_ts)
+
+                exchange_ts = _exchange_timestamp(event)
+                if exchange_ts is not None:
+                    self.latency[msg_type].observe(max(recv_ts - exchange_ts, 0.0))
+
+    def record_parse_error(self):
+        """Record a frame that could not be decoded."""
+        with self.lock:
+            self.parse_errors += 1
+
+    def record_lock_wait(self, seconds: float):
+        """Record time spent waiting for the live-price lock."""
+        with self.lock:
+            self.lock_wait.observe(seconds)
+
+    def record_connect(self, now: Optional[float] = None):
+        """Record a successful (re)connection and the gap since the last drop."""
+        now = now if now is not None else time.time()
+        with self.lock:
+            if self.connects:
+                self.reconnects += 1
+            self.connects += 1
+            if self._disconnected_at is not None:
+                self.gap_duration.observe(now - self._disconnected_at)
+                self._disconnected_at = None
+            self.connected_since = now
+
+    def record_disconnect(self, now: Optional[float] = None):
+        """Record a dropped connection."""
+        now = now if now is not None else time.time()
+        with self.lock:
+            self.disconnects += 1
+            self.connected_since = None
+            if self._disconnected_at is None:
+                self._disconnected_at = now
+
+    def snapshot(self, now: Optional[float] = None) -> Dict:
+        """
+        Returns:
+            Nested dictionary of every metric, with recent rates computed
+            over ``rate_window`` seconds
+        """
+        now = now if now is not None else time.time()
+        with self.lock:
+            by_type = {
+                msg_type: {
+                    "messages": self.messages[msg_type].total,
+                    "messages_per_sec": self.messages[msg_type].rate(now),
+                    "bytes": self.bytes[msg_type].total,
+                    "bytes_per_sec": self.bytes[msg_type].rate(now),
+                    "latency": self.latency[msg_type].snapshot(),
+                }
+                for msg_type in self.messages
+            }
+            return {
+                "uptime": now - self.started,
+                "frames": self.frames.total,
+                "frames_per_sec": self.frames.rate(now),
+                "parse_errors": self.parse_errors,
+                "events": by_type,
+                "handler_time": self.handler_time.snapshot(),
+                "lock_wait": self.lock_wait.snapshot(),
+                "connects": self.connects,
+                "reconnects": self.reconnects,
+                "disconnects": self.disconnects,
+                "connected": self.connected_since is not None,
+                "current_gap": now - self._disconnected_at if self._disconnected_at is not None else 0.0,
+                "gap_duration": self.gap_duration.snapshot(),
+            }
+
+    def render_prometheus(self, prefix: str = "polymarket_ws", labels: Optional[Dict[str, str]] = None) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix: Metric name prefix
+            labels: Extra labels for every sample (e.g. a connection index)
+
+        Returns:
+            Exposition text ending in a newline
+        """
+        labels = dict(labels or {})
+        base = format_labels(labels)
+        with self.lock:
+            lines = []
+            types = sorted(self.messages)
+
+            def counter(name, help_text, samples):
+                lines.extend(format_family(f"{prefix}_{name}", "counter", help_text, samples))
+
+            def histogram(name, help_text, samples):
+                lines.extend(format_family(f"{prefix}_{name}", "histogram", help_text, samples))
+
+            counter("messages_total", "Events received by type.", [
+                f"{prefix}_messages_total{format_labels({**labels, 'type': t})} {self.messages[t].total}"
+                for t in types
+            ])
+            counter("bytes_total", "Bytes received by event type.", [
+                f"{prefix}_bytes_total{format_labels({**labels, 'type': t})} {format_value(self.bytes[t].total)}"
+                for t in types
+            ])
+            latency_lines = []
+            for t in types:
+                latency_lines.extend(
+                    format_histogram(f"{prefix}_latency_seconds", self.latency[t], {**labels, "type": t})
+                )
+            histogram("latency_seconds", "Exchange timestamp to receive time.", latency_lines)
+            histogram("handler_seconds", "Time to decode and process one frame.",
+                      format_histogram(f"{prefix}_handler_seconds", self.handler_time, labels))
+            histogram("lock_wait_seconds", "Time waiting for the live price lock.",
+                      format_histogram(f"{prefix}_lock_wait_seconds", self.lock_wait, labels))
+            histogram("gap_seconds", "Duration of disconnections.",
+                      format_histogram(f"{prefix}_gap_seconds", self.gap_duration, labels))
+            counter("frames_total", "Frames received.", [f"{prefix}_frames_total{base} {self.frames.total}"])
+            counter("parse_errors_total", "Frames that failed to decode.",
+                    [f"{prefix}_parse_errors_total{base} {self.parse_errors}"])
+            counter("reconnects_total", "Reconnections after a drop.",
+                    [f"{prefix}_reconnects_total{base} {self.reconnects}"])
+            counter("disconnects_total", "Dropped connections.",
+                    [f"{prefix}_disconnects_total{base} {self.disconnects}"])
+            lines.extend(format_family(f"{prefix}_connected", "gauge", "1 while connected.", [
+                f"{prefix}_connected{base} {1 if self.connected_since is not None else 0}"
+            ]))
+        return "\n".join(lines) + "\n"
+
+
+def _exchange_timestamp(event: Dict) -> Optional[float]:
+    """Exchange timestamp of an event in epoch seconds (source is ms)."""
+    value = event.get("timestamp")
+    if value is None:
+        return None
+    try:
+        return float(value) / 1000.0
+    except (TypeError, ValueError):
+        return None
@@ -2,26 +2,72 @@
 Gamma API client for Polymarket events and markets.
 """
 import requests
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
+
+from http_metrics import count_stream_bytes, instrument_session
+from json_stream import iter_array_items
+
+
+# Fields the app, utils and the bulk parser read; streaming calls can drop
+# everything else as each event is decoded
+EVENT_FIELDS = frozenset([
+    "id", "slug", "title", "description", "markets", "negRisk", "enableNegRisk",
+    "volume", "volume24hr", "liquidity", "endDate", "active", "closed",
+])
+MARKET_FIELDS = frozenset([
+    "id", "question", "groupItemTitle", "outcomes", "outcomePrices", "prices", "price", "lastPrice",
+    "clobTokenIds", "volume", "volume24hr", "liquidity", "bestBid", "bestAsk",
+    "spread", "oneDayPriceChange", "endDate", "active", "closed",
+])
+
+
+def project_event(event: Dict) -> Dict:
+    """
+    Keep only EVENT_FIELDS of an event and MARKET_FIELDS of its markets.
+    
+    Args:
+        event: Event dictionary from Gamma API
+        
+    Returns:
+        New, smaller event dictionary
+    """
+    if not isinstance(event, dict):
+        return event
+    projected = {k: v for k, v in event.items() if k in EVENT_FIELDS}
+    markets = projected.get("markets")
+    if isinstance(markets, list):
+        projected["markets"] = [
+            {k: v for k, v in m.items() if k in MARKET_FIELDS} if isinstance(m, dict) else m
+            for m in markets
+        ]
+    return projected
 
 
 class GammaClient:
     """Client for interacting with Polymarket's Gamma API."""
     
     BASE_URL = "https://gamma-api.polymarket.com"
+    STREAM_CHUNK_SIZE = 64 * 1024
     
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(self, base_url: Optional[str] = None):
+        """
+        Args:
+            base_url: API root (BASE_URL by default; e.g. a local stand-in)
+        """
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
+        self.session = instrument_session(requests.Session(), "gamma")
         self.session.headers.update({
             'Accept': 'application/json',
         })
     
-    def get_popular_events(self, limit: int = 20) -> List[Dict]:
+    def get_popular_events(self, limit: int = 20, offset: int = 0) -> List[Dict]:
         """
         Fetch popular/featured events that are currently open.
         
         Args:
             limit: Maximum number of events to return
+            offset: Number of events to skip (for paging)
             
         Returns:
             List of event dictionaries
@@ -32,6 +78,7 @@ class GammaClient:
                 f"{self.BASE_URL}/events",
                 params={
                     "limit": limit,
+                    "offset": offset,
                     "closed": "false",  # Only open markets
                     "order": "volume24hr",  # Order by recent volume
                     "ascending": "false"  # Descending order (highest first)
@@ -122,4 +169,107 @@ class GammaClient:
             return response.json()
         except requests.RequestException as e:
             print(f"Error fetching event {event_slug}: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def iter_popular_events(self, limit: int = 20, offset: int = 0, project: bool = True) -> Iterator[Dict]:
+        """
+        Stream popular open events, decoding them one at a time.
+        
+        Same query as get_popular_events, but events are yielded as their
+        bytes arrive instead of after the whole payload is parsed.
+        
+        Args:
+            limit: Maximum number of events to return
+            offset: Number of events to skip (for paging)
+            project: Drop fields outside EVENT_FIELDS / MARKET_FIELDS
+            
+        Yields:
+            Event dictionaries
+            
+        Raises:
+            requests.RequestException, ValueError: See _stream
+        """
+        yield from self._stream(
+            "/events",
+            {
+                "limit": limit,
+                "offset": offset,
+                "closed": "false",
+                "order": "volume24hr",
+                "ascending": "false"
+            },
+            project=project
+        )
+    
+    def iter_events(self, params: Dict, project: bool = True) -> Iterator[Dict]:
+        """
+        Stream any /events query.
+        
+        Args:
+            params: Query parameters for /events
+            project: Drop fields outside EVENT_FIELDS / MARKET_FIELDS
+            
+        Yields:
+            Event dictionaries
+            
+        Raises:
+            requests.RequestException, ValueError: See _stream
+        """
+        yield from self._stream("/events", params, project=project)
+    
+    def iter_search_events(self, query: str, limit_per_type: int = 20, project: bool = True) -> Iterator[Dict]:
+        """
+        Stream public-search event results, decoding them one at a time.
+        
+        Args:
+            query: Search query string
+            limit_per_type: Maximum results per type
+            project: Drop fields outside EVENT_FIELDS / MARKET_FIELDS
+            
+        Yields:
+            Matching event dictionaries
+            
+        Raises:
+            requests.RequestException, ValueError: See _stream
+        """
+        if not query or not query.strip():
+            return
+        yield from self._stream(
+            "/public-search",
+            {
+                "q": query.strip(),
+                "limit_per_type": limit_per_type,
+                "events_status": "open",
+                "search_profiles": "false"
+            },
+            key="events",
+            project=project
+        )
+    
+    def _stream(self, path: str, params: Dict, key: Optional[str] = None, project: bool = True) -> Iterator[Dict]:
+        """
+        GET a JSON endpoint and yield items of its event array incrementally.
+        
+        Errors are not swallowed: a stream that ends early would otherwise
+        look like a complete, shorter result.
+        
+        Args:
+            path: Endpoint path
+            params: Query parameters
+            key: Top-level key holding the array (None if the body is the array)
+            project: Apply project_event to each item
+            
+        Raises:
+            requests.RequestException: If the request fails or the connection drops mid-stream
+            ValueError: If the body is not the expected JSON array
+        """
+        with self.session.get(
+            f"{self.BASE_URL}{path}",
+            params=params,
+            timeout=10,
+            stream=True
+        ) as response:
+            response.raise_for_status()
+            chunks = count_stream_bytes(response.iter_content(self.STREAM_CHUNK_SIZE), "gamma", path)
+            for item in iter_array_items(chunks, key=key):
+                yield project_event(item) if project else item
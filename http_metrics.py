@@ -0,0 +1,120 @@
+"""
+Per-endpoint HTTP instrumentation for the REST clients.
+"""
+import time
+from typing import Iterable, Iterator
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import REGISTRY
+
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "polymarket_http_requests_total",
+    "HTTP requests by client, endpoint and status (exception name on failure).",
+    ("client", "endpoint", "status"),
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "polymarket_http_request_seconds",
+    "Request time including the response body (headers only for streams).",
+    ("client", "endpoint"),
+)
+HTTP_BYTES = REGISTRY.counter(
+    "polymarket_http_response_bytes_total",
+    "Response body bytes received.",
+    ("client", "endpoint"),
+)
+HTTP_RETRIES = REGISTRY.counter(
+    "polymarket_http_retries_total",
+    "Requests repeated after a retryable failure.",
+    ("client", "endpoint"),
+)
+
+
+def endpoint_label(url: str) -> str:
+    """
+    Low-cardinality endpoint name for a URL.
+
+    The first path segment is kept and the rest become ``{id}``, so
+    ``/events/123`` and ``/events/456`` share ``/events/{id}``.
+
+    Args:
+        url: Full URL or path (query string ignored)
+    """
+    segments = [s for s in urlsplit(url).path.split("/") if s]
+    if not segments:
+        return "/"
+    return "/" + "/".join([segments[0]] + ["{id}"] * (len(segments) - 1))
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that records every request into the HTTP_* metrics.
+
+    Non-streamed bodies are read here (requests would read them right
+    after anyway) so latency and byte counts cover the whole response.
+    Streamed bodies are counted by the caller with ``count_stream_bytes``.
+    """
+
+    def __init__(self, client: str, **kwargs):
+        """
+        Args:
+            client: Client label (e.g. "gamma", "clob")
+            **kwargs: Passed to HTTPAdapter
+        """
+        super().__init__(**kwargs)
+        self.client = client
+
+    def send(self, request, stream=False, **kwargs):
+        endpoint = endpoint_label(request.path_url)
+        start = time.perf_counter()
+        try:
+            response = super().send(request, stream=stream, **kwargs)
+            if not stream:
+                HTTP_BYTES.inc(self.client, endpoint, amount=len(response.content))
+        except requests.RequestException as e:
+            HTTP_LATENCY.observe(time.perf_counter() - start, self.client, endpoint)
+            HTTP_REQUESTS.inc(self.client, endpoint, type(e).__name__)
+            raise
+        HTTP_LATENCY.observe(time.perf_counter() - start, self.client, endpoint)
+        HTTP_REQUESTS.inc(self.client, endpoint, str(response.status_code))
+        return response
+
+
+def instrument_session(session: requests.Session, client: str) -> requests.Session:
+    """
+    Mount an InstrumentedAdapter for http and https on a session.
+
+    Args:
+        session: Session to instrument (modified in place)
+        client: Client label for the metrics
+
+    Returns:
+        The same session
+    """
+    adapter = InstrumentedAdapter(client)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def count_stream_bytes(chunks: Iterable[bytes], client: str, url: str) -> Iterator[bytes]:
+    """
+    Pass through a streamed body, counting its bytes into HTTP_BYTES.
+
+    Args:
+        chunks: Body chunks (e.g. ``response.iter_content(...)``)
+        client: Client label
+        url: Request URL (for the endpoint label)
+    """
+    endpoint = endpoint_label(url)
+    for chunk in chunks:
+        HTTP_BYTES.inc(client, endpoint, amount=len(chunk))
+        yield chunk
+
+
+def record_retry(client: str, url: str):
+    """Count one retried request."""
+    HTTP_RETRIES.inc(client, endpoint_label(url))
@@ -0,0 +1,140 @@
+"""
+Incremental decoding of large JSON arrays from a stream of byte chunks.
+"""
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Optional
+
+
+_WHITESPACE = " \t\n\r"
+# Unconsumed text kept before the buffer is compacted
+_COMPACT_AT = 1 << 16
+
+
+class _Reader:
+    """Growable text window over an iterator of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes], encoding: str):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, min_available: int = 1) -> bool:
+        """
+        Read until at least ``min_available`` unconsumed characters exist.
+
+        Returns:
+            False if the stream ended first
+        """
+        if self.pos > _COMPACT_AT and self.pos * 2 > len(self.buf):
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        parts = [self.buf]
+        available = len(self.buf) - self.pos
+        while available < min_available and not self.eof:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self.eof = True
+                text = self.decoder.decode(b"", final=True)
+            else:
+                text = self.decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            parts.append(text)
+            available += len(text)
+        self.buf = "".join(parts)
+        return available >= min_available
+
+    def peek(self) -> str:
+        """Next non-whitespace character (without consuming it), '' at end."""
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """Consume one of ``chars`` (after whitespace) and return it."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} at offset {self.pos}, got {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self, decoder: json.JSONDecoder) -> Any:
+        """
+        Decode one complete JSON value, reading more input as needed.
+
+        Retries only after the unconsumed text has doubled, so a value
+        spanning many chunks costs O(size) overall, not O(size^2).
+        """
+        self.peek()
+        while True:
+            try:
+                obj, end = decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                obj, end = None, None
+            # A number (or literal) running to the end of the buffer may be cut off
+            if end is not None and (end < len(self.buf) or self.eof):
+                self.pos = end
+                return obj
+            self.fill(2 * max(len(self.buf) - self.pos, 1))
+
+
+def iter_array_items(
+    chunks: Iterable[bytes],
+    key: Optional[str] = None,
+    encoding: str = "utf-8",
+) -> Iterator[Any]:
+    """
+    Yield the items of a JSON array one at a time as chunks arrive.
+
+    Only the item being decoded (plus one chunk) is held in memory.
+
+    Args:
+        chunks: Byte (or text) chunks of the document, e.g. iter_content()
+        key: None if the document is the array itself; otherwise the
+            document is an object and the array under this top-level key
+            is streamed (other keys are skipped)
+        encoding: Text encoding of the byte chunks
+
+    Yields:
+        Decoded array items
+
+    Raises:
+        ValueError: If the document is not shaped as expected or is invalid
+    """
+    reader = _Reader(chunks, encoding)
+    decoder = json.JSONDecoder()
+
+    if key is not None:
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+        while True:
+            name = reader.value(decoder)
+            reader.expect(":")
+            if name == key:
+                if reader.peek() == "[":
+                    break
+                value = reader.value(decoder)
+                if value is not None:
+                    raise ValueError(f"Value under {key!r} is not an array")
+                return
+            reader.value(decoder)
+            if reader.expect(",}") == "}":
+                return
+
+    reader.expect("[")
+    if reader.peek() == "]":
+        return
+    while True:
+        yield reader.value(decoder)
+        if reader.expect(",]") == "]":
+            return
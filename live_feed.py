@@ -0,0 +1,217 @@
+"""
+Live prices for the UI, shared by every Streamlit session in a process.
+"""
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Set
+
+from metrics import format_family, merge_exposition
+from price_feeder import DEFAULT_TABLE_NAME, SharedPriceReader
+from ws_manager import WSConnectionManager
+
+
+# Seconds between attempts to attach to a feeder table that didn't exist
+_ATTACH_INTERVAL = 5.0
+
+
+class LiveFeed:
+    """
+    Reference-counted live price subscriptions.
+
+    Prices come from the feeder's shared-memory table when a feeder is
+    running; assets the feeder doesn't carry are subscribed on in-process
+    WebSocket connections instead. Each session declares the assets it is
+    watching; an asset is unsubscribed once no session watches it.
+    Sessions that stop calling ``watch`` (closed tabs) expire after
+    ``session_ttl`` seconds. When the feeder dies, starts, or changes the
+    assets it carries, the in-process subscriptions are re-synced on the
+    next ``watch`` or ``get_prices``.
+
+    Reads return the latest value per asset, so however many ticks arrive
+    between two UI refreshes, the UI renders once with the newest prices.
+    """
+
+    def __init__(
+        self,
+        table_name: str = DEFAULT_TABLE_NAME,
+        max_assets_per_connection: int = 500,
+        session_ttl: float = 60.0,
+        manager_factory: Callable[..., WSConnectionManager] = WSConnectionManager,
+    ):
+        """
+        Args:
+            table_name: Shared memory table published by price_feeder.py
+            max_assets_per_connection: Per-socket cap for in-process connections
+            session_ttl: Seconds without a ``watch`` call before a session expires
+            manager_factory: Builds the in-process connection manager
+        """
+        self.table_name = table_name
+        self.reader: Optional[SharedPriceReader] = None
+        self.next_attach = 0.0
+        self.attach_lock = threading.Lock()
+        self._attach_reader()
+        self.max_assets_per_connection = max_assets_per_connection
+        self.session_ttl = session_ttl
+        self.manager_factory = manager_factory
+        self.manager: Optional[WSConnectionManager] = None
+        self.sessions: Dict[str, Set[str]] = {}
+        self.last_seen: Dict[str, float] = {}
+        # Feeder state the in-process subscriptions were last synced against
+        self.synced: Optional[tuple] = None
+        self.lock = threading.Lock()
+
+    @property
+    def source(self) -> str:
+        """'feeder' while a feeder process is publishing, else 'websocket'."""
+        return "feeder" if self._feeder_alive() else "websocket"
+
+    def watch(self, session_key: str, asset_ids: Iterable[str]):
+        """
+        Set the assets a session is watching (and mark the session alive).
+
+        Args:
+            session_key: Stable per-session identifier
+            asset_ids: CLOB token IDs the session displays
+        """
+        assets = {aid for aid in asset_ids if aid}
+        now = time.monotonic()
+        with self.lock:
+            self.last_seen[session_key] = now
+            expired = self._expire(now)
+            if self.sessions.get(session_key) == assets and not expired and self._feeder_state() == self.synced:
+                return
+            self.sessions[session_key] = assets
+            self._sync()
+
+    def release(self, session_key: str):
+        """Stop watching everything for a session."""
+        with self.lock:
+            self.last_seen.pop(session_key, None)
+            if self.sessions.pop(session_key, None):
+                self._sync()
+
+    def get_prices(self, asset_ids: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Latest prices for several assets.
+
+        Args:
+            asset_ids: CLOB token IDs
+
+        Returns:
+            Asset ID -> dict with best_bid, best_ask, last_trade_price (if available)
+        """
+        state = self._feeder_state()
+        if state != self.synced:
+            with self.lock:
+                self._sync()
+        feeder = state[0]
+        manager = self.manager
+        prices = {}
+        for aid in asset_ids:
+            live = self.reader.get_live_prices(aid) if feeder else {}
+            if not live and manager is not None:
+                live = manager.get_live_prices(aid) or {}
+            prices[aid] = live
+        return prices
+
+    def render_prometheus(self, prefix: str = "polymarket_live") -> str:
+        """
+        Watching sessions and assets, the price source, and the in-process
+        connections' WebSocket metrics when any exist.
+
+        Args:
+            prefix: Metric name prefix for the LiveFeed gauges
+
+        Returns:
+            Exposition text ending in a newline
+        """
+        with self.lock:
+            sessions = len(self.sessions)
+            assets = len(set().union(*self.sessions.values())) if self.sessions else 0
+            manager = self.manager
+        feeder = 1 if self._feeder_alive() else 0
+        lines = format_family(f"{prefix}_sessions", "gauge", "Sessions watching live prices.",
+                              [f"{prefix}_sessions {sessions}"])
+        lines += format_family(f"{prefix}_watched_assets", "gauge", "Distinct assets watched by sessions.",
+                               [f"{prefix}_watched_assets {assets}"])
+        lines += format_family(f"{prefix}_feeder", "gauge", "1 while reading the feeder's shared table.",
+                               [f"{prefix}_feeder {feeder}"])
+        texts = ["\n".join(lines)]
+        if manager is not None:
+            texts.append(manager.render_prometheus())
+        return merge_exposition(texts)
+
+    def close(self):
+        """Close connections and detach from the feeder table."""
+        with self.lock:
+            self.sessions.clear()
+            self.last_seen.clear()
+            if self.manager is not None:
+                self.manager.disconnect()
+                self.manager = None
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+    def _attach_reader(self):
+        """Attach to the feeder's table, at most every _ATTACH_INTERVAL seconds."""
+        if not self.attach_lock.acquire(blocking=False):
+            return
+        try:
+            now = time.monotonic()
+            if self.reader is not None or now < self.next_attach:
+                return
+            self.next_attach = now + _ATTACH_INTERVAL
+            self.reader = SharedPriceReader(self.table_name)
+        except (FileNotFoundError, ValueError):
+            pass
+        finally:
+            self.attach_lock.release()
+
+    def _feeder_alive(self) -> bool:
+        if self.reader is None:
+            self._attach_reader()
+        return self.reader is not None and self.reader.is_alive()
+
+    def _feeder_state(self) -> tuple:
+        """(feeder alive, version of its published asset set)."""
+        if not self._feeder_alive():
+            return False, None
+        return True, self.reader.version()
+
+    def _expire(self, now: float) -> bool:
+        """Drop sessions not seen within session_ttl (lock held)."""
+        expired = False
+        for key, seen in list(self.last_seen.items()):
+            if now - seen > self.session_ttl:
+                del self.last_seen[key]
+                expired = self.sessions.pop(key, None) is not None or expired
+        return expired
+
+    def _sync(self):
+        """Subscribe the union of watched assets the feeder lacks (lock held)."""
+        watched: Set[str] = set().union(*self.sessions.values()) if self.sessions else set()
+        self.synced = self._feeder_state()
+        if self.synced[0]:
+            watched.difference_update(self.reader.asset_ids())
+        if self.manager is None:
+            if not watched:
+                return
+            self.manager = self.manager_factory(max_assets_per_connection=self.max_assets_per_connection)
+        self.manager.set_assets(sorted(watched))
+
+
+def live_price(prices: Dict, fallback: float) -> float:
+    """
+    Single display price from a live price dict.
+
+    Uses the bid/ask midpoint when both sides are quoted, then the last
+    trade, then ``fallback`` (e.g. the Gamma snapshot price).
+    """
+    bid = prices.get("best_bid")
+    ask = prices.get("best_ask")
+    if bid is not None and ask is not None:
+        return (bid + ask) / 2
+    last = prices.get("last_trade_price")
+    return last if last is not None else fallback
+
@@ -0,0 +1,234 @@
+"""
+Incremental per-asset rolling statistics computed from the live WebSocket feed.
+"""
+import math
+import threading
+import time
+from array import array
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from utils import safe_float
+from ws_client import extract_price_update
+
+
+# Column name -> initial value for a new slot
+_COLUMNS = {
+    "best_bid": math.nan,
+    "best_ask": math.nan,
+    "mid": math.nan,
+    "spread": math.nan,
+    "last_trade_price": math.nan,
+    "ewma_mid": math.nan,
+    "ewma_var": 0.0,
+    "last_quote_ts": 0.0,
+    "last_update_ts": 0.0,
+}
+_COUNTS = ("updates", "book_updates", "price_changes", "trades")
+
+
+class LiveStats:
+    """
+    Rolling mid, spread, EWMA volatility, trade VWAP and update counts per asset.
+
+    Every asset gets a slot index into flat ``array`` columns, so an update
+    is a handful of indexed float writes. VWAP windows keep a deque of trades
+    with running sums, so each trade costs amortized O(1) per window.
+
+    Attach to a WSClient or WSConnectionManager with ``add_listener(stats)``.
+    """
+
+    def __init__(
+        self,
+        halflife: float = 60.0,
+        vwap_windows: Tuple[int, ...] = (60, 300, 3600),
+    ):
+        """
+        Args:
+            halflife: EWMA half-life in seconds for mid and volatility
+            vwap_windows: Trade VWAP window lengths in seconds
+        """
+        self.halflife = halflife
+        self.vwap_windows = tuple(sorted(vwap_windows))
+        self.lock = threading.Lock()
+        self._init_storage()
+
+    def _init_storage(self):
+        """Create empty columns."""
+        self.slots: Dict[str, int] = {}
+        self._values = {name: array("d") for name in _COLUMNS}
+        self._counts = {name: array("Q") for name in _COUNTS}
+        # Per window: per-slot trade deques plus running notional/size sums
+        self._trades: Dict[int, List[deque]] = {w: [] for w in self.vwap_windows}
+        self._notional: Dict[int, array] = {w: array("d") for w in self.vwap_windows}
+        self._size: Dict[int, array] = {w: array("d") for w in self.vwap_windows}
+
+    def __call__(self, event: Dict, recv_ts: float):
+        """WSClient listener entry point."""
+        self.update(event, recv_ts)
+
+    def update(self, event: Dict, recv_ts: Optional[float] = None):
+        """
+        Fold one WebSocket event into the statistics.
+
+        Args:
+            event: Decoded book, price_change or last_trade_price event
+            recv_ts: Receive timestamp (defaults to now)
+        """
+        msg_type, asset_id, fields = extract_price_update(event)
+        if not asset_id:
+            return
+        ts = recv_ts if recv_ts is not None else time.time()
+
+        with self.lock:
+            slot = self.slots.get(asset_id)
+            if slot is None:
+                slot = self._add_slot(asset_id)
+            values = self._values
+            counts = self._counts
+
+            counts["updates"][slot] += 1
+            values["last_update_ts"][slot] = ts
+
+            if msg_type == "last_trade_price":
+                counts["trades"][slot] += 1
+                price = fields.get("last_trade_price")
+                if price is not None:
+                    values["last_trade_price"][slot] = price
+                    size = safe_float(event.get("size"), 1.0)
+                    self._add_trade(slot, ts, price, size)
+                return
+
+            counts["book_updates" if msg_type == "book" else "price_changes"][slot] += 1
+            if "best_bid" in fields:
+                values["best_bid"][slot] = fields["best_bid"]
+            if "best_ask" in fields:
+                values["best_ask"][slot] = fields["best_ask"]
+
+            bid = values["best_bid"][slot]
+            ask = values["best_ask"][slot]
+            if math.isnan(bid) or math.isnan(ask):
+                return
+
+            mid = (bid + ask) / 2
+            prev_mid = values["mid"][slot]
+            values["mid"][slot] = mid
+            values["spread"][slot] = ask - bid
+
+            prev_ts = values["last_quote_ts"][slot]
+            values["last_quote_ts"][slot] = ts
+            if math.isnan(prev_mid):
+                values["ewma_mid"][slot] = mid
+                return
+
+            # Time-decayed EWMA: weight of the new sample grows with the gap
+            alpha = 1.0 - 0.5 ** (max(ts - prev_ts, 0.0) / self.halflife)
+            values["ewma_mid"][slot] += alpha * (mid - values["ewma_mid"][slot])
+            if prev_mid > 0 and mid > 0:
+                ret = math.log(mid / prev_mid)
+                values["ewma_var"][slot] += alpha * (ret * ret - values["ewma_var"][slot])
+
+    def get_stats(self, asset_id: str, now: Optional[float] = None) -> Dict:
+        """
+        Get the current statistics for an asset.
+
+        Args:
+            asset_id: CLOB token ID
+            now: Reference time for VWAP windows (defaults to now)
+
+        Returns:
+            Dictionary of statistics, empty if the asset has not been seen.
+            Missing values are None; ``ewma_vol`` is per-update log-return
+            volatility and ``vwap`` maps window seconds to VWAP.
+        """
+        now = now if now is not None else time.time()
+        with self.lock:
+            slot = self.slots.get(asset_id)
+            if slot is None:
+                return {}
+            return self._snapshot(slot, now)
+
+    def get_all_stats(self, now: Optional[float] = None) -> Dict[str, Dict]:
+        """Get statistics for every tracked asset."""
+        now = now if now is not None else time.time()
+        with self.lock:
+            return {aid: self._snapshot(slot, now) for aid, slot in self.slots.items()}
+
+    def reset(self, asset_id: Optional[str] = None):
+        """
+        Clear statistics for one asset, or for all assets.
+
+        Args:
+            asset_id: CLOB token ID, or None for everything
+        """
+        with self.lock:
+            if asset_id is None:
+                self._init_storage()
+                return
+            slot = self.slots.get(asset_id)
+            if slot is None:
+                return
+            for name, initial in _COLUMNS.items():
+                self._values[name][slot] = initial
+            for name in _COUNTS:
+                self._counts[name][slot] = 0
+            for w in self.vwap_windows:
+                self._trades[w][slot].clear()
+                self._notional[w][slot] = 0.0
+                self._size[w][slot] = 0.0
+
+    def _add_slot(self, asset_id: str) -> int:
+        """Allocate a slot for a new asset."""
+        slot = len(self.slots)
+        self.slots[asset_id] = slot
+        for name, initial in _COLUMNS.items():
+            self._values[name].append(initial)
+        for name in _COUNTS:
+            self._counts[name].append(0)
+        for w in self.vwap_windows:
+            self._trades[w].append(deque())
+            self._notional[w].append(0.0)
+            self._size[w].append(0.0)
+        return slot
+
+    def _add_trade(self, slot: int, ts: float, price: float, size: float):
+        """Push a trade into every VWAP window and evict expired ones."""
+        for w in self.vwap_windows:
+            self._trades[w][slot].append((ts, price * size, size))
+            self._notional[w][slot] += price * size
+            self._size[w][slot] += size
+            self._evict(w, slot, ts)
+
+    def _evict(self, window: int, slot: int, now: float):
+        """Drop trades older than the window from its running sums."""
+        trades = self._trades[window][slot]
+        cutoff = now - window
+        while trades and trades[0][0] < cutoff:
+            _, notional, size = trades.popleft()
+            self._notional[window][slot] -= notional
+            self._size[window][slot] -= size
+        if not trades:
+            # Reset to kill accumulated float drift
+            self._notional[window][slot] = 0.0
+            self._size[window][slot] = 0.0
+
+    def _snapshot(self, slot: int, now: float) -> Dict:
+        """Build the stats dictionary for a slot (lock held)."""
+        stats = {}
+        for name in _COLUMNS:
+            if name == "ewma_var":
+                continue
+            value = self._values[name][slot]
+            stats[name] = None if math.isnan(value) else value
+        stats["ewma_vol"] = math.sqrt(self._values["ewma_var"][slot])
+        for name in _COUNTS:
+            stats[name] = self._counts[name][slot]
+
+        vwap = {}
+        for w in self.vwap_windows:
+            self._evict(w, slot, now)
+            size = self._size[w][slot]
+            vwap[w] = self._notional[w][slot] / size if size > 0 else None
+        stats["vwap"] = vwap
+        return stats
+
@@ -0,0 +1,129 @@
+"""
+Placeholder-market filtering with precompiled patterns and memoized verdicts.
+"""
+import re
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from utils import get_event
+
+
+_PLACEHOLDER_NOUNS = "individual|leader|person|candidate|option|choice|team|player|company"
+
+# Any hit in the (lowercased) question marks the market as a placeholder:
+# generic "<noun> <letter/number>" names plus test/placeholder keywords
+QUESTION_PLACEHOLDER_RE = re.compile(
+    r"\b(?:individual|person|option|choice|team|player|company)\s+[a-z0-9]\b"
+    r"|\bleader\s+\d+\b"
+    r"|\bcandidate\s+[a-z]\b"
+    r"|test market|placeholder|example|dummy|sample"
+)
+
+# An outcome matching this in full is a placeholder ("Option A", "Team 3",
+# a single letter, a bare number)
+OUTCOME_PLACEHOLDER_RE = re.compile(
+    rf"(?:{_PLACEHOLDER_NOUNS})\s*(?:[a-z0-9]|\d+)"
+    r"|[a-z]"
+    r"|\d+"
+)
+
+# Short generic outcomes that are always meaningful
+GENERIC_OUTCOMES = frozenset(["yes", "no", "up", "down", "true", "false"])
+
+_MEMO_SIZE = 100_000
+_memo: Dict[tuple, bool] = {}
+_memo_lock = threading.Lock()
+
+
+def is_real_market(market) -> bool:
+    """
+    Check if a market has real, meaningful outcomes (not placeholders).
+
+    Verdicts are memoized per market id and question.
+
+    Args:
+        market: Parsed Market (or a dict with question/outcomes/id keys)
+
+    Returns:
+        True if the market is worth showing
+    """
+    outcomes = market.get("outcomes", [])
+    if not outcomes:
+        return False
+
+    question = market.get("question", "") or ""
+    market_id = market.get("id", "")
+    key = (market_id, question) if market_id else (question, tuple(outcomes))
+
+    verdict = _memo.get(key)
+    if verdict is None:
+        verdict = _classify(question.lower(), outcomes)
+        with _memo_lock:
+            if len(_memo) >= _MEMO_SIZE:
+                _memo.clear()
+            _memo[key] = verdict
+    return verdict
+
+
+def _classify(question: str, outcomes: Iterable) -> bool:
+    """Uncached verdict for a lowercased question and its outcomes."""
+    if QUESTION_PLACEHOLDER_RE.search(question):
+        return False
+
+    # Need at least 1 real outcome
+    for outcome in outcomes:
+        outcome_str = str(outcome).strip().lower()
+        if outcome_str in GENERIC_OUTCOMES:
+            return True
+        if len(outcome_str) > 1 and not OUTCOME_PLACEHOLDER_RE.fullmatch(outcome_str):
+            return True
+    return False
+
+
+def has_real_market(event) -> bool:
+    """
+    Check whether an event has at least one real market.
+
+    Args:
+        event: Event dictionary from Gamma API (or a parsed Event)
+    """
+    return any(is_real_market(m) for m in get_event(event).markets)
+
+
+def filter_real_events(events: Iterable, limit: Optional[int] = None) -> List:
+    """
+    Keep the events that have at least one real market, in order.
+
+    Args:
+        events: Event dictionaries (or parsed Events)
+        limit: Stop after this many matches
+
+    Returns:
+        The matching events, as passed in
+    """
+    real = []
+    for event in events:
+        if has_real_market(event):
+            real.append(event)
+            if limit is not None and len(real) >= limit:
+                break
+    return real
+
+
+def get_real_markets(event) -> List:
+    """
+    The real markets of an event.
+
+    Args:
+        event: Event dictionary from Gamma API (or a parsed Event)
+
+    Returns:
+        List of parsed Markets
+    """
+    return [m for m in get_event(event).markets if is_real_market(m)]
+
+
+def clear_cache():
+    """Forget all memoized verdicts."""
+    with _memo_lock:
+        _memo.clear()
@@ -0,0 +1,486 @@
+"""
+Low-overhead metric primitives, a process-wide registry and a Prometheus
+text endpoint.
+"""
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Seconds; suits network latency and gap durations
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+# Seconds; suits in-process handler and lock wait times
+FAST_BUCKETS = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 5e-2, 0.1,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``observe`` is one bisect and three adds."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        """
+        Args:
+            buckets: Sorted upper bounds; an implicit +Inf bucket is added
+        """
+        self.buckets = tuple(buckets)
+        self.counts = array("Q", [0] * (len(self.buckets) + 1))
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Record one observation."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by linear interpolation inside its bucket.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, or None if nothing was observed
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else lower
+                return lower + (upper - lower) * ((rank - seen) / n)
+            seen += n
+        return self.buckets[-1]
+
+    def snapshot(self) -> Dict:
+        """
+        Returns:
+            Dictionary with count, sum, mean, p50, p90, p99 and cumulative
+            bucket counts keyed by upper bound
+        """
+        cumulative = {}
+        running = 0
+        for bound, n in zip(self.buckets + (math.inf,), self.counts):
+            running += n
+            cumulative[bound] = running
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "buckets": cumulative,
+        }
+
+
+class RateWindow:
+    """Running total plus a per-second ring for a recent events/sec rate."""
+
+    __slots__ = ("total", "window", "_ring", "_second")
+
+    def __init__(self, window: int = 60):
+        """
+        Args:
+            window: Seconds covered by ``rate()``
+        """
+        self.total = 0
+        self.window = window
+        self._ring = array("d", [0.0] * window)
+        self._second = 0
+
+    def add(self, amount: float = 1, now: Optional[float] = None):
+        """Add to the total and to the current second's bucket."""
+        second = int(now if now is not None else time.time())
+        self._advance(second)
+        self._ring[second % self.window] += amount
+        self.total += amount
+
+    def rate(self, now: Optional[float] = None) -> float:
+        """Average per second over the last ``window`` seconds."""
+        self._advance(int(now if now is not None else time.time()))
+        return sum(self._ring) / self.window
+
+    def _advance(self, second: int):
+        """Zero the buckets of seconds that passed without events."""
+        if second <= self._second:
+            return
+        stale = min(second - self._second, self.window)
+        for s in range(second - stale + 1, second + 1):
+            self._ring[s % self.window] = 0.0
+        self._second = second
+
+
+def format_labels(labels: Optional[Dict[str, str]]) -> str:
+    """Render a Prometheus label set, e.g. ``{type="book"}``."""
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def format_value(value: float) -> str:
+    """Render a sample value the way Prometheus expects."""
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def format_histogram(name: str, hist: Histogram, labels: Optional[Dict[str, str]] = None) -> List[str]:
+    """
+    Render a histogram as Prometheus sample lines (without HELP/TYPE).
+
+    Args:
+        name: Metric family name
+        hist: Histogram to render
+        labels: Extra labels for every sample
+
+    Returns:
+        List of exposition lines
+    """
+    labels = dict(labels or {})
+    lines = []
+    running = 0
+    for bound, n in zip(hist.buckets + (math.inf,), hist.counts):
+        running += n
+        lines.append(f"{name}_bucket{format_labels({**labels, 'le': format_value(bound)})} {running}")
+    lines.append(f"{name}_sum{format_labels(labels)} {format_value(hist.sum)}")
+    lines.append(f"{name}_count{format_labels(labels)} {hist.count}")
+    return lines
+
+
+def format_family(name: str, kind: str, help_text: str, lines: List[str]) -> List[str]:
+    """Prefix sample lines with HELP and TYPE headers."""
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"] + lines
+
+
+
+def merge_exposition(texts: Sequence[str]) -> str:
+    """
+    Combine exposition texts, keeping one HELP/TYPE header per family.
+
+    Samples are grouped under the family whose TYPE header precedes them,
+    so several sources may render the same family with different labels
+    (e.g. one WebSocket connection each).
+
+    Args:
+        texts: Prometheus exposition texts
+
+    Returns:
+        Merged exposition text ending in a newline (or empty)
+    """
+    headers: Dict[str, List[str]] = {}
+    samples: Dict[str, List[str]] = {}
+    for text in texts:
+        family = ""
+        for line in text.splitlines():
+            if not line:
+                continue
+            if line.startswith("# "):
+                parts = line.split(" ", 3)
+                if len(parts) >= 3 and parts[1] in ("HELP", "TYPE"):
+                    family = parts[2]
+                    samples.setdefault(family, [])
+                    header = headers.setdefault(family, [])
+                    if not any(h.split(" ", 2)[1] == parts[1] for h in header):
+                        header.append(line)
+                continue
+            samples.setdefault(family, []).append(line)
+    lines = []
+    for family, family_samples in samples.items():
+        lines.extend(headers.get(family, []))
+        lines.extend(family_samples)
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+class _Family:
+    """Metric family: a name, help text and one value per label set."""
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        """
+        Args:
+            name: Prometheus metric name
+            help_text: HELP line text
+            labelnames: Label names; values are passed positionally
+        """
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Tuple[str, ...], object] = {}
+        self.lock = threading.Lock()
+
+    def _check(self, labelvalues: Tuple) -> Tuple[str, ...]:
+        """Validate a new label set (only called for unseen keys)."""
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labelvalues}")
+        return tuple(str(v) for v in labelvalues)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def render(self) -> List[str]:
+        """HELP, TYPE and sample lines."""
+        with self.lock:
+            lines = self._samples()
+        return format_family(self.name, self.kind, self.help_text, lines)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{format_labels(self._labels(key))} {format_value(value)}"
+            for key, value in self.values.items()
+        ]
+
+
+class Counter(_Family):
+    """Monotonic counter family, e.g. ``requests.inc("gamma", "200")``."""
+
+    kind = "counter"
+
+    def inc(self, *labelvalues, amount: float = 1):
+        """Add ``amount`` to the counter for a label set."""
+        with self.lock:
+            value = self.values.get(labelvalues)
+            if value is None:
+                self._check(labelvalues)
+                value = 0
+            self.values[labelvalues] = value + amount
+
+    def get(self, *labelvalues) -> float:
+        """Current value for a label set (0 if never incremented)."""
+        with self.lock:
+            return self.values.get(labelvalues, 0)
+
+
+class Gauge(_Family):
+    """Family of values that go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, *labelvalues):
+        """Set the gauge for a label set."""
+        with self.lock:
+            if labelvalues not in self.values:
+                self._check(labelvalues)
+            self.values[labelvalues] = value
+
+    def inc(self, *labelvalues, amount: float = 1):
+        """Add ``amount`` (negative to decrease)."""
+        with self.lock:
+            value = self.values.get(labelvalues)
+            if value is None:
+                self._check(labelvalues)
+                value = 0
+            self.values[labelvalues] = value + amount
+
+    def get(self, *labelvalues) -> float:
+        """Current value for a label set (0 if never set)."""
+        with self.lock:
+            return self.values.get(labelvalues, 0)
+
+
+class _Timer:
+    """Context manager observing elapsed seconds into a HistogramFamily."""
+
+    __slots__ = ("family", "labelvalues", "start")
+
+    def __init__(self, family: "HistogramFamily", labelvalues: Tuple):
+        self.family = family
+        self.labelvalues = labelvalues
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.family.observe(time.perf_counter() - self.start, *self.labelvalues)
+        return False
+
+
+class HistogramFamily(_Family):
+    """One fixed-bucket Histogram per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        """
+        Args:
+            name: Prometheus metric name
+            help_text: HELP line text
+            labelnames: Label names; values are passed positionally
+            buckets: Histogram upper bounds
+        """
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labelvalues):
+        """Record one observation for a label set."""
+        with self.lock:
+            hist = self.values.get(labelvalues)
+            if hist is None:
+                self._check(labelvalues)
+                hist = self.values[labelvalues] = Histogram(self.buckets)
+            hist.observe(value)
+
+    def time(self, *labelvalues) -> _Timer:
+        """Context manager that observes the time spent inside it."""
+        return _Timer(self, labelvalues)
+
+    def snapshot(self, *labelvalues) -> Optional[Dict]:
+        """Histogram.snapshot() for a label set, or None if never observed."""
+        with self.lock:
+            hist = self.values.get(labelvalues)
+            return hist.snapshot() if hist is not None else None
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, hist in self.values.items():
+            lines.extend(format_histogram(self.name, hist, self._labels(key)))
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Named metric families plus collectors rendered into one exposition.
+
+    ``counter``, ``gauge`` and ``histogram`` return the existing family
+    when called again with the same name, so module-level definitions are
+    safe under re-import and Streamlit reruns. Collectors are callables
+    returning exposition text, for objects that keep their own counts
+    (FeedMetrics, cache statistics); they run only when scraped.
+    """
+
+    def __init__(self):
+        self.families: Dict[str, _Family] = {}
+        self.collectors: Dict[str, Callable[[], str]] = {}
+        self.lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a Counter family."""
+        return self._family(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Get or create a Gauge family."""
+        return self._family(Gauge, name, help_text, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> HistogramFamily:
+        """Get or create a HistogramFamily."""
+        return self._family(HistogramFamily, name, help_text, labelnames, buckets=buckets)
+
+    def register_collector(self, key: str, collector: Callable[[], str]):
+        """
+        Add (or replace) a collector.
+
+        Args:
+            key: Identifies the collector; registering the same key again
+                replaces the previous one
+            collector: Zero-argument callable returning exposition text
+        """
+        with self.lock:
+            self.collectors[key] = collector
+
+    def unregister_collector(self, key: str):
+        """Remove a collector if present."""
+        with self.lock:
+            self.collectors.pop(key, None)
+
+    def render_prometheus(self) -> str:
+        """
+        Render every family and collector in the Prometheus text format.
+
+        Returns:
+            Exposition text ending in a newline
+        """
+        with self.lock:
+            families = list(self.families.values())
+            collectors = list(self.collectors.items())
+        texts = ["\n".join(family.render()) for family in families]
+        for key, collector in collectors:
+            try:
+                texts.append(collector())
+            except Exception as e:
+                print(f"Error collecting metrics from {key}: {e}")
+        return merge_exposition(texts)
+
+    def _family(self, cls, name: str, help_text: str, labelnames: Sequence[str], **kwargs):
+        with self.lock:
+            family = self.families.get(name)
+            if family is None:
+                family = self.families[name] = cls(name, help_text, labelnames, **kwargs)
+            elif type(family) is not cls or family.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered as a different {family.kind}")
+            return family
+
+
+# Process-wide registry served by start_http_server
+REGISTRY = MetricsRegistry()
+
+
+def start_http_server(port: int, host: str = "127.0.0.1", registry: Optional[MetricsRegistry] = None):
+    """
+    Serve ``registry`` in the Prometheus text format on a daemon thread.
+
+    Every path answers with the exposition, so ``/metrics`` works as a
+    scrape target. Rendering happens per scrape; nothing runs between.
+
+    Args:
+        port: TCP port (0 picks a free one; see ``server.server_address``)
+        host: Interface to bind
+        registry: Registry to serve (the process-wide REGISTRY by default)
+
+    Returns:
+        The running ThreadingHTTPServer (call ``shutdown()`` to stop it)
+    """
+    # Imported here: http.server is only needed by processes that export
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    registry = registry if registry is not None else REGISTRY
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = registry.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,137 @@
+"""
+Speculative background prefetch of price histories for likely next pages.
+"""
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List
+
+from metrics import RateWindow
+
+
+class Prefetcher:
+    """
+    Warms CachedDataService price histories on a small thread pool.
+
+    Each caller key (one per browser session) has a generation: a new
+    ``prefetch`` call for the same key cancels that key's queued work, and
+    tasks that were already dequeued check their generation before calling
+    upstream. Upstream calls across all keys are capped at ``budget`` per
+    ``window`` seconds; work over budget is dropped, not delayed.
+
+    ``cancel`` forgets a key; keys that stop calling ``prefetch`` (closed
+    tabs) are forgotten after ``session_ttl`` seconds.
+    """
+
+    def __init__(self, data, max_workers: int = 4, budget: int = 60, window: int = 60,
+                 session_ttl: float = 600.0):
+        """
+        Args:
+            data: CachedDataService to warm
+            max_workers: Prefetch threads
+            budget: Maximum upstream calls per window
+            window: Budget window in seconds
+            session_ttl: Seconds without a ``prefetch`` call before a key is forgotten
+        """
+        self.data = data
+        self.budget = budget
+        self.session_ttl = session_ttl
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self.calls = RateWindow(window)
+        # Generations come from one counter, so a forgotten key that
+        # returns can never reuse the generation of a stale task
+        self.counter = itertools.count(1)
+        self.generations: Dict[str, int] = {}
+        self.pending: Dict[str, List[Future]] = {}
+        self.last_seen: Dict[str, float] = {}
+        self.stats = {"submitted": 0, "fetched": 0, "cached": 0, "cancelled": 0, "over_budget": 0, "errors": 0}
+        self.lock = threading.Lock()
+
+    def prefetch(self, key: str, token_ids: Iterable[str], interval: str = "1d") -> int:
+        """
+        Replace ``key``'s prefetch work with histories for ``token_ids``.
+
+        Args:
+            key: Caller identifier (e.g. a session key)
+            token_ids: CLOB token IDs, most likely first
+            interval: History interval to warm
+
+        Returns:
+            Number of fetches queued
+        """
+        now = time.monotonic()
+        with self.lock:
+            self._expire(now)
+            generation = next(self.counter)
+            self.generations[key] = generation
+            self.last_seen[key] = now
+            self._cancel(key)
+            futures = []
+            for token_id in dict.fromkeys(t for t in token_ids if t):
+                if self.data.has_price_history(token_id, interval):
+                    continue
+                futures.append(self.executor.submit(self._fetch, key, generation, token_id, interval))
+            self.pending[key] = futures
+            self.stats["submitted"] += len(futures)
+            return len(futures)
+
+    def cancel(self, key: str):
+        """Drop ``key``'s queued work and forget the key."""
+        with self.lock:
+            self._forget(key)
+
+    def shutdown(self):
+        """Cancel everything and stop the threads."""
+        with self.lock:
+            for key in list(self.pending):
+                self._cancel(key)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Counters plus upstream calls in the current budget window."""
+        with self.lock:
+            stats = dict(self.stats)
+            stats["window_calls"] = self.calls.rate() * self.calls.window
+        return stats
+
+    def _expire(self, now: float):
+        """Forget keys not seen within session_ttl (lock held)."""
+        for key, seen in list(self.last_seen.items()):
+            if now - seen > self.session_ttl:
+                self._forget(key)
+
+    def _forget(self, key: str):
+        """Cancel a key's work and drop its entries (lock held)."""
+        self._cancel(key)
+        self.generations.pop(key, None)
+        self.last_seen.pop(key, None)
+
+    def _cancel(self, key: str):
+        """Cancel queued futures for a key (lock held)."""
+        for future in self.pending.pop(key, ()):
+            if future.cancel():
+                self.stats["cancelled"] += 1
+
+    def _fetch(self, key: str, generation: int, token_id: str, interval: str):
+        """Worker: fetch one history unless stale, cached or over budget."""
+        with self.lock:
+            if self.generations.get(key) != generation:
+                self.stats["cancelled"] += 1
+                return
+            if self.data.has_price_history(token_id, interval):
+                self.stats["cached"] += 1
+                return
+            if self.calls.rate() * self.calls.window >= self.budget:
+                self.stats["over_budget"] += 1
+                return
+            self.calls.add()
+        try:
+            self.data.price_history(token_id, interval)
+        except Exception as e:
+            print(f"Error prefetching history for {token_id}: {e}")
+            with self.lock:
+                self.stats["errors"] += 1
+            return
+        with self.lock:
+            self.stats["fetched"] += 1
@@ -0,0 +1,577 @@
+"""
+Standalone live-price feeder publishing into a shared-memory table.
+
+One feeder process owns the WebSocket connections; any number of app
+worker processes attach to the table read-only:
+
+    python price_feeder.py --top-events 100
+
+    reader = SharedPriceReader()           # in each worker
+    reader.get_live_prices(token_id)
+
+Table layout (little-endian):
+
+    header := magic:4s version:u32 capacity:u32 count:u32 record_size:u32
+              pid:u32 heartbeat:f64 generation:u64 epoch:u32
+              (padded to 64 bytes)
+    record := seq:u64 best_bid:f64 best_ask:f64 last_trade_price:f64
+              updated:f64 asset_len:u8 asset:87s (128 bytes)
+
+Each record is guarded by a seqlock: the writer makes ``seq`` odd while
+updating, and readers retry until they see the same even value on both
+sides of their read.
+
+``count`` is the number of slots ever allocated. Slots of assets the
+feeder stops carrying are freed (asset_len 0) and reused; freeing and
+reusing bump ``epoch`` so readers rebuild their asset -> slot index.
+A restarted feeder creates a new block with a new ``generation``;
+readers of the old block notice its heartbeat stop and re-attach. A
+feeder started while the table's owner is still alive refuses to
+replace it.
+"""
+import argparse
+import math
+import os
+import signal
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Optional
+
+from metrics import REGISTRY, start_http_server
+from utils import get_all_token_ids
+from ws_client import extract_price_update
+
+
+DEFAULT_TABLE_NAME = os.environ.get("POLYMARKET_PRICE_TABLE", "polymarket_prices")
+MAGIC = b"PMPX"
+VERSION = 2
+
+_HEADER = struct.Struct("<4sIIIIIdQI")
+HEADER_SIZE = 64
+_COUNT_OFFSET = 12
+_HEARTBEAT_OFFSET = 24
+_GENERATION_OFFSET = 32
+_EPOCH_OFFSET = 40
+
+_RECORD = struct.Struct("<QddddB87s")
+RECORD_SIZE = 128
+_SEQ = struct.Struct("<Q")
+_VALUES = struct.Struct("<dddd")
+_VALUES_OFFSET = 8
+_ASSET_LEN_OFFSET = 40
+MAX_ASSET_LEN = 87
+
+# Seqlock retries before a read gives up (the writer died mid-update)
+_READ_RETRIES = 1000
+# Seconds between re-attach attempts while the feeder looks dead
+_REATTACH_INTERVAL = 5.0
+
+_FIELDS = ("best_bid", "best_ask", "last_trade_price")
+
+# Tables created by this process; attaching to them must not touch tracking
+_owned_tables = set()
+
+
+class SharedPriceTable:
+    """Writer side of the shared-memory price table (feeder process only)."""
+
+    def __init__(self, name: str = DEFAULT_TABLE_NAME, capacity: int = 20_000, stale_after: float = 10.0):
+        """
+        Create the table, replacing a stale one left by a crashed feeder.
+
+        An existing table is only replaced if its feeder process is gone or
+        its heartbeat is older than ``stale_after``; a running feeder's
+        table is left alone.
+
+        Args:
+            name: Shared memory block name
+            capacity: Maximum number of asset slots
+            stale_after: Heartbeat age (seconds) past which an existing table is stale
+
+        Raises:
+            FileExistsError: If a live feeder already owns the table
+            ValueError: If a block of that name exists but is not a price table
+        """
+        size = HEADER_SIZE + capacity * RECORD_SIZE
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            existing = _attach(name)
+            try:
+                magic, _, _, _, _, pid, heartbeat = struct.unpack_from("<4sIIIIId", existing.buf, 0)
+            finally:
+                existing.close()
+            if magic != MAGIC:
+                raise ValueError(f"Shared memory block {name} exists and is not a price table")
+            if pid != os.getpid() and _pid_alive(pid) and time.time() - heartbeat <= stale_after:
+                raise FileExistsError(f"Price table {name} is in use by a running feeder (pid {pid})")
+            print(f"Replacing stale price table {name} (pid {pid})")
+            _unlink(name)
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        _owned_tables.add(name)
+        self.name = name
+        self.capacity = capacity
+        self.buf = self.shm.buf
+        self.slots: Dict[str, int] = {}
+        self.free: List[int] = []
+        self.epoch = 0
+        self.lock = threading.Lock()
+        _HEADER.pack_into(self.buf, 0, MAGIC, VERSION, capacity, 0, RECORD_SIZE, os.getpid(), time.time(),
+                          time.time_ns(), 0)
+
+    def slot_for(self, asset_id: str) -> Optional[int]:
+        """
+        Get or allocate the slot for an asset.
+
+        Args:
+            asset_id: CLOB token ID
+
+        Returns:
+            Slot index, or None if the table is full or the id too long
+        """
+        slot = self.slots.get(asset_id)
+        if slot is not None:
+            return slot
+        encoded = asset_id.encode()
+        if len(encoded) > MAX_ASSET_LEN:
+            print(f"Asset id too long for price table: {asset_id}")
+            return None
+        with self.lock:
+            slot = self.slots.get(asset_id)
+            if slot is not None:
+                return slot
+            reused = bool(self.free)
+            if reused:
+                slot = self.free.pop()
+            else:
+                slot, = struct.unpack_from("<I", self.buf, _COUNT_OFFSET)
+                if slot >= self.capacity:
+                    print(f"Price table full ({self.capacity} slots), dropping {asset_id}")
+                    return None
+            offset = HEADER_SIZE + slot * RECORD_SIZE
+            seq, = _SEQ.unpack_from(self.buf, offset)
+            _SEQ.pack_into(self.buf, offset, seq + 1)
+            nan = math.nan
+            _RECORD.pack_into(self.buf, offset, seq + 1, nan, nan, nan, 0.0, len(encoded), encoded)
+            _SEQ.pack_into(self.buf, offset, seq + 2)
+            self.slots[asset_id] = slot
+            # Publish only after the asset id is in place: readers that see
+            # the new epoch (reused slot) or count (new slot) rescan and
+            # find it
+            if reused:
+                self.epoch += 1
+                struct.pack_into("<I", self.buf, _EPOCH_OFFSET, self.epoch)
+            else:
+                struct.pack_into("<I", self.buf, _COUNT_OFFSET, slot + 1)
+        return slot
+
+    def retain(self, asset_ids: Iterable[str]) -> int:
+        """
+        Free the slots of every asset not in ``asset_ids``.
+
+        Args:
+            asset_ids: Assets still carried
+
+        Returns:
+            Number of slots freed
+        """
+        keep = set(asset_ids)
+        with self.lock:
+            dropped = [aid for aid in self.slots if aid not in keep]
+            if not dropped:
+                return 0
+            for aid in dropped:
+                slot = self.slots.pop(aid)
+                offset = HEADER_SIZE + slot * RECORD_SIZE
+                seq, = _SEQ.unpack_from(self.buf, offset)
+                _SEQ.pack_into(self.buf, offset, seq + 1)
+                self.buf[offset + _ASSET_LEN_OFFSET] = 0
+                _SEQ.pack_into(self.buf, offset, seq + 2)
+                self.free.append(slot)
+            # Readers must drop cached slots before any of them is reused
+            self.epoch += 1
+            struct.pack_into("<I", self.buf, _EPOCH_OFFSET, self.epoch)
+        return len(dropped)
+
+    def update(self, asset_id: str, fields: Dict[str, float], ts: float):
+        """
+        Merge price fields into an asset's record.
+
+        Args:
+            asset_id: CLOB token ID
+            fields: Any of best_bid, best_ask, last_trade_price
+            ts: Update timestamp
+        """
+        slot = self.slot_for(asset_id)
+        if slot is None:
+            return
+        offset = HEADER_SIZE + slot * RECORD_SIZE
+        with self.lock:
+            if self.slots.get(asset_id) != slot:
+                # Freed by retain() meanwhile
+                return
+            seq, = _SEQ.unpack_from(self.buf, offset)
+            bid, ask, last, _ = _VALUES.unpack_from(self.buf, offset + _VALUES_OFFSET)
+            _SEQ.pack_into(self.buf, offset, seq + 1)
+            _VALUES.pack_into(
+                self.buf, offset + _VALUES_OFFSET,
+                fields.get("best_bid", bid),
+                fields.get("best_ask", ask),
+                fields.get("last_trade_price", last),
+                ts,
+            )
+            _SEQ.pack_into(self.buf, offset, seq + 2)
+
+    def heartbeat(self):
+        """Stamp the header so readers can tell the feeder is alive."""
+        struct.pack_into("<d", self.buf, _HEARTBEAT_OFFSET, time.time())
+
+    def __call__(self, event: Dict, recv_ts: float):
+        """WSClient listener entry point."""
+        _, asset_id, fields = extract_price_update(event)
+        if asset_id and fields:
+            self.update(asset_id, fields, recv_ts)
+
+    def close(self, unlink: bool = True):
+        """
+        Release the table.
+
+        Args:
+            unlink: Also remove the shared memory block
+        """
+        self.buf = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+            _owned_tables.discard(self.name)
+
+
+class SharedPriceReader:
+    """
+    Read-only view of the feeder's price table for app workers.
+
+    Reads unpack straight out of the mapped buffer; nothing is copied
+    beyond the returned floats. Mirrors WSClient's read API so either can
+    back the UI. While the feeder's heartbeat is stale the reader checks,
+    at most every few seconds, whether a restarted feeder has replaced
+    the table and re-attaches if so.
+    """
+
+    def __init__(self, name: str = DEFAULT_TABLE_NAME):
+        """
+        Args:
+            name: Shared memory block name
+
+        Raises:
+            FileNotFoundError: If no feeder has created the table
+            ValueError: If the block is not a price table
+        """
+        self.name = name
+        self.lock = threading.Lock()
+        # Mappings of replaced tables; other threads may still be reading them
+        self.retired: List[tuple] = []
+        self.shm, self.buf, self.capacity, self.generation = _open_table(name)
+        self.slots: Dict[str, int] = {}
+        self.epoch = 0
+        # Slots [0, scanned) are in the index
+        self.scanned = 0
+        self.next_reattach = 0.0
+
+    def feeder_age(self) -> float:
+        """Seconds since the feeder's last heartbeat."""
+        heartbeat, = struct.unpack_from("<d", self.buf, _HEARTBEAT_OFFSET)
+        return time.time() - heartbeat
+
+    def is_alive(self, max_age: float = 10.0) -> bool:
+        """Whether the feeder has written a heartbeat recently."""
+        if self.feeder_age() <= max_age:
+            return True
+        return self._reattach() and self.feeder_age() <= max_age
+
+    def version(self) -> tuple:
+        """Cheap token that changes whenever the set of published assets may have."""
+        count, = struct.unpack_from("<I", self.buf, _COUNT_OFFSET)
+        return self.generation, self._epoch(), count
+
+    def get_live_prices(self, asset_id: str) -> Dict:
+        """
+        Get current live prices for an asset.
+
+        Args:
+            asset_id: CLOB token ID
+
+        Returns:
+            Dictionary with best_bid, best_ask, last_trade_price (if available)
+        """
+        if self._epoch() != self.epoch:
+            self._refresh_index()
+        slot = self.slots.get(asset_id)
+        if slot is None:
+            self._refresh_index()
+            slot = self.slots.get(asset_id)
+            if slot is None:
+                return {}
+        prices = self._read(slot)
+        if self._epoch() != self.epoch:
+            # The slot may have been reassigned mid-read
+            self._refresh_index()
+            slot = self.slots.get(asset_id)
+            prices = self._read(slot) if slot is not None else {}
+        return prices
+
+    def get_all_live_prices(self) -> Dict[str, Dict]:
+        """Get all live prices."""
+        self._refresh_index()
+        return {aid: self._read(slot) for aid, slot in self.slots.items()}
+
+    def asset_ids(self) -> List[str]:
+        """Assets the feeder has published so far."""
+        self._refresh_index()
+        return list(self.slots)
+
+    def close(self):
+        """Detach from the table (never unlinks; the feeder owns it)."""
+        with self.lock:
+            for shm, buf in self.retired + [(self.shm, self.buf)]:
+                buf.release()
+                shm.close()
+            self.retired = []
+
+    def _reattach(self) -> bool:
+        """
+        Switch to the table a restarted feeder created under the same name.
+
+        Returns:
+            True if the reader now maps a different table
+        """
+        now = time.monotonic()
+        if now < self.next_reattach:
+            return False
+        self.next_reattach = now + _REATTACH_INTERVAL
+        try:
+            shm, buf, capacity, generation = _open_table(self.name)
+        except (FileNotFoundError, ValueError):
+            return False
+        if generation == self.generation:
+            buf.release()
+            shm.close()
+            return False
+        with self.lock:
+            self.retired.append((self.shm, self.buf))
+            self.shm, self.buf, self.capacity, self.generation = shm, buf, capacity, generation
+            self.slots = {}
+            self.epoch = self.scanned = 0
+        return True
+
+    def _epoch(self) -> int:
+        epoch, = struct.unpack_from("<I", self.buf, _EPOCH_OFFSET)
+        return epoch
+
+    def _refresh_index(self):
+        """Pick up slots the feeder allocated (or freed and reused) since the last scan."""
+        buf = self.buf
+        epoch = self._epoch()
+        count, = struct.unpack_from("<I", buf, _COUNT_OFFSET)
+        end = min(count, self.capacity)
+        if epoch != self.epoch:
+            slots, start = {}, 0
+        elif end > self.scanned:
+            # Copy, so other threads can keep iterating the current index
+            slots, start = dict(self.slots), self.scanned
+        else:
+            return
+        for slot in range(start, end):
+            asset_id = self._read_asset(buf, slot)
+            if asset_id:
+                slots[asset_id] = slot
+        self.slots, self.epoch, self.scanned = slots, epoch, end
+
+    def _read_asset(self, buf, slot: int) -> Optional[str]:
+        """Asset id in a slot ('' if free), read under its seqlock; None if it stays mid-update."""
+        offset = HEADER_SIZE + slot * RECORD_SIZE
+        begin = offset + _ASSET_LEN_OFFSET + 1
+        for _ in range(_READ_RETRIES):
+            before, = _SEQ.unpack_from(buf, offset)
+            if before & 1:
+                continue
+            size = buf[offset + _ASSET_LEN_OFFSET]
+            encoded = bytes(buf[begin:begin + size])
+            after, = _SEQ.unpack_from(buf, offset)
+            if before == after:
+                return encoded.decode()
+        return None
+
+    def _read(self, slot: int) -> Dict:
+        """
+        Consistent read of one record via its seqlock.
+
+        Gives up (no prices) if the record stays mid-update, as it does
+        when the feeder died between the two ``seq`` writes.
+        """
+        buf = self.buf
+        offset = HEADER_SIZE + slot * RECORD_SIZE
+        for _ in range(_READ_RETRIES):
+            before, = _SEQ.unpack_from(buf, offset)
+            if before & 1:
+                continue
+            values = _VALUES.unpack_from(buf, offset + _VALUES_OFFSET)
+            after, = _SEQ.unpack_from(buf, offset)
+            if before == after:
+                break
+        else:
+            return {}
+        prices = {name: value for name, value in zip(_FIELDS, values) if not math.isnan(value)}
+        if values[3]:
+            prices["updated"] = values[3]
+        return prices
+
+
+def _open_table(name: str) -> tuple:
+    """
+    Attach to a price table read-only.
+
+    Returns:
+        (shared memory, read-only buffer, capacity, generation)
+
+    Raises:
+        FileNotFoundError: If no feeder has created the table
+        ValueError: If the block is not a price table
+    """
+    shm = _attach(name)
+    buf = shm.buf.toreadonly()
+    magic, version, capacity, _, record_size, _, _, generation, _ = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+        buf.release()
+        shm.close()
+        raise ValueError(f"Shared memory block {name} is not a v{VERSION} price table")
+    return shm, buf, capacity, generation
+
+
+def _pid_alive(pid: int) -> bool:
+    """Whether a process with this pid exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _unlink(name: str):
+    """Remove a shared memory block by name."""
+    block = shared_memory.SharedMemory(name=name)
+    block.close()
+    block.unlink()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block without letting this process unlink it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 registers attachments with the resource tracker,
+        # which would destroy the feeder's block when this worker exits
+        from multiprocessing import resource_tracker
+        shm = shared_memory.SharedMemory(name=name)
+        if name not in _owned_tables:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class PriceFeeder:
+    """Keeps the WebSocket subscriptions in sync and publishes into the table."""
+
+    def __init__(
+        self,
+        table: SharedPriceTable,
+        top_events: int = 100,
+        extra_assets: Optional[List[str]] = None,
+        refresh_interval: float = 300.0,
+        max_assets_per_connection: int = 500,
+    ):
+        """
+        Args:
+            table: Table to publish into
+            top_events: Subscribe every token of this many popular events
+            extra_assets: Token IDs to always subscribe
+            refresh_interval: Seconds between catalog refreshes
+            max_assets_per_connection: Per-socket subscription cap
+        """
+        from gamma_client import GammaClient
+        from ws_manager import WSConnectionManager
+
+        self.table = table
+        self.top_events = top_events
+        self.extra_assets = list(extra_assets or [])
+        self.refresh_interval = refresh_interval
+        self.gamma = GammaClient()
+        self.manager = WSConnectionManager(max_assets_per_connection)
+        self.manager.add_listener(table)
+        self.stop_event = threading.Event()
+
+    def desired_assets(self) -> List[str]:
+        """Token IDs that should currently be subscribed."""
+        assets = list(self.extra_assets)
+        if self.top_events:
+            for event in self.gamma.get_popular_events(self.top_events):
+                assets.extend(get_all_token_ids(event))
+        return list(dict.fromkeys(assets))
+
+    def run(self):
+        """Refresh subscriptions and heartbeat until stopped."""
+        next_refresh = 0.0
+        try:
+            while not self.stop_event.is_set():
+                if time.time() >= next_refresh:
+                    assets = self.desired_assets()
+                    if assets:
+                        self.manager.set_assets(assets)
+                        freed = self.table.retain(assets)
+                        if freed:
+                            print(f"Freed {freed} price table slots")
+                        print(f"Feeding {len(assets)} assets over {len(self.manager.shards)} connections")
+                    next_refresh = time.time() + self.refresh_interval
+                self.table.heartbeat()
+                self.stop_event.wait(1.0)
+        finally:
+            self.manager.disconnect()
+
+    def stop(self, *_):
+        """Ask run() to return (usable as a signal handler)."""
+        self.stop_event.set()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Publish Polymarket live prices into shared memory.")
+    parser.add_argument("--name", default=DEFAULT_TABLE_NAME, help="shared memory block name")
+    parser.add_argument("--capacity", type=int, default=20_000, help="maximum number of assets")
+    parser.add_argument("--top-events", type=int, default=100, help="subscribe tokens of this many popular events")
+    parser.add_argument("--asset", action="append", default=[], help="extra token id to subscribe (repeatable)")
+    parser.add_argument("--refresh", type=float, default=300.0, help="seconds between catalog refreshes")
+    parser.add_argument("--per-connection", type=int, default=500, help="assets per WebSocket connection")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this port")
+    args = parser.parse_args(argv)
+
+    try:
+        table = SharedPriceTable(args.name, args.capacity)
+    except (FileExistsError, ValueError) as e:
+        parser.exit(1, f"{e}\n")
+    feeder = PriceFeeder(table, args.top_events, args.asset, args.refresh, args.per_connection)
+    signal.signal(signal.SIGTERM, feeder.stop)
+    signal.signal(signal.SIGINT, feeder.stop)
+    if args.metrics_port is not None:
+        REGISTRY.register_collector("ws", feeder.manager.render_prometheus)
+        start_http_server(args.metrics_port)
+    print(f"Price table '{args.name}' ready ({args.capacity} slots)")
+    try:
+        feeder.run()
+    finally:
+        table.close()
+
+
+if __name__ == "__main__":
+    main()
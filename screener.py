@@ -0,0 +1,233 @@
+"""
+Columnar market screener: compound filters and multi-key sorts over a MarketTable.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from bulk_parser import MarketTable, parse_events_bulk
+from market_filter import is_real_market
+
+# Column -> display label, for the numeric columns screens filter and sort on
+NUMERIC_COLUMNS = {
+    "yes_price": "Price",
+    "volume_24h": "24h volume",
+    "volume": "Volume",
+    "liquidity": "Liquidity",
+    "spread": "Spread",
+    "price_change_24h": "24h change",
+    "end_ts": "End date",
+}
+TEXT_COLUMNS = {
+    "question": "Question",
+    "event_title": "Event",
+}
+OPS = (">=", "<=", ">", "<", "==", "!=", "between", "contains")
+
+
+class Filter(NamedTuple):
+    """
+    One condition. ``value`` is a number, a (low, high) pair for
+    "between" (inclusive), or a substring for "contains" (text columns,
+    case-insensitive). Rows with a NaN value fail numeric conditions.
+    """
+    column: str
+    op: str
+    value: Any
+
+
+class ScreenResult(NamedTuple):
+    """Matching rows of a screen."""
+    # Row indices into the screener's table, in sort order
+    indices: np.ndarray
+    # Seconds spent filtering and ordering
+    seconds: float
+
+    @property
+    def total(self) -> int:
+        return len(self.indices)
+
+
+class Screener:
+    """
+    Filters and sorts a MarketTable with vectorized NumPy operations.
+
+    Each filter's boolean mask and each sort's full-table permutation are
+    cached (LRU), keyed by the filter or the sort keys. A screen ANDs the
+    masks and keeps the permutation's rows that pass:
+
+        rows = order[mask[order]]
+
+    so changing one widget recomputes at most one mask and never re-sorts
+    unless the sort keys changed. Placeholder markets are excluded up front.
+    """
+
+    def __init__(self, table: MarketTable, real_only: bool = True, cache_size: int = 64):
+        """
+        Args:
+            table: Markets to screen (not modified)
+            real_only: Exclude placeholder markets (see market_filter)
+            cache_size: Masks and permutations kept, each
+        """
+        self.table = table
+        self.cache_size = cache_size
+        if real_only:
+            self.base = np.fromiter(
+                (is_real_market({"id": market_id, "question": question, "outcomes": outcomes})
+                 for market_id, question, outcomes in zip(table["market_id"], table["question"], table["outcomes"])),
+                dtype=bool, count=len(table),
+            )
+        else:
+            self.base = np.ones(len(table), dtype=bool)
+        self.loaded_at = time.time()
+        self._masks: "OrderedDict[Filter, np.ndarray]" = OrderedDict()
+        self._orders: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self._folded: Dict[str, List[str]] = {}
+        self._ranks: Dict[str, np.ndarray] = {}
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return int(self.base.sum())
+
+    @classmethod
+    def from_events(cls, events: Iterable[Dict], **kwargs) -> "Screener":
+        """Screener over raw Gamma events (any iterable, e.g. a stream)."""
+        return cls(parse_events_bulk(events), **kwargs)
+
+    def screen(self, filters: Sequence[Filter] = (), sort: Sequence[Tuple[str, bool]] = ()) -> ScreenResult:
+        """
+        Rows passing every filter, in sort order.
+
+        Args:
+            filters: Conditions, all of which must hold
+            sort: (column, descending) keys, most significant first; ties
+                keep table order and NaNs sort last
+
+        Returns:
+            ScreenResult
+
+        Raises:
+            ValueError: On an unknown column or operator
+        """
+        start = time.perf_counter()
+        mask = self.base
+        for condition in filters:
+            mask = mask & self.mask(condition)
+        order = self.order(sort)
+        indices = order[mask[order]]
+        return ScreenResult(indices, time.perf_counter() - start)
+
+    def rows(self, result: ScreenResult, limit: int = 100, offset: int = 0) -> MarketTable:
+        """One page of a result as a MarketTable."""
+        return self.table.take(result.indices[offset:offset + limit])
+
+    def mask(self, condition: Filter) -> np.ndarray:
+        """Boolean mask of one filter (cached)."""
+        with self.lock:
+            cached = self._masks.get(condition)
+            if cached is not None:
+                self._masks.move_to_end(condition)
+                return cached
+        mask = self._compute_mask(condition)
+        with self.lock:
+            self._masks[condition] = mask
+            while len(self._masks) > self.cache_size:
+                self._masks.popitem(last=False)
+        return mask
+
+    def order(self, sort: Sequence[Tuple[str, bool]]) -> np.ndarray:
+        """Full-table row permutation for sort keys (cached)."""
+        key = tuple((column, bool(descending)) for column, descending in sort)
+        with self.lock:
+            cached = self._orders.get(key)
+            if cached is not None:
+                self._orders.move_to_end(key)
+                return cached
+        if key:
+            # lexsort's primary key is the last one
+            order = np.lexsort([self._sort_key(column, descending) for column, descending in reversed(key)])
+        else:
+            order = np.arange(len(self.table))
+        with self.lock:
+            self._orders[key] = order
+            while len(self._orders) > self.cache_size:
+                self._orders.popitem(last=False)
+        return order
+
+    def _compute_mask(self, condition: Filter) -> np.ndarray:
+        column, op, value = condition
+        if op not in OPS:
+            raise ValueError(f"Unknown filter operator {op!r}")
+        if op == "contains":
+            if column not in TEXT_COLUMNS:
+                raise ValueError(f"Cannot search column {column!r}")
+            needle = str(value).casefold()
+            folded = self._text(column)
+            return np.fromiter((needle in text for text in folded), dtype=bool, count=len(folded))
+        if column not in NUMERIC_COLUMNS:
+            raise ValueError(f"Cannot filter column {column!r}")
+        values = self.table[column]
+        # NaN compares False, so rows missing the value fail the condition
+        with np.errstate(invalid="ignore"):
+            if op == "between":
+                low, high = value
+                return (values >= low) & (values <= high)
+            if op == ">=":
+                return values >= value
+            if op == "<=":
+                return values <= value
+            if op == ">":
+                return values > value
+            if op == "<":
+                return values < value
+            if op == "==":
+                return values == value
+            return (values != value) & ~np.isnan(values)
+
+    def _sort_key(self, column: str, descending: bool) -> np.ndarray:
+        if column in NUMERIC_COLUMNS:
+            values = self.table[column]
+            # Negating keeps NaNs last in both directions
+            return -values if descending else values
+        if column in TEXT_COLUMNS:
+            ranks = self._text_ranks(column)
+            return -ranks if descending else ranks
+        raise ValueError(f"Cannot sort by column {column!r}")
+
+    def _text(self, column: str) -> List[str]:
+        folded = self._folded.get(column)
+        if folded is None:
+            folded = self._folded[column] = [str(text).casefold() for text in self.table[column]]
+        return folded
+
+    def _text_ranks(self, column: str) -> np.ndarray:
+        """Case-insensitive alphabetical rank of each row's text."""
+        ranks = self._ranks.get(column)
+        if ranks is None:
+            # Python's sort beats np.unique on unicode arrays several-fold
+            folded = self._text(column)
+            ranks = np.empty(len(folded), dtype=np.int64)
+            rank, previous = -1, None
+            for row in sorted(range(len(folded)), key=folded.__getitem__):
+                if folded[row] != previous:
+                    rank, previous = rank + 1, folded[row]
+                ranks[row] = rank
+            self._ranks[column] = ranks
+        return ranks
+
+
+def load_screener(gamma, max_events: Optional[int] = None, page_size: int = 500) -> Screener:
+    """
+    Screener over every open event, streamed page by page.
+
+    Args:
+        gamma: GammaClient
+        max_events: Stop after this many events
+        page_size: Events per request
+    """
+    from export_cli import iter_catalog
+
+    return Screener.from_events(iter_catalog(gamma, page_size, max_events))
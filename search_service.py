@@ -0,0 +1,210 @@
+"""
+Incremental search: debounced upstream queries with local prefix refinement.
+"""
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+from data_cache import normalize_query
+from utils import get_event
+
+
+# Shortest prefix whose cached results may be refined locally
+MIN_PREFIX = 2
+
+
+class SearchResult(NamedTuple):
+    """Results for one query."""
+    query: str
+    events: List[Dict]
+    # False while an upstream search for ``query`` is still pending
+    final: bool
+
+
+def matches(event, terms: List[str]) -> bool:
+    """
+    Whether every term appears in an event's title, slug or market questions.
+
+    Args:
+        event: Event dictionary (or a parsed Event)
+        terms: Casefolded query terms
+    """
+    model = get_event(event)
+    text = " ".join([model.title, model.slug] + [m.question for m in model.markets]).casefold()
+    return all(term in text for term in terms)
+
+
+class SearchService:
+    """
+    Search-as-you-type over CachedDataService.search_events.
+
+    ``request`` records a session's latest query and answers immediately
+    from cache: an exact hit, or the results of a cached shorter prefix
+    filtered locally ("trum" -> "trump"). The local filter only sees
+    titles, slugs and questions, while the server may match other fields,
+    so a refined answer is provisional: an upstream search is scheduled
+    after ``debounce`` seconds to confirm it. A newer request from the
+    same session cancels that search, and results arriving for a
+    superseded query only populate the shared cache. ``result``
+    schedules a new upstream search when the cached answer has expired
+    and none is pending, so a results page left open is refreshed rather
+    than stuck waiting. Sessions that stop calling ``request`` and
+    ``result`` (closed tabs) are forgotten after ``session_ttl`` seconds.
+    """
+
+    def __init__(self, data, limit: int = 20, debounce: float = 0.15, session_ttl: float = 600.0):
+        """
+        Args:
+            data: CachedDataService
+            limit: Results requested per upstream search
+            debounce: Seconds a query must stay current before it is sent
+            session_ttl: Seconds without a call before a session is forgotten
+        """
+        self.data = data
+        self.limit = limit
+        self.debounce = debounce
+        self.session_ttl = session_ttl
+        self.latest: Dict[str, str] = {}
+        self.timers: Dict[str, threading.Timer] = {}
+        self.last_seen: Dict[str, float] = {}
+        self.stats = {"requests": 0, "exact_hits": 0, "refined": 0, "upstream": 0, "superseded": 0}
+        self.lock = threading.Lock()
+
+    def request(self, session_key: str, query: str) -> SearchResult:
+        """
+        Make ``query`` the session's current search.
+
+        Args:
+            session_key: Stable per-session identifier
+            query: Raw query text
+
+        Returns:
+            The best answer available without waiting
+        """
+        key = normalize_query(query)
+        now = time.monotonic()
+        with self.lock:
+            self.stats["requests"] += 1
+            expired = self._expire(now)
+            self.latest[session_key] = key
+            self.last_seen[session_key] = now
+            timer = self.timers.pop(session_key, None)
+        for stale in expired + [timer]:
+            if stale is not None:
+                stale.cancel()
+        if not key:
+            return SearchResult(key, [], True)
+
+        result = self.lookup(key)
+        if not result.final:
+            self._schedule(session_key, key)
+        return result
+
+    def result(self, session_key: str) -> SearchResult:
+        """
+        Current answer for the session's latest query (never blocks).
+
+        Schedules an upstream search if the answer is not final (e.g. the
+        cached one expired) and none is pending for the session.
+        """
+        with self.lock:
+            key = self.latest.get(session_key, "")
+            if key:
+                self.last_seen[session_key] = time.monotonic()
+        if not key:
+            return SearchResult(key, [], True)
+        result = self.lookup(key)
+        if not result.final:
+            self._schedule(session_key, key)
+        return result
+
+    def lookup(self, key: str) -> SearchResult:
+        """
+        Answer a normalized query from cache only.
+
+        Returns:
+            Final result on an exact hit; otherwise the refined results of
+            the longest cached prefix (possibly empty), marked not final
+        """
+        cached = self.data.peek_search(key, self.limit)
+        if cached is not None:
+            with self.lock:
+                self.stats["exact_hits"] += 1
+            return SearchResult(key, cached, True)
+
+        terms = key.split()
+        for end in range(len(key) - 1, MIN_PREFIX - 1, -1):
+            prefix = key[:end].rstrip()
+            base = self.data.peek_search(prefix, self.limit)
+            if base is None:
+                continue
+            refined = [e for e in base if matches(e, terms)]
+            with self.lock:
+                self.stats["refined"] += 1
+            return SearchResult(key, refined, False)
+        return SearchResult(key, [], False)
+
+    def cancel(self, session_key: str):
+        """Forget a session's query and any pending upstream search."""
+        with self.lock:
+            self.latest.pop(session_key, None)
+            self.last_seen.pop(session_key, None)
+            timer = self.timers.pop(session_key, None)
+        if timer is not None:
+            timer.cancel()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Request, cache and upstream counters."""
+        with self.lock:
+            return dict(self.stats)
+
+    def _expire(self, now: float) -> List[threading.Timer]:
+        """Forget sessions not seen within session_ttl (lock held); returns their timers."""
+        timers = []
+        for session_key, seen in list(self.last_seen.items()):
+            if now - seen > self.session_ttl:
+                del self.last_seen[session_key]
+                self.latest.pop(session_key, None)
+                timer = self.timers.pop(session_key, None)
+                if timer is not None:
+                    timers.append(timer)
+        return timers
+
+    def _schedule(self, session_key: str, key: str):
+        """Search upstream after the debounce, unless a search is pending."""
+        with self.lock:
+            if session_key in self.timers or self.latest.get(session_key) != key:
+                return
+            timer = threading.Timer(self.debounce, self._fetch, args=(session_key, key))
+            timer.daemon = True
+            self.timers[session_key] = timer
+        timer.start()
+
+    def _fetch(self, session_key: str, key: str):
+        """Timer callback: search upstream if ``key`` is still current."""
+        timer = threading.current_thread()
+        with self.lock:
+            if self.latest.get(session_key) != key or self.timers.get(session_key) is not timer:
+                self.stats["superseded"] += 1
+                return
+            self.stats["upstream"] += 1
+        try:
+            self.data.search_events(key, self.limit)
+        finally:
+            # The timer stays registered while the call is in flight, so
+            # polls in the meantime don't schedule a duplicate
+            with self.lock:
+                if self.timers.get(session_key) is timer:
+                    del self.timers[session_key]
+
+    def wait(self, session_key: str, timeout: Optional[float] = None) -> SearchResult:
+        """
+        Block until the session's current query has a final answer.
+
+        For non-UI callers; the app polls ``result`` instead.
+        """
+        with self.lock:
+            timer = self.timers.get(session_key)
+        if timer is not None:
+            timer.join(timeout)
+        return self.result(session_key)
@@ -0,0 +1,336 @@
+"""
+Page-wide CSS for the Streamlit app.
+"""
+import re
+
+
+def minify_css(css: str) -> str:
+    """
+    Strip comments and collapse whitespace in a CSS (or <style>) block.
+
+    Args:
+        css: Stylesheet text
+
+    Returns:
+        Equivalent, smaller stylesheet text
+    """
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    return css.strip()
+
+
+# Cyberpunk-style CSS, minified once per process rather than re-sent
+# in full on every rerun
+APP_CSS = minify_css("""
+    <style>
+    @import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@400;500;700;900&family=Rajdhani:wght@300;400;500;600;700&display=swap');
+    
+    /* Remove Streamlit branding */
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    header {visibility: hidden;}
+        font-family: 'Rajdhani', sans-serif;
+    }
+    
+    /* Force dark background everywhere */
+    .stApp, .stApp > div, .main, .main > div,
+    [data-testid="stAppViewContainer"],
+    [data-testid="stAppViewBlockContainer"],
+    section[data-testid="stMain"],
+    .block-container {
+        background: transparent !important;
+    }
+    
+    [data-testid="stAppViewContainer"] {
+        background: linear-gradient(135deg, #0a0e27 0%, #1a1a2e 50%, #16213e 100%) !important;
+        background-attachment: fixed !important;
+    }
+    
+    .main .block-container {
+        padding: 2rem;
+        max-width: 1400px;
+    }
+    
+    /* Animated background grid */
+    .stApp::before {
+        content: '';
+        position: fixed;
+        top: 0;
+        left: 0;
+        width: 100%;
+        height: 100%;
+        background-image: 
+            linear-gradient(rgba(0, 255, 255, 0.03) 1px, transparent 1px),
+            linear-gradient(90deg, rgba(0, 255, 255, 0.03) 1px, transparent 1px);
+        background-size: 50px 50px;
+        pointer-events: none;
+        z-index: 0;
+    }
+    
+    /* Remove Streamlit branding */
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    header {visibility: hidden;}
+    
+    /* Headers with glow */
+    h1 {
+        font-family: 'Orbitron', sans-serif !important;
+        font-size: 3rem !important;
+        font-weight: 900 !important;
+        background: linear-gradient(135deg, #00f5ff 0%, #ff00ff 50%, #00f5ff 100%) !important;
+        -webkit-background-clip: text !important;
+        -webkit-text-fill-color: transparent !important;
+        background-clip: text !important;
+        text-shadow: 0 0 30px rgba(0, 245, 255, 0.5);
+        margin-bottom: 2rem !important;
+        animation: glow 2s ease-in-out infinite alternate;
+    }
+    
+    @keyframes glow {
+        from { filter: drop-shadow(0 0 10px #00f5ff); }
+        to { filter: drop-shadow(0 0 20px #ff00ff); }
+    }
+    
+    h2 {
+        font-family: 'Orbitron', sans-serif !important;
+        font-size: 1.5rem !important;
+        font-weight: 700 !important;
+        color: #00f5ff !important;
+        text-transform: uppercase !important;
+        letter-spacing: 2px !important;
+        margin: 2rem 0 1rem 0 !important;
+        text-shadow: 0 0 10px rgba(0, 245, 255, 0.5);
+    }
+    
+    h3 {
+        font-family: 'Rajdhani', sans-serif !important;
+        font-size: 1.2rem !important;
+        font-weight: 600 !important;
+        color: #fff !important;
+    }
+    
+    /* Neon buttons */
+    .stButton > button {
+        background: linear-gradient(135deg, #ff00ff 0%, #00f5ff 100%) !important;
+        color: #000 !important;
+        border: 2px solid #00f5ff !important;
+        border-radius: 10px !important;
+        font-weight: 700 !important;
+        font-family: 'Orbitron', sans-serif !important;
+        padding: 0.75rem 1.5rem !important;
+        text-transform: uppercase !important;
+        letter-spacing: 1px !important;
+        box-shadow: 0 0 20px rgba(0, 245, 255, 0.5), inset 0 0 20px rgba(255, 0, 255, 0.2) !important;
+        transition: all 0.3s ease !important;
+    }
+    
+    .stButton > button:hover {
+        transform: translateY(-3px) scale(1.05) !important;
+        box-shadow: 0 0 30px rgba(0, 245, 255, 0.8), 0 0 50px rgba(255, 0, 255, 0.6) !important;
+        border-color: #ff00ff !important;
+    }
+    
+    /* Glowing search bar */
+    .stTextInput > div > div > input {
+        background: rgba(26, 26, 46, 0.8) !important;
+        border: 2px solid #00f5ff !important;
+        border-radius: 10px !important;
+        padding: 1rem !important;
+        font-size: 1rem !important;
+        color: #00f5ff !important;
+        font-weight: 500 !important;
+        box-shadow: 0 0 15px rgba(0, 245, 255, 0.3), inset 0 0 10px rgba(0, 245, 255, 0.1) !important;
+        transition: all 0.3s ease !important;
+    }
+    
+    .stTextInput > div > div > input:focus {
+        border-color: #ff00ff !important;
+        box-shadow: 0 0 25px rgba(255, 0, 255, 0.6), inset 0 0 15px rgba(255, 0, 255, 0.2) !important;
+    }
+    
+    .stTextInput > div > div > input::placeholder {
+        color: rgba(0, 245, 255, 0.5) !important;
+    }
+    
+    /* Cyberpunk metrics */
+    [data-testid="stMetricValue"] {
+        font-family: 'Orbitron', sans-serif !important;
+        font-size: 2rem !important;
+        font-weight: 900 !important;
+        background: linear-gradient(135deg, #00f5ff 0%, #ff00ff 100%) !important;
+        -webkit-background-clip: text !important;
+        -webkit-text-fill-color: transparent !important;
+        text-shadow: 0 0 20px rgba(0, 245, 255, 0.5);
+    }
+    
+    [data-testid="stMetricLabel"] {
+        font-size: 0.9rem !important;
+        color: #00f5ff !important;
+        font-weight: 600 !important;
+        text-transform: uppercase !important;
+        letter-spacing: 1px !important;
+    }
+    
+    /* Selectbox */
+    .stSelectbox > div > div {
+        background: rgba(26, 26, 46, 0.8) !important;
+        border: 2px solid #00f5ff !important;
+        border-radius: 8px !important;
+        color: #00f5ff !important;
+        box-shadow: 0 0 10px rgba(0, 245, 255, 0.3) !important;
+    }
+    
+    /* Neon dividers */
+    hr {
+        border: none !important;
+        height: 2px !important;
+        background: linear-gradient(90deg, transparent, #00f5ff, #ff00ff, #00f5ff, transparent) !important;
+        box-shadow: 0 0 10px rgba(0, 245, 255, 0.5) !important;
+        margin: 2rem 0 !important;
+    }
+    
+    /* Captions */
+    .stCaption {
+        color: #00f5ff !important;
+        font-size: 0.9rem !important;
+        font-weight: 500 !important;
+    }
+    
+    /* Fix all text elements to ensure visibility */
+    p, span, label {
+        color: #fff !important;
+    }
+    
+    /* Ensure text is visible on dark background */
+    p, span, label, .stMarkdown, .stMarkdown p {
+        color: #fff !important;
+    }
+    
+    /* Selectbox styling - force all parts to be visible */
+    .stSelectbox label {
+        color: #00f5ff !important;
+        font-weight: 600 !important;
+        text-shadow: 0 0 10px rgba(0, 245, 255, 0.5);
+    }
+    
+    /* Target the actual select container */
+    .stSelectbox > div > div {
+        background: rgba(26, 26, 46, 0.95) !important;
+        border: 2px solid #00f5ff !important;
+        border-radius: 8px !important;
+        box-shadow: 0 0 10px rgba(0, 245, 255, 0.3) !important;
+    }
+    
+    /* Target the select element itself */
+    .stSelectbox [data-baseweb="select"] {
+        background: rgba(26, 26, 46, 0.95) !important;
+    }
+    
+    .stSelectbox [data-baseweb="select"] > div {
+        background: rgba(26, 26, 46, 0.95) !important;
+        color: #00f5ff !important;
+        border: 2px solid #00f5ff !important;
+    }
+    
+    /* Force all text inside selectbox to be cyan */
+    .stSelectbox > div > div {
+        background-color: rgba(26, 26, 46, 0.95) !important;
+    }
+    
+    .stSelectbox span {
+        color: #00f5ff !important;
+    }
+    
+    .stSelectbox svg {
+        fill: #00f5ff !important;
+    }
+    
+    /* Dropdown menu options */
+    [role="listbox"] {
+        background: #1a1a2e !important;
+        border: 2px solid #00f5ff !important;
+    }
+    
+    [role="option"] {
+        background: #1a1a2e !important;
+        color: #00f5ff !important;
+    }
+    
+    [role="option"]:hover {
+        background: rgba(0, 245, 255, 0.2) !important;
+        color: #ff00ff !important;
+    }
+    
+    /* Force dropdown text to be visible */
+    option {
+        background: #1a1a2e !important;
+        color: #00f5ff !important;
+    }
+    
+    /* Target specific selectbox elements by data attributes */
+    [data-baseweb="popover"] {
+        background: #1a1a2e !important;
+    }
+    
+    [data-baseweb="menu"] {
+        background: #1a1a2e !important;
+    }
+    
+    [data-baseweb="list"] {
+        background: #1a1a2e !important;
+    }
+    
+    [data-baseweb="list-item"] {
+        background: #1a1a2e !important;
+        color: #00f5ff !important;
+    }
+    
+    [data-baseweb="list-item"]:hover {
+        background: rgba(0, 245, 255, 0.3) !important;
+    }
+    
+    /* Markdown text */
+    .stMarkdown {
+        color: #fff !important;
+    }
+    
+    .stMarkdown p {
+        color: #fff !important;
+    }
+    
+    /* Strong/bold text */
+    strong, b {
+        color: #00f5ff !important;
+    }
+    
+    /* Chart text */
+    .js-plotly-plot .plotly text {
+        fill: #00f5ff !important;
+    }
+    
+    /* Info boxes */
+    .stAlert {
+        background: rgba(0, 245, 255, 0.1) !important;
+        border: 2px solid #00f5ff !important;
+        border-radius: 10px !important;
+        box-shadow: 0 0 20px rgba(0, 245, 255, 0.2) !important;
+    }
+    
+    /* Spinner */
+    .stSpinner > div {
+        border-top-color: #00f5ff !important;
+        border-right-color: #ff00ff !important;
+    }
+    
+    /* Glitch effect on hover */
+    @keyframes glitch {
+        0% { transform: translate(0); }
+        20% { transform: translate(-2px, 2px); }
+        40% { transform: translate(-2px, -2px); }
+        60% { transform: translate(2px, 2px); }
+        80% { transform: translate(2px, -2px); }
+        100% { transform: translate(0); }
+    }
+    </style>
+""")
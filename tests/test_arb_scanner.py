@@ -0,0 +1,88 @@
+"""
+Cross-market consistency scanner (arb_scanner.py) edge cases.
+"""
+import math
+
+from arb_scanner import ArbScanner
+from token_index import CatalogIndex
+
+
+def neg_risk_event(n_markets=3):
+    return {
+        "id": "e1",
+        "title": "Who wins?",
+        "slug": "who-wins",
+        "negRisk": True,
+        "markets": [{
+            "id": f"m{i}",
+            "question": f"Candidate {i}?",
+            "outcomes": '["Yes", "No"]',
+            "clobTokenIds": f'["y{i}", "n{i}"]',
+        } for i in range(n_markets)],
+    }
+
+
+def book(asset_id, bid=None, ask=None):
+    return {
+        "event_type": "book",
+        "asset_id": asset_id,
+        "bids": [{"price": str(bid), "size": "10"}] if bid is not None else [],
+        "asks": [{"price": str(ask), "size": "10"}] if ask is not None else [],
+    }
+
+
+def price_change(asset_id, **fields):
+    return {"event_type": "price_change", "asset_id": asset_id, **{k: str(v) for k, v in fields.items()}}
+
+
+def scanner_for(*events):
+    catalog = CatalogIndex()
+    catalog.add_events(list(events))
+    return ArbScanner(catalog, min_edge=0.005)
+
+
+def kinds(scanner):
+    return {o.kind for o in scanner.get_opportunities()}
+
+
+def test_under_round_clears_when_a_book_empties_a_side():
+    scanner = scanner_for(neg_risk_event())
+    for i in range(3):
+        scanner.update(book(f"y{i}", 0.2, 0.3), 1.0)
+    assert kinds(scanner) == {"under_round"}
+
+    # Snapshot without asks: the Yes ask side of market 1 is now empty
+    scanner.update(book("y1", 0.2), 2.0)
+    assert "under_round" not in kinds(scanner)
+
+    scanner.update(book("y1", 0.2, 0.3), 3.0)
+    assert "under_round" in kinds(scanner)
+
+
+def test_zero_prices_are_empty_sides():
+    scanner = scanner_for(neg_risk_event())
+    for i in range(3):
+        scanner.update(book(f"y{i}", 0.2, 0.3), 1.0)
+    scanner.update(price_change("y2", best_ask=0), 2.0)
+    assert "under_round" not in kinds(scanner)
+    scanner.update(price_change("y2", best_bid=0), 3.0)
+    assert math.isnan(scanner.quotes["y2"][0])
+
+
+def test_price_change_keeps_the_other_side():
+    scanner = scanner_for(neg_risk_event())
+    scanner.update(book("y0", 0.4, 0.5), 1.0)
+    scanner.update(price_change("y0", best_bid=0.45), 2.0)
+    assert scanner.quotes["y0"] == (0.45, 0.5)
+
+
+def test_over_round_and_pairs():
+    scanner = scanner_for(neg_risk_event())
+    for i in range(3):
+        scanner.update(book(f"y{i}", 0.4, 0.5), 1.0)
+    assert "over_round" in kinds(scanner)
+    scanner.update(book("n0", 0.7, 0.8), 2.0)
+    assert "pair_over" in kinds(scanner)
+    scanner.update(book("n0", 0.5, 0.45), 3.0)
+    assert {"crossed", "pair_under"} <= kinds(scanner)
+    assert "pair_over" not in kinds(scanner)
@@ -0,0 +1,45 @@
+"""
+Live history figure cache (charts.py).
+"""
+import base64
+import json
+
+import numpy as np
+
+from plotly.io import to_json
+
+import charts
+
+
+HISTORY = [(1_700_000_000 + i * 60, 0.5 + (i % 7) / 100) for i in range(3000)]
+
+
+def serialized(fig):
+    return json.loads(to_json(fig.to_dict(), validate=False))
+
+
+def test_concurrent_renders_get_their_own_tail():
+    charts.clear_cache()
+    with charts.live_history_figure("t", "1d", HISTORY, (1_700_200_000, 0.6)) as first:
+        with charts.live_history_figure("t", "1d", HISTORY, (1_700_300_000, 0.7)) as second:
+            assert first is not second
+            assert serialized(first)["data"][1]["y"][1] == 60.0
+            assert serialized(second)["data"][1]["y"][1] == 70.0
+            assert serialized(first)["data"][0] == serialized(second)["data"][0]
+
+
+def test_figure_is_reused_and_tail_can_be_hidden():
+    charts.clear_cache()
+    with charts.live_history_figure("t", "1d", HISTORY, (1_700_200_000, 0.6)) as first:
+        pass
+    with charts.live_history_figure("t", "1d", HISTORY) as again:
+        assert again is first
+        assert serialized(again)["data"][1]["x"] == []
+
+
+def test_history_is_sent_as_typed_arrays():
+    x, y = charts.history_arrays(HISTORY)
+    data = serialized(charts.build_history_figure(HISTORY))["data"][0]
+    for spec, values in ((data["x"], x), (data["y"], y)):
+        assert spec["dtype"] == "f8"
+        assert np.array_equal(np.frombuffer(base64.b64decode(spec["bdata"]), dtype="<f8"), values)
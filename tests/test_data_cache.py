@@ -0,0 +1,120 @@
+"""
+TTL cache and cached data service (data_cache.py).
+"""
+import threading
+import time
+
+import pytest
+
+from data_cache import CachedDataService, TTLCache, normalize_query
+
+
+def test_concurrent_misses_load_once():
+    cache = TTLCache()
+    calls = []
+    release = threading.Event()
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert calls == [1]
+    assert results == ["value"] * 8
+
+
+def test_failed_load_is_retried_by_a_waiter():
+    cache = TTLCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def failing():
+        calls.append("fail")
+        started.set()
+        release.wait(5)
+        raise RuntimeError("upstream down")
+
+    def succeeding():
+        calls.append("ok")
+        return "value"
+
+    errors = []
+
+    def first():
+        try:
+            cache.get_or_load("k", failing)
+        except RuntimeError as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=first)
+    thread.start()
+    started.wait(5)
+    waiter_result = []
+    waiter = threading.Thread(target=lambda: waiter_result.append(cache.get_or_load("k", succeeding)))
+    waiter.start()
+    release.set()
+    thread.join()
+    waiter.join()
+    assert len(errors) == 1
+    assert waiter_result == ["value"]
+    assert calls == ["fail", "ok"]
+    assert not cache._inflight
+
+
+def test_entries_expire_and_evict():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("short", 1, ttl=0.05)
+    assert cache.get("short") == 1
+    time.sleep(0.1)
+    assert cache.get("short") is None
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_zero_ttl_is_not_stored():
+    cache = TTLCache()
+    assert cache.get_or_load("k", lambda: [], ttl_for=lambda v: 0) == []
+    assert not cache.contains("k")
+
+
+class FakeGamma:
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.calls = []
+
+    def search_events_public(self, query, limit_per_type=20):
+        self.calls.append(query)
+        return self.answers.pop(0)
+
+
+def test_empty_search_is_kept_briefly():
+    gamma = FakeGamma([[], [{"id": "1"}]])
+    data = CachedDataService(gamma, None)
+    data.EMPTY_TTL = 0.05
+    assert data.search_events("  Trump  ") == []
+    assert data.peek_search("trump") == []
+    time.sleep(0.1)
+    assert data.peek_search("trump") is None
+    assert data.search_events("TRUMP") == [{"id": "1"}]
+    assert data.search_events("trump") == [{"id": "1"}]
+    assert gamma.calls == ["trump", "trump"]
+
+
+@pytest.mark.parametrize("query, key", [("  A  b ", "a b"), ("ÄB", "äb"), (None, "")])
+def test_normalize_query(query, key):
+    assert normalize_query(query) == key
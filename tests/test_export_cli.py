@@ -0,0 +1,136 @@
+"""
+Resume and failure handling of the bulk export (export_cli.py).
+"""
+import csv
+import glob
+import os
+
+import pytest
+import requests
+
+import export_cli
+
+
+def make_events(n):
+    return [{
+        "id": str(i),
+        "title": f"Event {i}",
+        "slug": f"event-{i}",
+        "markets": [{
+            "id": f"m{i}",
+            "question": f"Question {i}?",
+            "outcomes": '["Yes", "No"]',
+            "outcomePrices": '["0.4", "0.6"]',
+            "clobTokenIds": f'["y{i}", "n{i}"]',
+        }],
+    } for i in range(n)]
+
+
+class FakeGamma:
+    """Pages over a fixed event list; ``fail`` maps offset -> errors still to raise."""
+
+    def __init__(self, events, fail=None, fail_after=1):
+        self.events = events
+        self.fail = dict(fail or {})
+        self.fail_after = fail_after
+        self.requests = []
+
+    def iter_events(self, params):
+        offset, limit = params["offset"], params["limit"]
+        self.requests.append(offset)
+        page = self.events[offset:offset + limit]
+        for i, event in enumerate(page):
+            if i == self.fail_after and self.fail.get(offset):
+                self.fail[offset] -= 1
+                raise requests.ConnectionError("connection reset")
+            yield event
+
+
+class FakeCLOB:
+    bad_tokens = set()
+
+    def fetch_price_history(self, token_id, interval):
+        if token_id in self.bad_tokens:
+            return [{"t": 1}]
+        return [(1_700_000_000, 0.4), (1_700_003_600, 0.5)]
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(export_cli.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(export_cli, "CLOBClient", FakeCLOB)
+    FakeCLOB.bad_tokens = set()
+
+
+def read_rows(directory):
+    rows = []
+    for path in sorted(glob.glob(os.path.join(directory, "part-*.csv"))):
+        with open(path, newline="", encoding="utf-8") as f:
+            rows.extend(list(csv.reader(f))[1:])
+    return rows
+
+
+def run(monkeypatch, gamma, out, *extra):
+    monkeypatch.setattr(export_cli, "GammaClient", lambda: gamma)
+    export_cli.main(["--out", str(out), "--page-size", "4", "--part-rows", "3", "--workers", "2",
+                     "--rate", "1000", *extra])
+
+
+def test_catalog_page_retried_without_repeating_events():
+    gamma = FakeGamma(make_events(10), fail={4: 2})
+    events = list(export_cli.iter_catalog(gamma, page_size=4))
+    assert [e["id"] for e in events] == [str(i) for i in range(10)]
+    assert gamma.requests == [0, 4, 4, 4, 8]
+
+
+def test_catalog_walk_raises_after_retries():
+    gamma = FakeGamma(make_events(10), fail={4: 10})
+    with pytest.raises(requests.ConnectionError):
+        list(export_cli.iter_catalog(gamma, page_size=4, retries=2))
+
+
+def test_failed_walk_is_not_recorded_as_complete(monkeypatch, tmp_path):
+    with pytest.raises(SystemExit):
+        run(monkeypatch, FakeGamma(make_events(10), fail={4: 10}), tmp_path)
+    assert export_cli.Manifest(str(tmp_path / "manifest.json")).state["markets_done"] is False
+    assert not os.path.exists(tmp_path / "markets")
+
+    run(monkeypatch, FakeGamma(make_events(10)), tmp_path)
+    assert len(read_rows(tmp_path / "markets")) == 10
+    assert len(read_rows(tmp_path / "history" / "interval=1d")) == 40
+
+
+def test_malformed_history_skips_only_that_token(monkeypatch, tmp_path):
+    FakeCLOB.bad_tokens = {"y3"}
+    run(monkeypatch, FakeGamma(make_events(10)), tmp_path)
+    rows = read_rows(tmp_path / "history" / "interval=1d")
+    assert len(rows) == 38
+    assert "y3" not in {row[0] for row in rows}
+
+
+def test_fresh_rerun_does_not_duplicate(monkeypatch, tmp_path):
+    run(monkeypatch, FakeGamma(make_events(10)), tmp_path)
+    run(monkeypatch, FakeGamma(make_events(10)), tmp_path, "--fresh")
+    assert len(read_rows(tmp_path / "markets")) == 10
+    assert len(read_rows(tmp_path / "history" / "interval=1d")) == 40
+
+
+def test_crash_after_part_rename_does_not_duplicate(monkeypatch, tmp_path):
+    mark_done = export_cli.Manifest.mark_done
+    calls = []
+
+    def crash_on_second_part(self, interval, token_ids, part=None):
+        calls.append(part)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        mark_done(self, interval, token_ids, part)
+
+    monkeypatch.setattr(export_cli.Manifest, "mark_done", crash_on_second_part)
+    with pytest.raises(KeyboardInterrupt):
+        run(monkeypatch, FakeGamma(make_events(10)), tmp_path)
+    monkeypatch.setattr(export_cli.Manifest, "mark_done", mark_done)
+
+    run(monkeypatch, FakeGamma(make_events(10)), tmp_path)
+    rows = read_rows(tmp_path / "history" / "interval=1d")
+    assert len(rows) == 40
+    assert len(set(map(tuple, rows))) == 40
@@ -0,0 +1,18 @@
+"""
+Landing feed card markup (feed.py).
+"""
+from feed import feed_html
+
+
+def test_cards_escape_event_fields():
+    html = feed_html([{
+        "id": '1"><script>x</script>',
+        "title": "<img src=x onerror=alert(1)>",
+        "slug": "a&b",
+        "markets": [{"id": "m1", "question": "Q?", "outcomes": '["<b>Yes</b>", "No"]',
+                     "outcomePrices": '["0.5", "0.5"]'}],
+    }], {"q": "<x>"})
+    assert "<script>" not in html
+    assert "<img" not in html
+    assert "<b>Yes" not in html
+    assert 'data-event="1&quot;&gt;&lt;script&gt;x&lt;/script&gt;"' in html
@@ -0,0 +1,60 @@
+"""
+Streaming Gamma responses (gamma_client.py) against a local HTTP server.
+"""
+import http.server
+import threading
+
+import pytest
+import requests
+
+from gamma_client import GammaClient
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    status = 200
+    body = b"[]"
+
+    def do_GET(self):
+        self.send_response(self.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def gamma():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield GammaClient(f"http://127.0.0.1:{server.server_address[1]}")
+    server.shutdown()
+    server.server_close()
+
+
+def serve(monkeypatch, status, body):
+    monkeypatch.setattr(Handler, "status", status)
+    monkeypatch.setattr(Handler, "body", body)
+
+
+def test_complete_stream(gamma, monkeypatch):
+    serve(monkeypatch, 200, b'[{"id": "1", "extra": 1}, {"id": "2"}]')
+    assert list(gamma.iter_events({})) == [{"id": "1"}, {"id": "2"}]
+
+
+def test_truncated_stream_raises(gamma, monkeypatch):
+    serve(monkeypatch, 200, b'[{"id": "1"}, {"id": "2"}, {"id"')
+    seen = []
+    with pytest.raises(ValueError):
+        for event in gamma.iter_events({}):
+            seen.append(event)
+    assert [e["id"] for e in seen] == ["1", "2"]
+
+
+def test_rate_limited_page_raises(gamma, monkeypatch):
+    serve(monkeypatch, 429, b'{"error": "slow down"}')
+    with pytest.raises(requests.HTTPError) as info:
+        list(gamma.iter_popular_events(10))
+    assert info.value.response.status_code == 429
@@ -0,0 +1,101 @@
+"""
+LiveFeed (live_feed.py) switching between the feeder's table and
+in-process WebSocket subscriptions.
+"""
+import struct
+import time
+import uuid
+from multiprocessing import shared_memory
+
+import pytest
+
+import live_feed
+import price_feeder
+from live_feed import LiveFeed
+from price_feeder import SharedPriceTable
+
+
+class FakeManager:
+    def __init__(self, **kwargs):
+        self.assets = []
+
+    def set_assets(self, assets):
+        self.assets = list(assets)
+
+    def get_live_prices(self, asset_id):
+        return {"last_trade_price": 0.1} if asset_id in self.assets else None
+
+    def disconnect(self):
+        self.assets = []
+
+
+@pytest.fixture
+def name(monkeypatch):
+    monkeypatch.setattr(live_feed, "_ATTACH_INTERVAL", 0.0)
+    monkeypatch.setattr(price_feeder, "_REATTACH_INTERVAL", 0.0)
+    name = f"pmtest_{uuid.uuid4().hex[:10]}"
+    yield name
+    try:
+        block = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+def set_heartbeat(table, when):
+    struct.pack_into("<d", table.buf, price_feeder._HEARTBEAT_OFFSET, when)
+
+
+def test_feeder_death_and_recovery_resync_subscriptions(name):
+    table = SharedPriceTable(name, capacity=4)
+    table.update("a", {"best_bid": 0.5}, time.time())
+    feed = LiveFeed(name, manager_factory=FakeManager)
+    try:
+        feed.watch("s1", ["a", "b"])
+        assert feed.manager.assets == ["b"]
+        assert feed.get_prices(["a"])["a"]["best_bid"] == 0.5
+
+        set_heartbeat(table, time.time() - 60)
+        assert feed.get_prices(["a"])["a"] == {"last_trade_price": 0.1}
+        assert feed.manager.assets == ["a", "b"]
+
+        table.heartbeat()
+        feed.watch("s1", ["a", "b"])
+        assert feed.manager.assets == ["b"]
+    finally:
+        feed.close()
+        table.close()
+
+
+def test_feeder_started_later_takes_over(name):
+    feed = LiveFeed(name, manager_factory=FakeManager)
+    table = None
+    try:
+        feed.watch("s1", ["a"])
+        assert feed.source == "websocket"
+        assert feed.manager.assets == ["a"]
+
+        table = SharedPriceTable(name, capacity=4)
+        table.update("a", {"best_bid": 0.5}, time.time())
+        assert feed.get_prices(["a"])["a"]["best_bid"] == 0.5
+        assert feed.manager.assets == []
+    finally:
+        feed.close()
+        if table is not None:
+            table.close()
+
+
+def test_asset_dropped_by_feeder_is_subscribed_in_process(name):
+    table = SharedPriceTable(name, capacity=4)
+    table.update("a", {"best_bid": 0.5}, time.time())
+    feed = LiveFeed(name, manager_factory=FakeManager)
+    try:
+        feed.watch("s1", ["a"])
+        assert feed.manager is None or feed.manager.assets == []
+        table.retain([])
+        feed.watch("s1", ["a"])
+        assert feed.manager.assets == ["a"]
+    finally:
+        feed.close()
+        table.close()
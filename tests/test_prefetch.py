@@ -0,0 +1,65 @@
+"""
+Background history prefetch (prefetch.py).
+"""
+import threading
+import time
+
+from prefetch import Prefetcher
+
+
+class FakeData:
+    def __init__(self):
+        self.fetched = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def has_price_history(self, token_id, interval="1d"):
+        return token_id in self.fetched
+
+    def price_history(self, token_id, interval="1d"):
+        self.release.wait(5)
+        self.fetched.append(token_id)
+        return [(1, 0.5)]
+
+
+def test_cancel_forgets_the_key():
+    data = FakeData()
+    prefetcher = Prefetcher(data, max_workers=1)
+    try:
+        data.release.clear()
+        prefetcher.prefetch("s", ["a", "b", "c"])
+        prefetcher.cancel("s")
+        data.release.set()
+        prefetcher.executor.shutdown(wait=True)
+        assert not prefetcher.generations
+        assert not prefetcher.last_seen
+        assert not prefetcher.pending
+        # Only the task already running when cancelled may have fetched
+        assert len(data.fetched) <= 1
+    finally:
+        prefetcher.shutdown()
+
+
+def test_idle_keys_expire():
+    data = FakeData()
+    prefetcher = Prefetcher(data, session_ttl=0.05)
+    try:
+        prefetcher.prefetch("idle", ["a"])
+        time.sleep(0.1)
+        prefetcher.prefetch("active", ["b"])
+        assert set(prefetcher.generations) == {"active"}
+        assert set(prefetcher.last_seen) == {"active"}
+    finally:
+        prefetcher.shutdown()
+
+
+def test_returning_key_never_reuses_a_generation():
+    prefetcher = Prefetcher(FakeData())
+    try:
+        prefetcher.prefetch("s", [])
+        first = prefetcher.generations["s"]
+        prefetcher.cancel("s")
+        prefetcher.prefetch("s", [])
+        assert prefetcher.generations["s"] > first
+    finally:
+        prefetcher.shutdown()
@@ -0,0 +1,147 @@
+"""
+Shared-memory price table (price_feeder.py): seqlock reads, slot reuse,
+feeder restarts and ownership of the block.
+"""
+import os
+import struct
+import time
+import uuid
+from multiprocessing import shared_memory
+
+import pytest
+
+import price_feeder
+from price_feeder import HEADER_SIZE, RECORD_SIZE, SharedPriceReader, SharedPriceTable
+
+
+@pytest.fixture
+def name():
+    name = f"pmtest_{uuid.uuid4().hex[:10]}"
+    yield name
+    try:
+        block = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+def set_heartbeat(table, when):
+    struct.pack_into("<d", table.buf, price_feeder._HEARTBEAT_OFFSET, when)
+
+
+def test_reused_slot_is_visible_to_a_reader_that_scanned_it(name):
+    table = SharedPriceTable(name, capacity=4)
+    reader = SharedPriceReader(name)
+    try:
+        for asset in ("a", "b", "c"):
+            table.update(asset, {"best_bid": 0.5}, time.time())
+        assert reader.get_live_prices("b")["best_bid"] == 0.5
+
+        assert table.retain(["a", "c"]) == 1
+        assert reader.get_live_prices("b") == {}
+
+        table.update("d", {"best_ask": 0.7}, time.time())
+        assert table.slots["d"] == 1
+        assert reader.get_live_prices("d")["best_ask"] == 0.7
+        assert reader.get_live_prices("b") == {}
+        assert sorted(reader.asset_ids()) == ["a", "c", "d"]
+    finally:
+        reader.close()
+        table.close()
+
+
+def test_reader_scanning_right_after_epoch_bump_sees_reused_slot(name, monkeypatch):
+    table = SharedPriceTable(name, capacity=4)
+    reader = SharedPriceReader(name)
+
+    class RescanOnEpoch:
+        """struct stand-in that lets the reader rescan the moment an epoch is published."""
+
+        def __getattr__(self, attr):
+            return getattr(struct, attr)
+
+        def pack_into(self, fmt, buf, offset, *values):
+            struct.pack_into(fmt, buf, offset, *values)
+            if offset == price_feeder._EPOCH_OFFSET:
+                reader._refresh_index()
+
+    try:
+        for asset in ("a", "b", "c"):
+            table.update(asset, {"best_bid": 0.5}, time.time())
+        assert reader.get_live_prices("b")
+        monkeypatch.setattr(price_feeder, "struct", RescanOnEpoch())
+        table.retain(["a", "c"])
+        table.update("d", {"best_ask": 0.7}, time.time())
+        monkeypatch.undo()
+        assert reader.get_live_prices("d")["best_ask"] == 0.7
+    finally:
+        reader.close()
+        table.close()
+
+
+def test_record_stuck_mid_update_gives_up(name):
+    table = SharedPriceTable(name, capacity=4)
+    reader = SharedPriceReader(name)
+    try:
+        table.update("a", {"best_bid": 0.5}, time.time())
+        assert reader.get_live_prices("a")
+        # Feeder died between the two seq writes
+        offset = HEADER_SIZE + table.slots["a"] * RECORD_SIZE
+        seq, = struct.unpack_from("<Q", table.buf, offset)
+        struct.pack_into("<Q", table.buf, offset, seq + 1)
+        started = time.monotonic()
+        assert reader.get_live_prices("a") == {}
+        assert reader._read_asset(reader.buf, table.slots["a"]) is None
+        assert time.monotonic() - started < 1.0
+    finally:
+        reader.close()
+        table.close()
+
+
+def test_second_feeder_does_not_replace_a_live_table(name, monkeypatch):
+    table = SharedPriceTable(name, capacity=4)
+    try:
+        # Pretend the table belongs to another running process
+        monkeypatch.setattr(price_feeder.os, "getpid", lambda: os.getppid() + 10**6)
+        monkeypatch.setattr(price_feeder, "_pid_alive", lambda pid: True)
+        with pytest.raises(FileExistsError):
+            SharedPriceTable(name, capacity=4)
+        table.update("a", {"best_bid": 0.5}, time.time())
+        reader = SharedPriceReader(name)
+        assert reader.get_live_prices("a")["best_bid"] == 0.5
+        reader.close()
+    finally:
+        table.close()
+
+
+def test_stale_or_orphaned_table_is_replaced(name, monkeypatch):
+    old = SharedPriceTable(name, capacity=4)
+    set_heartbeat(old, time.time() - 60)
+    monkeypatch.setattr(price_feeder, "_pid_alive", lambda pid: True)
+    new = SharedPriceTable(name, capacity=4)
+    old.close(unlink=False)
+
+    monkeypatch.setattr(price_feeder, "_pid_alive", lambda pid: False)
+    newest = SharedPriceTable(name, capacity=4)
+    new.close(unlink=False)
+    newest.close()
+
+
+def test_reader_reattaches_after_feeder_restart(name):
+    old = SharedPriceTable(name, capacity=4)
+    reader = SharedPriceReader(name)
+    try:
+        old.update("a", {"best_bid": 0.5}, time.time())
+        assert reader.is_alive()
+        set_heartbeat(old, time.time() - 60)
+        new = SharedPriceTable(name, capacity=4)
+        old.close(unlink=False)
+        new.update("b", {"best_bid": 0.6}, time.time())
+
+        assert reader.is_alive()
+        assert reader.get_live_prices("b")["best_bid"] == 0.6
+        assert reader.get_live_prices("a") == {}
+    finally:
+        reader.close()
+        new.close()
@@ -0,0 +1,81 @@
+"""
+Search as you type (search_service.py): debounce, refinement and expiry.
+"""
+import threading
+import time
+
+from data_cache import CachedDataService
+from search_service import SearchService
+
+
+def event(event_id, title):
+    return {"id": event_id, "title": title, "slug": title.lower().replace(" ", "-"), "markets": []}
+
+
+class FakeGamma:
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def search_events_public(self, query, limit_per_type=20):
+        with self.lock:
+            self.calls.append(query)
+        return list(self.results.get(query, []))
+
+
+def service(results, debounce=0.01, **kwargs):
+    gamma = FakeGamma(results)
+    return gamma, SearchService(CachedDataService(gamma, None), debounce=debounce, **kwargs)
+
+
+def test_superseded_query_is_not_sent():
+    gamma, search = service({"trump": [event("1", "Trump wins")]}, debounce=0.05)
+    search.request("s", "tr")
+    search.request("s", "trum")
+    search.request("s", "trump")
+    assert search.wait("s", 2).events == [event("1", "Trump wins")]
+    time.sleep(0.1)
+    assert gamma.calls == ["trump"]
+
+
+def test_refined_answer_is_provisional_until_confirmed():
+    # The server also matches "trump" on a field the local filter can't see
+    gamma, search = service({
+        "tru": [event("1", "Trump wins"), event("2", "Truth Social")],
+        "trump": [event("1", "Trump wins"), event("3", "Election 2028")],
+    })
+    search.request("s", "tru")
+    search.wait("s", 2)
+
+    refined = search.request("s", "trump")
+    assert not refined.final
+    assert [e["id"] for e in refined.events] == ["1"]
+    confirmed = search.wait("s", 2)
+    assert confirmed.final
+    assert [e["id"] for e in confirmed.events] == ["1", "3"]
+    assert gamma.calls == ["tru", "trump"]
+
+
+def test_expired_answer_is_fetched_again_once():
+    gamma, search = service({})
+    search.data.EMPTY_TTL = 0.05
+    search.request("s", "nothing")
+    assert search.wait("s", 2).final
+    time.sleep(0.1)
+    for _ in range(5):
+        assert not search.result("s").final
+    assert search.wait("s", 2).final
+    assert gamma.calls == ["nothing", "nothing"]
+
+
+def test_idle_sessions_are_forgotten():
+    gamma, search = service({}, session_ttl=0.05)
+    search.request("idle", "abc")
+    search.wait("idle", 2)
+    time.sleep(0.1)
+    search.request("active", "xyz")
+    assert "idle" not in search.latest
+    assert "idle" not in search.last_seen
+    search.cancel("active")
+    assert not search.latest and not search.last_seen
@@ -0,0 +1,29 @@
+"""
+Tick journal round trip and replay (tick_recorder.py).
+"""
+from tick_recorder import TickRecorder, read_journal, replay_journal
+from ws_client import WSClient
+
+
+def events(n):
+    return [{"event_type": "last_trade_price", "asset_id": "a", "price": f"0.1{i}"} for i in range(n)]
+
+
+def test_replay_is_not_recorded_again(tmp_path):
+    recorder = TickRecorder(str(tmp_path), flush_interval=60)
+    client = WSClient(recorder=recorder)
+    seen = []
+    client.add_listener(lambda event, recv_ts: seen.append(recv_ts))
+    try:
+        for i, event in enumerate(events(3)):
+            client._process_message(event, 1_700_000_000.0 + i)
+        recorder.flush()
+        assert len(list(read_journal(str(tmp_path)))) == 3
+
+        assert replay_journal(client, str(tmp_path), speed=None) == 3
+        recorder.flush()
+    finally:
+        recorder.close()
+    assert len(list(read_journal(str(tmp_path)))) == 3
+    assert seen == [1_700_000_000.0, 1_700_000_001.0, 1_700_000_002.0] * 2
+    assert client.get_live_prices("a")["last_trade_price"] == 0.12
@@ -0,0 +1,48 @@
+"""
+Token reverse index (token_index.py).
+"""
+from token_index import CatalogIndex
+
+
+def event(i, n_markets=1):
+    return {
+        "id": str(i),
+        "title": f"Event {i}",
+        "slug": f"event-{i}",
+        "markets": [{
+            "id": f"m{i}-{j}",
+            "question": f"Question {i}.{j}?",
+            "clobTokenIds": f'["y{i}-{j}", "n{i}-{j}"]',
+        } for j in range(n_markets)],
+    }
+
+
+def test_lookup_and_resolve():
+    catalog = CatalogIndex()
+    catalog.add_event(event(1, n_markets=2))
+    ref = catalog.lookup("n1-1")
+    assert (ref.event_id, ref.market_index, ref.outcome_index) == ("1", 1, 1)
+    model, market, outcome = catalog.resolve("y1-0")
+    assert (model.id, market.id, outcome) == ("1", "m1-0", 0)
+    assert catalog.get_event_by_slug("event-1") is model
+
+
+def test_bounded_index_evicts_least_recently_added():
+    catalog = CatalogIndex(max_events=3)
+    catalog.add_events([event(i) for i in range(3)])
+    # Re-adding an event counts as recent use
+    catalog.add_event(event(0))
+    catalog.add_event(event(3))
+    assert sorted(catalog.events) == ["0", "2", "3"]
+    assert catalog.lookup("y1-0") is None
+    assert catalog.get_event_by_slug("event-1") is None
+    assert len(catalog.tokens) == 6
+
+
+def test_sync_prunes_and_counts_evictions():
+    catalog = CatalogIndex(max_events=2)
+    catalog.add_events([event(0), event(1)])
+    changed, removed = catalog.sync([event(1), event(2), event(3)])
+    assert changed == 2
+    assert removed == 2
+    assert sorted(catalog.events) == ["2", "3"]
@@ -0,0 +1,303 @@
+"""
+Tick recorder and on-disk journal for the Polymarket WebSocket feed.
+
+Journal layout (``.pmtj`` files):
+
+    file   := b"PMTJ" version:u8 block*
+    block  := b"BLK1" count:u32 raw_len:u32 comp_len:u32 zlib(record*)
+    record := recv_ts:f64 type:u8 asset_len:u16 payload_len:u32 asset payload
+
+``payload`` is the compact JSON of the decoded event, so replay hands
+``WSClient._process_message`` exactly what the socket delivered.
+"""
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+FILE_MAGIC = b"PMTJ"
+FILE_VERSION = 1
+BLOCK_MAGIC = b"BLK1"
+FILE_SUFFIX = ".pmtj"
+
+_BLOCK_HEADER = struct.Struct("<4sIII")
+_RECORD_HEADER = struct.Struct("<dBHI")
+
+EVENT_TYPE_CODES = {
+    "book": 1,
+    "price_change": 2,
+    "last_trade_price": 3,
+}
+EVENT_TYPE_NAMES = {code: name for name, code in EVENT_TYPE_CODES.items()}
+
+
+class TickRecorder:
+    """
+    Records decoded WebSocket events into a ring buffer and a rotating journal.
+
+    ``record`` only appends to two deques, so it is safe to call from the
+    WebSocket receive thread. Encoding, compression and disk I/O happen on a
+    background flusher thread.
+    """
+
+    def __init__(
+        self,
+        journal_dir: Optional[str] = None,
+        ring_size: int = 100_000,
+        flush_interval: float = 1.0,
+        max_batch: int = 5_000,
+        max_file_bytes: int = 64 * 1024 * 1024,
+        max_files: Optional[int] = None,
+    ):
+        """
+        Args:
+            journal_dir: Directory for journal files (None keeps memory only)
+            ring_size: Number of recent events kept in memory
+            flush_interval: Seconds between background flushes
+            max_batch: Maximum events compressed into one block
+            max_file_bytes: Rotate the journal once a file reaches this size
+            max_files: Keep at most this many journal files (None keeps all)
+        """
+        self.journal_dir = journal_dir
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+
+        self.ring = deque(maxlen=ring_size)
+        self._pending = deque()
+        self._file = None
+        self._file_seq = 0
+        self._io_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.events_recorded = 0
+        self.events_written = 0
+
+        if journal_dir:
+            os.makedirs(journal_dir, exist_ok=True)
+            self._thread = threading.Thread(target=self._flush_loop, daemon=True)
+            self._thread.start()
+
+    def record(self, event: Dict, recv_ts: Optional[float] = None):
+        """
+        Record one decoded event. Unknown event types are ignored.
+
+        Args:
+            event: Decoded WebSocket event dictionary
+            recv_ts: Receive timestamp (defaults to now)
+        """
+        msg_type = event.get("event_type") or event.get("type")
+        if msg_type not in EVENT_TYPE_CODES:
+            return
+        item = (recv_ts if recv_ts is not None else time.time(), event)
+        self.ring.append(item)
+        if self.journal_dir:
+            self._pending.append(item)
+        self.events_recorded += 1
+
+    # WSClient listener signature
+    __call__ = record
+    # Replayed events are already in a journal; WSClient skips this listener for them
+    skip_replay = True
+
+    def recent(self, limit: Optional[int] = None, asset_id: Optional[str] = None) -> List[Tuple[float, Dict]]:
+        """
+        Get recently recorded events from the ring buffer, oldest first.
+
+        Args:
+            limit: Return at most this many of the newest events
+            asset_id: Only return events for this asset
+
+        Returns:
+            List of (recv_ts, event) tuples
+        """
+        items = list(self.ring)
+        if asset_id is not None:
+            items = [item for item in items if item[1].get("asset_id") == asset_id]
+        if limit is not None:
+            items = items[-limit:] if limit > 0 else []
+        return items
+
+    def flush(self):
+        """Write all pending events to the journal."""
+        if not self.journal_dir:
+            return
+        with self._io_lock:
+            while self._pending:
+                batch = []
+                while self._pending and len(batch) < self.max_batch:
+                    batch.append(self._pending.popleft())
+                self._write_block(batch)
+
+    def close(self):
+        """Stop the flusher, write pending events and close the journal."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+        with self._io_lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def _flush_loop(self):
+        """Background flusher."""
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Error writing tick journal: {e}")
+
+    def _write_block(self, batch: List[Tuple[float, Dict]]):
+        """Encode, compress and append one block, rotating if needed."""
+        parts = []
+        for recv_ts, event in batch:
+            msg_type = event.get("event_type") or event.get("type")
+            asset = str(event.get("asset_id") or "").encode()
+            payload = json.dumps(event, separators=(",", ":")).encode()
+            parts.append(_RECORD_HEADER.pack(recv_ts, EVENT_TYPE_CODES[msg_type], len(asset), len(payload)))
+            parts.append(asset)
+            parts.append(payload)
+        raw = b"".join(parts)
+        compressed = zlib.compress(raw, 6)
+
+        if self._file is None:
+            self._open_file()
+        self._file.write(_BLOCK_HEADER.pack(BLOCK_MAGIC, len(batch), len(raw), len(compressed)))
+        self._file.write(compressed)
+        self._file.flush()
+        self.events_written += len(batch)
+
+        if self._file.tell() >= self.max_file_bytes:
+            self._file.close()
+            self._file = None
+
+    def _open_file(self):
+        """Open a new journal file and apply retention."""
+        self._file_seq += 1
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+        path = os.path.join(self.journal_dir, f"ticks-{stamp}-{self._file_seq:06d}{FILE_SUFFIX}")
+        self._file = open(path, "ab")
+        self._file.write(FILE_MAGIC + bytes([FILE_VERSION]))
+
+        if self.max_files:
+            files = journal_files(self.journal_dir)
+            for old in files[:-self.max_files]:
+                try:
+                    os.remove(old)
+                except OSError as e:
+                    print(f"Error removing old tick journal {old}: {e}")
+
+
+def journal_files(path: str) -> List[str]:
+    """
+    List journal files under a path in recording order.
+
+    Args:
+        path: Journal file or directory
+
+    Returns:
+        Sorted list of journal file paths
+    """
+    if os.path.isfile(path):
+        return [path]
+    if not os.path.isdir(path):
+        return []
+    return sorted(
+        os.path.join(path, name)
+        for name in os.listdir(path)
+        if name.endswith(FILE_SUFFIX)
+    )
+
+
+def read_journal(path: str) -> Iterator[Tuple[float, Dict]]:
+    """
+    Read events back from a journal file or directory.
+
+    A truncated trailing block (e.g. after a crash) ends that file quietly.
+
+    Args:
+        path: Journal file or directory
+
+    Yields:
+        (recv_ts, event) tuples in recording order
+    """
+    for file_path in journal_files(path):
+        with open(file_path, "rb") as f:
+            header = f.read(len(FILE_MAGIC) + 1)
+            if header[:len(FILE_MAGIC)] != FILE_MAGIC:
+                print(f"Skipping {file_path}: not a tick journal")
+                continue
+
+            while True:
+                block_header = f.read(_BLOCK_HEADER.size)
+                if len(block_header) < _BLOCK_HEADER.size:
+                    break
+                magic, count, raw_len, comp_len = _BLOCK_HEADER.unpack(block_header)
+                compressed = f.read(comp_len)
+                if magic != BLOCK_MAGIC or len(compressed) < comp_len:
+                    break
+                raw = zlib.decompress(compressed)
+
+                offset = 0
+                for _ in range(count):
+                    recv_ts, _code, asset_len, payload_len = _RECORD_HEADER.unpack_from(raw, offset)
+                    offset += _RECORD_HEADER.size + asset_len
+                    event = json.loads(raw[offset:offset + payload_len])
+                    offset += payload_len
+                    yield recv_ts, event
+
+
+def replay_journal(
+    target,
+    path: str,
+    speed: Optional[float] = 1.0,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> int:
+    """
+    Feed a journal back through ``target._process_message``.
+
+    Events are passed with ``replay=True``, so a TickRecorder attached to
+    ``target`` does not record them into its journal a second time; other
+    listeners (stats, alerts, scanners) still see them.
+
+    Args:
+        target: WSClient (or anything with ``_process_message(data, recv_ts, replay)``)
+        path: Journal file or directory
+        speed: Playback multiplier (1.0 = original pacing, None or 0 = no delay)
+        start: Skip events received before this timestamp
+        end: Stop at events received after this timestamp
+
+    Returns:
+        Number of events replayed
+    """
+    replayed = 0
+    first_ts = None
+    wall_start = None
+
+    for recv_ts, event in read_journal(path):
+        if start is not None and recv_ts < start:
+            continue
+        if end is not None and recv_ts > end:
+            break
+
+        if speed:
+            if first_ts is None:
+                first_ts = recv_ts
+                wall_start = time.monotonic()
+            delay = (recv_ts - first_ts) / speed - (time.monotonic() - wall_start)
+            if delay > 0:
+                time.sleep(delay)
+
+        target._process_message(event, recv_ts, replay=True)
+        replayed += 1
+
+    return replayed
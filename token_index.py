@@ -0,0 +1,199 @@
+"""
+Reverse indexes over the loaded event catalog (token id, slug, event id).
+"""
+import itertools
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from utils import Event, Market, get_event
+
+
+class TokenRef(NamedTuple):
+    """Where a CLOB token lives in the catalog."""
+    event_id: str
+    market_index: int
+    outcome_index: int
+
+
+class CatalogIndex:
+    """
+    O(1) lookups from token id, slug or event id to parsed events and markets.
+
+    Maintained incrementally: ``add_event`` re-indexes only an event whose
+    content changed, and ``sync`` diffs a fresh event list against what is
+    indexed. Reads are plain dict gets and take no lock.
+
+    With ``max_events`` set, the events added least recently are evicted
+    once the index outgrows it; adding an event again (a reloaded feed
+    page or search result) counts as recent use.
+    """
+
+    def __init__(self, max_events: Optional[int] = None):
+        """
+        Args:
+            max_events: Evict beyond this many events (default: unbounded)
+        """
+        self.max_events = max_events
+        self.tokens: Dict[str, TokenRef] = {}
+        self.events: Dict[str, Event] = {}
+        self.slugs: Dict[str, str] = {}
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def __contains__(self, event_id: str) -> bool:
+        return event_id in self.events
+
+    def add_event(self, event) -> Event:
+        """
+        Index (or re-index) one event.
+
+        Args:
+            event: Event dictionary from Gamma API (or a parsed Event)
+
+        Returns:
+            The parsed Event
+        """
+        model = get_event(event)
+        if not model.id:
+            return model
+        with self.lock:
+            self._add(model)
+            self._evict()
+        return model
+
+    def add_events(self, events: Iterable) -> List[Event]:
+        """Index several events; see add_event."""
+        models = [get_event(e) for e in events]
+        with self.lock:
+            for model in models:
+                if model.id:
+                    self._add(model)
+            self._evict()
+        return models
+
+    def remove_event(self, event_id: str) -> bool:
+        """
+        Drop an event and its tokens from the index.
+
+        Returns:
+            True if the event was indexed
+        """
+        with self.lock:
+            return self._remove(str(event_id))
+
+    def sync(self, events: Iterable, prune: bool = True) -> Tuple[int, int]:
+        """
+        Bring the index in line with a freshly loaded event list.
+
+        Args:
+            events: Current event dictionaries (or parsed Events)
+            prune: Remove indexed events missing from ``events``
+
+        Returns:
+            (events added or changed, events removed)
+        """
+        models = [get_event(e) for e in events]
+        changed = removed = 0
+        with self.lock:
+            seen = set()
+            for model in models:
+                if not model.id:
+                    continue
+                seen.add(model.id)
+                if self.events.get(model.id) is not model:
+                    self._add(model)
+                    changed += 1
+            if prune:
+                for event_id in [eid for eid in self.events if eid not in seen]:
+                    self._remove(event_id)
+                    removed += 1
+            removed += self._evict()
+        return changed, removed
+
+    def lookup(self, token_id: str) -> Optional[TokenRef]:
+        """
+        Find where a token lives.
+
+        Args:
+            token_id: CLOB token ID (e.g. a WebSocket asset_id)
+
+        Returns:
+            TokenRef or None
+        """
+        return self.tokens.get(token_id)
+
+    def resolve(self, token_id: str) -> Optional[Tuple[Event, Market, int]]:
+        """
+        Resolve a token to its event, market and outcome index.
+
+        Args:
+            token_id: CLOB token ID
+
+        Returns:
+            (Event, Market, outcome index) or None
+        """
+        ref = self.tokens.get(token_id)
+        if ref is None:
+            return None
+        event = self.events.get(ref.event_id)
+        if event is None or ref.market_index >= len(event.markets):
+            return None
+        return event, event.markets[ref.market_index], ref.outcome_index
+
+    def get_event(self, event_id: str) -> Optional[Event]:
+        """Parsed event by id."""
+        return self.events.get(str(event_id))
+
+    def get_event_by_slug(self, slug: str) -> Optional[Event]:
+        """Parsed event by slug."""
+        event_id = self.slugs.get(slug)
+        return self.events.get(event_id) if event_id is not None else None
+
+    def get_markets(self, event_id: str) -> Tuple[Market, ...]:
+        """Markets of an event (empty if unknown)."""
+        event = self.events.get(str(event_id))
+        return event.markets if event is not None else ()
+
+    def token_ids(self) -> List[str]:
+        """Every indexed token id."""
+        return list(self.tokens)
+
+    def _add(self, model: Event):
+        """Index an event, replacing any previous version (lock held)."""
+        previous = self.events.get(model.id)
+        if previous is model:
+            # Mark recently used (dicts keep insertion order)
+            self.events[model.id] = self.events.pop(model.id)
+            return
+        if previous is not None:
+            self._remove(model.id)
+        self.events[model.id] = model
+        if model.slug:
+            self.slugs[model.slug] = model.id
+        for market_index, market in enumerate(model.markets):
+            for outcome_index, token_id in enumerate(market.clob_token_ids):
+                self.tokens[token_id] = TokenRef(model.id, market_index, outcome_index)
+
+    def _evict(self) -> int:
+        """Drop the least recently added events beyond max_events (lock held)."""
+        if self.max_events is None:
+            return 0
+        excess = len(self.events) - self.max_events
+        for event_id in list(itertools.islice(self.events, max(excess, 0))):
+            self._remove(event_id)
+        return max(excess, 0)
+
+    def _remove(self, event_id: str) -> bool:
+        """Unindex an event (lock held)."""
+        model = self.events.pop(event_id, None)
+        if model is None:
+            return False
+        if model.slug and self.slugs.get(model.slug) == event_id:
+            del self.slugs[model.slug]
+        for token_id in model.token_ids:
+            ref = self.tokens.get(token_id)
+            if ref is not None and ref.event_id == event_id:
+                del self.tokens[token_id]
+        return True
@@ -1,6 +1,9 @@
 """
 Utility functions for parsing Polymarket event and market data.
 """
+import json
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional
 
 
@@ -32,146 +35,244 @@ def safe_float(value, default=0.0):
         return default
 
 
-def parse_markets_from_event(event: Dict) -> List[Dict]:
+class Market:
     """
-    Extract market information from an event.
+    One parsed market. Built once per raw market by ``get_event``.
     
-    Args:
-        event: Event dictionary from Gamma API
-        
-    Returns:
-        List of parsed market dictionaries
-    """
-    import json
-    
-    markets = event.get("markets", [])
-    parsed = []
-    
-    for market in markets:
-        # Ensure outcomes is a list
-        outcomes = market.get("outcomes", [])
-        if isinstance(outcomes, str):
-            try:
-                # Try to parse as JSON if it's a string representation
-                outcomes = json.loads(outcomes)
-            except:
-                # If it's a simple string, treat it as a single outcome
-                outcomes = [outcomes] if outcomes else []
-        elif not isinstance(outcomes, list):
-            outcomes = []
+    Also answers ``get()`` / ``[]`` with the keys ``parse_markets_from_event``
+    used to return, so older dict-style callers keep working.
+    """
+    
+    __slots__ = ("id", "question", "outcomes", "outcome_prices", "clob_token_ids",
+                 "volume", "liquidity", "raw")
+    
+    _KEYS = frozenset(("id", "question", "outcomes", "outcome_prices", "clob_token_ids",
+                       "volume", "liquidity"))
+    
+    def __init__(self, raw: Dict):
+        """
+        Args:
+            raw: Market dictionary from Gamma API
+        """
+        self.raw = raw
+        self.id = str(raw.get("id") or "")
+        self.question = raw.get("question") or ""
         
-        # Ensure outcome_prices is a list
-        outcome_prices = market.get("outcomePrices", [])
-        if isinstance(outcome_prices, str):
-            try:
-                # Try to parse as JSON
-                outcome_prices = json.loads(outcome_prices)
-            except:
-                outcome_prices = []
-        elif not isinstance(outcome_prices, list):
-            outcome_prices = []
+        # Outcomes: JSON-string list, real list, or a single bare string
+        self.outcomes = tuple(_decode_list(raw.get("outcomes"), keep_bare_string=True))
         
+        prices = _decode_list(raw.get("outcomePrices"))
         # Fallback: try other price fields if outcomePrices is empty
-        if not outcome_prices:
-            # Try 'prices' field
-            prices_alt = market.get("prices", [])
-            if isinstance(prices_alt, str):
-                try:
-                    outcome_prices = json.loads(prices_alt)
-                except:
-                    pass
-            elif isinstance(prices_alt, list):
-                outcome_prices = prices_alt
-            
-            # Try individual price fields if still empty
-            if not outcome_prices and outcomes:
-                # Some markets have individual 'price' or probability fields
-                price_val = market.get("price") or market.get("lastPrice")
-                if price_val is not None:
-                    outcome_prices = [safe_float(price_val, 0)]
-        
-        # Ensure clobTokenIds is a list
-        clob_token_ids = market.get("clobTokenIds", [])
-        if isinstance(clob_token_ids, str):
-            try:
-                # Try to parse as JSON
-                clob_token_ids = json.loads(clob_token_ids)
-            except:
-                clob_token_ids = [clob_token_ids] if clob_token_ids else []
-        elif not isinstance(clob_token_ids, list):
-            clob_token_ids = []
+        if not prices:
+            prices = _decode_list(raw.get("prices"))
+        if not prices and self.outcomes:
+            # Some markets have individual 'price' or probability fields
+            price_val = raw.get("price") or raw.get("lastPrice")
+            if price_val is not None:
+                prices = [price_val]
+        self.outcome_prices = tuple(safe_float(p, 0) for p in prices)
         
-        parsed_market = {
-            "question": market.get("question", ""),
-            "clob_token_ids": clob_token_ids,
-            "outcomes": outcomes,
-            "outcome_prices": outcome_prices,
-            "volume": market.get("volume", 0),
-            "liquidity": market.get("liquidity", 0),
-        }
-        parsed.append(parsed_market)
+        self.clob_token_ids = tuple(
+            str(t) for t in _decode_list(raw.get("clobTokenIds"), keep_bare_string=True)
+        )
+        self.volume = safe_float(raw.get("volume"), 0)
+        self.liquidity = safe_float(raw.get("liquidity"), 0)
     
-    return parsed
+    @property
+    def label(self) -> str:
+        """Short display name: the group item title (e.g. a candidate) or the question."""
+        return self.raw.get("groupItemTitle") or self.question
+    
+    def get(self, key: str, default=None):
+        """Dict-style access to the parsed fields."""
+        if key in self._KEYS:
+            return getattr(self, key)
+        return default
+    
+    def __getitem__(self, key: str):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __repr__(self):
+        return f"Market(id={self.id!r}, question={self.question!r})"
 
 
-def get_first_token_id(event: Dict) -> Optional[str]:
+class Event:
     """
-    Get the first CLOB token ID from an event (typically 'Yes' outcome).
+    One parsed event with its markets. Get instances through ``get_event``.
+    """
+    
+    __slots__ = ("id", "slug", "title", "description", "markets", "volume",
+                 "liquidity", "token_ids", "neg_risk", "fingerprint", "raw")
+    
+    def __init__(self, raw: Dict, fingerprint: Optional[tuple] = None):
+        """
+        Args:
+            raw: Event dictionary from Gamma API
+            fingerprint: Content fingerprint used for memoization
+        """
+        self.raw = raw
+        self.fingerprint = fingerprint
+        self.id = str(raw.get("id") or "")
+        self.slug = raw.get("slug") or ""
+        self.title = raw.get("title") or "Untitled"
+        self.description = raw.get("description") or ""
+        markets = raw.get("markets") or []
+        self.markets = tuple(Market(m) for m in markets if isinstance(m, dict))
+        self.volume = sum(m.volume for m in self.markets)
+        self.liquidity = sum(m.liquidity for m in self.markets)
+        self.token_ids = tuple(t for m in self.markets for t in m.clob_token_ids)
+        # Markets are mutually exclusive outcomes (at most one resolves Yes)
+        self.neg_risk = bool(raw.get("negRisk"))
+    
+    @property
+    def first_token_id(self) -> Optional[str]:
+        """First token of the first market (typically 'Yes'), or None."""
+        if self.markets and self.markets[0].clob_token_ids:
+            return self.markets[0].clob_token_ids[0]
+        return None
+    
+    def __repr__(self):
+        return f"Event(id={self.id!r}, title={self.title!r}, markets={len(self.markets)})"
+
+
+# Memo of parsed events: event id -> Event, least recently used first
+_EVENT_CACHE_SIZE = 4096
+_event_cache: "OrderedDict[str, Event]" = OrderedDict()
+_event_cache_lock = threading.Lock()
+
+# Raw market fields read by Market; any change to them invalidates the memo
+_MARKET_FIELDS = ("id", "question", "outcomes", "outcomePrices", "prices", "price",
+                  "lastPrice", "clobTokenIds", "volume", "liquidity")
+
+
+def get_event(event) -> Event:
+    """
+    Get the parsed model for a raw event, building it at most once.
+    
+    Parsed events are memoized by event id and a fingerprint of the fields
+    the model reads, so an event whose prices changed is re-parsed while an
+    unchanged one is returned straight from the cache.
     
     Args:
-        event: Event dictionary
+        event: Event dictionary from Gamma API (an Event is returned as-is)
         
     Returns:
-        Token ID string or None
+        Parsed Event
     """
-    import json
+    if isinstance(event, Event):
+        return event
     
-    markets = event.get("markets", [])
-    if not markets:
-        return None
+    fingerprint = _event_fingerprint(event)
+    key = str(event.get("id") or "") or fingerprint
+    with _event_cache_lock:
+        cached = _event_cache.get(key)
+        if cached is not None and cached.fingerprint == fingerprint:
+            _event_cache.move_to_end(key)
+            return cached
     
-    first_market = markets[0]
-    token_ids = first_market.get("clobTokenIds", [])
+    parsed = Event(event, fingerprint)
+    with _event_cache_lock:
+        _event_cache[key] = parsed
+        _event_cache.move_to_end(key)
+        while len(_event_cache) > _EVENT_CACHE_SIZE:
+            _event_cache.popitem(last=False)
+    return parsed
+
+
+def clear_event_cache():
+    """Forget all parsed events."""
+    with _event_cache_lock:
+        _event_cache.clear()
+
+
+def _event_fingerprint(event: Dict) -> tuple:
+    """Hashable summary of every raw field the Event model reads."""
+    fingerprint = (
+        event.get("id"),
+        event.get("slug"),
+        event.get("title"),
+        event.get("description"),
+        event.get("negRisk"),
+        tuple(tuple(map(m.get, _MARKET_FIELDS)) for m in event.get("markets") or [] if isinstance(m, dict)),
+    )
+    try:
+        hash(fingerprint)
+    except TypeError:
+        # Some fields arrived already decoded as lists
+        fingerprint = _freeze(fingerprint)
+    return fingerprint
+
+
+def _freeze(value):
+    """Make JSON-decoded values hashable (API fields are sometimes lists)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def _decode_list(value, keep_bare_string: bool = False) -> list:
+    """
+    Decode a field that may be a list or a JSON-encoded list string.
     
-    # Handle if token_ids is a string representation of an array
-    if isinstance(token_ids, str):
+    Args:
+        value: Raw field value
+        keep_bare_string: Treat a non-JSON string as a one-element list
+        
+    Returns:
+        List (empty if the value can't be interpreted)
+    """
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
         try:
-            token_ids = json.loads(token_ids)
-        except:
-            return None
-    
-    return token_ids[0] if token_ids and isinstance(token_ids, list) else None
+            decoded = json.loads(value)
+        except ValueError:
+            return [value] if keep_bare_string and value else []
+        return decoded if isinstance(decoded, list) else []
+    return []
 
 
-def get_all_token_ids(event: Dict) -> List[str]:
+def parse_markets_from_event(event) -> List[Market]:
     """
-    Get all CLOB token IDs from an event.
+    Extract market information from an event.
     
     Args:
-        event: Event dictionary
+        event: Event dictionary from Gamma API (or a parsed Event)
         
     Returns:
-        List of token ID strings
+        List of parsed markets (see Market; dict-style access still works)
     """
-    import json
-    
-    markets = event.get("markets", [])
-    token_ids = []
+    return list(get_event(event).markets)
+
+
+def get_first_token_id(event) -> Optional[str]:
+    """
+    Get the first CLOB token ID from an event (typically 'Yes' outcome).
     
-    for market in markets:
-        market_token_ids = market.get("clobTokenIds", [])
-        
-        # Handle if it's a string representation of an array
-        if isinstance(market_token_ids, str):
-            try:
-                market_token_ids = json.loads(market_token_ids)
-            except:
-                continue
+    Args:
+        event: Event dictionary (or a parsed Event)
         
-        if isinstance(market_token_ids, list):
-            token_ids.extend(market_token_ids)
+    Returns:
+        Token ID string or None
+    """
+    return get_event(event).first_token_id
+
+
+def get_all_token_ids(event) -> List[str]:
+    """
+    Get all CLOB token IDs from an event.
     
-    return token_ids
+    Args:
+        event: Event dictionary (or a parsed Event)
+        
+    Returns:
+        List of token ID strings
+    """
+    return list(get_event(event).token_ids)
 
 
 def format_price(price: float) -> str:
@@ -4,8 +4,9 @@ WebSocket client for Polymarket live market data.
 import json
 import threading
 import time
-from typing import Dict, List, Optional
-from websocket import WebSocketApp
+from typing import Dict, List, Optional, Tuple
+
+from feed_metrics import FeedMetrics
 
 
 class WSClient:
@@ -13,14 +14,43 @@ class WSClient:
     
     WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
     
-    def __init__(self):
+    def __init__(self, recorder=None, metrics: Optional[FeedMetrics] = None, url: Optional[str] = None):
+        """
+        Args:
+            recorder: Optional TickRecorder that receives every decoded event
+            metrics: FeedMetrics to record into (a private one by default)
+            url: Market channel URL (WS_URL by default; e.g. a local stand-in)
+        """
+        self.url = url or self.WS_URL
         self.ws = None
         self.thread = None
         self.running = False
         self.live_prices = {}  # {asset_id: {best_bid, best_ask, last_trade_price}}
         self.lock = threading.Lock()
         self.subscribed_assets = set()
+        self.connected = False
         self.last_ping = 0
+        self.metrics = metrics if metrics is not None else FeedMetrics()
+        self.listeners = []  # callables(event, recv_ts), run after each update
+        if recorder is not None:
+            self.add_listener(recorder)
+    
+    def add_listener(self, callback):
+        """
+        Register a callback invoked with (event, recv_ts) for every processed
+        book, price_change and last_trade_price event.
+        
+        Callbacks run on the WebSocket thread and must be cheap.
+        
+        Args:
+            callback: Callable taking (event dict, receive timestamp)
+        """
+        self.listeners.append(callback)
+    
+    def remove_listener(self, callback):
+        """Unregister a callback added with add_listener."""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
     
     def connect(self, asset_ids: List[str]):
         """
@@ -35,36 +65,38 @@ class WSClient:
             return
         
         self.running = True
-        self.subscribed_assets.update(asset_ids)
+        with self.lock:
+            self.subscribed_assets.update(asset_ids)
         
         def on_open(ws):
-            print(f"WebSocket connected, subscribing to {len(asset_ids)} assets")
-            self._send_subscribe(ws, asset_ids)
+            # Resubscribe the full current set, not just the initial ids,
+            # so reconnects pick up everything added since
+            with self.lock:
+                assets = list(self.subscribed_assets)
+            print(f"WebSocket connected, subscribing to {len(assets)} assets")
+            self.connected = True
+            self.metrics.record_connect()
+            if assets:
+                self._send_subscribe(ws, assets)
         
         def on_message(ws, message):
-            try:
-                # Skip empty messages
-                if not message or not message.strip():
-                    return
-                    
-                data = json.loads(message)
-                self._process_message(data)
-            except json.JSONDecodeError as e:
-                # Skip logging for common empty/ping messages
-                if message.strip():
-                    print(f"Error parsing WebSocket message: {e}")
-            except Exception as e:
-                print(f"Error processing WebSocket message: {e}")
+            self._handle_frame(message)
         
         def on_error(ws, error):
             print(f"WebSocket error: {error}")
         
         def on_close(ws, close_status_code, close_msg):
             print(f"WebSocket closed: {close_status_code} - {close_msg}")
-            self.running = False
+            # Leave self.running alone so _run_forever reconnects;
+            # disconnect() is the only way to stop for good
+            self.connected = False
+            self.metrics.record_disconnect()
         
+        # Imported here so modules that only parse feed events (price_feeder,
+        # live_feed) don't pay for websocket-client at import time
+        from websocket import WebSocketApp
         self.ws = WebSocketApp(
-            self.WS_URL,
+            self.url,
             on_open=on_open,
             on_message=on_message,
             on_error=on_error,
@@ -87,80 +119,120 @@ class WSClient:
                 print("WebSocket disconnected, reconnecting in 5s...")
                 time.sleep(5)
     
-    def _send_subscribe(self, ws, asset_ids: List[str]):
-        """Send subscription message."""
+    def _send_subscribe(self, ws, asset_ids: List[str], operation: Optional[str] = None):
+        """
+        Send subscription message.
+        
+        Args:
+            ws: Open WebSocketApp
+            asset_ids: CLOB token IDs
+            operation: None for the initial market subscription, or
+                'subscribe' / 'unsubscribe' on an established connection
+        """
         subscribe_msg = {
             "assets_ids": asset_ids,
             "type": "market"
         }
+        if operation:
+            subscribe_msg["operation"] = operation
         ws.send(json.dumps(subscribe_msg))
     
     def _subscribe(self, asset_ids: List[str]):
         """Subscribe to additional assets on existing connection."""
-        new_assets = [aid for aid in asset_ids if aid not in self.subscribed_assets]
-        if new_assets and self.ws:
+        with self.lock:
+            new_assets = [aid for aid in asset_ids if aid not in self.subscribed_assets]
             self.subscribed_assets.update(new_assets)
-            self._send_subscribe(self.ws, new_assets)
+        if new_assets and self.ws and self.connected:
+            try:
+                self._send_subscribe(self.ws, new_assets, "subscribe")
+            except Exception as e:
+                # on_open resubscribes the full set after the reconnect
+                print(f"Error subscribing to {len(new_assets)} assets: {e}")
+    
+    def unsubscribe(self, asset_ids: List[str]):
+        """
+        Stop receiving updates for assets and drop their live prices.
+        
+        Args:
+            asset_ids: List of CLOB token IDs to unsubscribe from
+        """
+        with self.lock:
+            removed = [aid for aid in asset_ids if aid in self.subscribed_assets]
+            self.subscribed_assets.difference_update(removed)
+            for aid in removed:
+                self.live_prices.pop(aid, None)
+        if removed and self.ws and self.connected:
+            try:
+                self._send_subscribe(self.ws, removed, "unsubscribe")
+            except Exception as e:
+                print(f"Error unsubscribing from {len(removed)} assets: {e}")
     
-    def _process_message(self, data: Dict):
-        """Process incoming WebSocket message."""
+    def _handle_frame(self, message: str, recv_ts: Optional[float] = None):
+        """
+        Decode one raw WebSocket frame and process its events.
+        
+        Args:
+            message: Raw frame text (one event or a batched list)
+            recv_ts: Receive timestamp (defaults to now)
+        """
+        recv_ts = recv_ts if recv_ts is not None else time.time()
+        started = time.perf_counter()
+        try:
+            # Skip empty messages
+            if not message or not message.strip():
+                return
+                
+            data = json.loads(message)
+            # Snapshots arrive batched as a list of events
+            events = data if isinstance(data, list) else [data]
+            for item in events:
+                self._process_message(item, recv_ts)
+            self.metrics.record_frame(events, len(message), recv_ts, time.perf_counter() - started)
+        except json.JSONDecodeError as e:
+            # Skip logging for common empty/ping messages
+            if message.strip():
+                self.metrics.record_parse_error()
+                print(f"Error parsing WebSocket message: {e}")
+        except Exception as e:
+            print(f"Error processing WebSocket message: {e}")
+    
+    def _process_message(self, data: Dict, recv_ts: Optional[float] = None, replay: bool = False):
+        """
+        Process incoming WebSocket message.
+        
+        Args:
+            data: Decoded event dictionary
+            recv_ts: Receive timestamp (defaults to now; replay passes the
+                recorded one)
+            replay: Event comes from a journal; listeners with a true
+                ``skip_replay`` attribute (TickRecorder) are not called
+        """
         # Skip if data is not a dict
         if not isinstance(data, dict):
             return
             
-        msg_type = data.get("event_type") or data.get("type")
-        
-        if msg_type == "book":
-            # Full book snapshot
-            asset_id = data.get("asset_id")
-            if asset_id:
-                with self.lock:
-                    if asset_id not in self.live_prices:
-                        self.live_prices[asset_id] = {}
-                    
-                    # Extract best bid/ask from book
-                    bids = data.get("bids", [])
-                    asks = data.get("asks", [])
-                    
-                    if bids and isinstance(bids, list) and len(bids) > 0:
-                        bid = bids[0]
-                        if isinstance(bid, dict):
-                            self.live_prices[asset_id]["best_bid"] = float(bid.get("price", 0))
-                        elif isinstance(bid, list) and len(bid) >= 2:
-                            # Sometimes bids are [price, size] arrays
-                            self.live_prices[asset_id]["best_bid"] = float(bid[0])
-                    
-                    if asks and isinstance(asks, list) and len(asks) > 0:
-                        ask = asks[0]
-                        if isinstance(ask, dict):
-                            self.live_prices[asset_id]["best_ask"] = float(ask.get("price", 0))
-                        elif isinstance(ask, list) and len(ask) >= 2:
-                            # Sometimes asks are [price, size] arrays
-                            self.live_prices[asset_id]["best_ask"] = float(ask[0])
-        
-        elif msg_type == "price_change":
-            # Price change update
-            asset_id = data.get("asset_id")
-            if asset_id:
-                with self.lock:
-                    if asset_id not in self.live_prices:
-                        self.live_prices[asset_id] = {}
-                    
-                    if "best_bid" in data:
-                        self.live_prices[asset_id]["best_bid"] = float(data["best_bid"])
-                    if "best_ask" in data:
-                        self.live_prices[asset_id]["best_ask"] = float(data["best_ask"])
-        
-        elif msg_type == "last_trade_price":
-            # Last trade price
-            asset_id = data.get("asset_id")
-            if asset_id:
-                with self.lock:
-                    if asset_id not in self.live_prices:
-                        self.live_prices[asset_id] = {}
-                    
-                    if "price" in data:
-                        self.live_prices[asset_id]["last_trade_price"] = float(data["price"])
+        msg_type, asset_id, fields = extract_price_update(data)
+        if not asset_id:
+            return
+        
+        wait_started = time.perf_counter()
+        with self.lock:
+            lock_wait = time.perf_counter() - wait_started
+            if asset_id not in self.live_prices:
+                self.live_prices[asset_id] = {}
+            self.live_prices[asset_id].update(fields)
+        self.metrics.record_lock_wait(lock_wait)
+        
+        if self.listeners:
+            if recv_ts is None:
+                recv_ts = time.time()
+            for listener in self.listeners:
+                if replay and getattr(listener, "skip_replay", False):
+                    continue
+                try:
+                    listener(data, recv_ts)
+                except Exception as e:
+                    print(f"Error in WebSocket listener: {e}")
     
     def get_live_prices(self, asset_id: str) -> Optional[Dict]:
         """
@@ -180,8 +252,70 @@ class WSClient:
         with self.lock:
             return {k: v.copy() for k, v in self.live_prices.items()}
     
+    def get_metrics(self) -> Dict:
+        """
+        Get feed latency, throughput and connection metrics.
+        
+        Returns:
+            FeedMetrics.snapshot() dictionary
+        """
+        return self.metrics.snapshot()
+    
     def disconnect(self):
         """Disconnect from WebSocket."""
         self.running = False
         if self.ws:
-            self.ws.close()
\ No newline at end of file
+            self.ws.close()
+
+
+def extract_price_update(data: Dict) -> Tuple[Optional[str], Optional[str], Dict[str, float]]:
+    """
+    Pull the top-of-book / last-trade fields out of a market channel event.
+    
+    Args:
+        data: Decoded event dictionary
+        
+    Returns:
+        (event type, asset_id, fields) where fields holds whichever of
+        best_bid, best_ask and last_trade_price the event carries. Event
+        types other than book, price_change and last_trade_price yield
+        (type, None, {}).
+    """
+    msg_type = data.get("event_type") or data.get("type")
+    fields = {}
+    
+    if msg_type == "book":
+        # Full book snapshot; extract best bid/ask
+        bids = data.get("bids", [])
+        asks = data.get("asks", [])
+        
+        if bids and isinstance(bids, list):
+            bid = bids[0]
+            if isinstance(bid, dict):
+                fields["best_bid"] = float(bid.get("price", 0))
+            elif isinstance(bid, list) and len(bid) >= 2:
+                # Sometimes bids are [price, size] arrays
+                fields["best_bid"] = float(bid[0])
+        
+        if asks and isinstance(asks, list):
+            ask = asks[0]
+            if isinstance(ask, dict):
+                fields["best_ask"] = float(ask.get("price", 0))
+            elif isinstance(ask, list) and len(ask) >= 2:
+                # Sometimes asks are [price, size] arrays
+                fields["best_ask"] = float(ask[0])
+    
+    elif msg_type == "price_change":
+        if "best_bid" in data:
+            fields["best_bid"] = float(data["best_bid"])
+        if "best_ask" in data:
+            fields["best_ask"] = float(data["best_ask"])
+    
+    elif msg_type == "last_trade_price":
+        if "price" in data:
+            fields["last_trade_price"] = float(data["price"])
+    
+    else:
+        return msg_type, None, fields
+    
+    return msg_type, data.get("asset_id"), fields
@@ -0,0 +1,265 @@
+"""
+Sharded WebSocket connection manager for watching many assets at once.
+"""
+import math
+import threading
+from typing import Callable, Dict, List, Optional
+
+from metrics import format_family, merge_exposition
+from ws_client import WSClient
+
+
+class WSConnectionManager:
+    """
+    Spreads asset subscriptions across several WSClient connections.
+
+    Each connection holds at most ``max_assets_per_connection`` assets. New
+    assets go to the least-loaded connection with room, a new connection is
+    opened only when all are full, and connections left underused by
+    unsubscribes are drained and closed by ``rebalance``.
+    """
+
+    def __init__(
+        self,
+        max_assets_per_connection: int = 500,
+        recorder=None,
+        client_factory: Callable[[], WSClient] = WSClient,
+    ):
+        """
+        Args:
+            max_assets_per_connection: Per-socket subscription cap
+            recorder: Optional TickRecorder attached to every connection
+            client_factory: Builds a new, unconnected WSClient
+        """
+        if max_assets_per_connection < 1:
+            raise ValueError("max_assets_per_connection must be at least 1")
+        self.max_assets_per_connection = max_assets_per_connection
+        self.client_factory = client_factory
+        self.shards: List[WSClient] = []
+        self.asset_shard: Dict[str, WSClient] = {}
+        # Stable per-connection number, used as a metrics label
+        self.shard_ids: Dict[WSClient, int] = {}
+        self._next_shard_id = 0
+        self.listeners = []
+        self.lock = threading.RLock()
+        if recorder is not None:
+            self.listeners.append(recorder)
+
+    def add_listener(self, callback):
+        """
+        Register a listener on every current and future connection.
+
+        Args:
+            callback: Callable taking (event dict, receive timestamp)
+        """
+        with self.lock:
+            self.listeners.append(callback)
+            for shard in self.shards:
+                shard.add_listener(callback)
+
+    def remove_listener(self, callback):
+        """Unregister a listener from every connection."""
+        with self.lock:
+            if callback in self.listeners:
+                self.listeners.remove(callback)
+            for shard in self.shards:
+                shard.remove_listener(callback)
+
+    @property
+    def subscribed_assets(self) -> set:
+        """All currently subscribed asset IDs."""
+        with self.lock:
+            return set(self.asset_shard)
+
+    def subscribe(self, asset_ids: List[str]):
+        """
+        Subscribe to assets, opening connections as needed.
+
+        Args:
+            asset_ids: List of CLOB token IDs
+        """
+        with self.lock:
+            new_assets = list(dict.fromkeys(aid for aid in asset_ids if aid and aid not in self.asset_shard))
+            placement: Dict[WSClient, List[str]] = {}
+            for aid in new_assets:
+                shard = self._shard_with_room(placement)
+                placement.setdefault(shard, []).append(aid)
+                self.asset_shard[aid] = shard
+            for shard, assets in placement.items():
+                shard.connect(assets)
+
+    def unsubscribe(self, asset_ids: List[str], rebalance: bool = True):
+        """
+        Unsubscribe from assets.
+
+        Args:
+            asset_ids: List of CLOB token IDs
+            rebalance: Compact connections afterwards
+        """
+        with self.lock:
+            removal: Dict[WSClient, List[str]] = {}
+            for aid in asset_ids:
+                shard = self.asset_shard.pop(aid, None)
+                if shard is not None:
+                    removal.setdefault(shard, []).append(aid)
+            for shard, assets in removal.items():
+                shard.unsubscribe(assets)
+            if rebalance and removal:
+                self.rebalance()
+
+    def set_assets(self, asset_ids: List[str]):
+        """
+        Make the subscribed set exactly ``asset_ids``.
+
+        Args:
+            asset_ids: Desired list of CLOB token IDs
+        """
+        desired = set(asset_ids)
+        with self.lock:
+            stale = [aid for aid in self.asset_shard if aid not in desired]
+            self.unsubscribe(stale, rebalance=False)
+            self.subscribe(list(asset_ids))
+            self.rebalance()
+
+    def rebalance(self):
+        """
+        Close surplus connections by moving their assets onto the others.
+
+        Connections are drained smallest-first until only
+        ceil(total / cap) remain. Moved assets keep their last known prices.
+        """
+        with self.lock:
+            total = len(self.asset_shard)
+            needed = math.ceil(total / self.max_assets_per_connection)
+
+            for shard in [s for s in self.shards if not s.subscribed_assets]:
+                self._close_shard(shard)
+
+            while len(self.shards) > max(needed, 0):
+                victim = min(self.shards, key=lambda s: len(s.subscribed_assets))
+                moving = list(victim.subscribed_assets)
+                prices = victim.get_all_live_prices()
+                self._close_shard(victim)
+
+                placement: Dict[WSClient, List[str]] = {}
+                for aid in moving:
+                    shard = self._shard_with_room(placement)
+                    placement.setdefault(shard, []).append(aid)
+                    self.asset_shard[aid] = shard
+                for shard, assets in placement.items():
+                    with shard.lock:
+                        for aid in assets:
+                            if aid in prices:
+                                shard.live_prices.setdefault(aid, prices[aid])
+                    shard.connect(assets)
+
+    def get_live_prices(self, asset_id: str) -> Optional[Dict]:
+        """
+        Get current live prices for an asset.
+
+        Args:
+            asset_id: CLOB token ID
+
+        Returns:
+            Dictionary with best_bid, best_ask, last_trade_price (if available)
+        """
+        shard = self.asset_shard.get(asset_id)
+        if shard is None:
+            return {}
+        return shard.get_live_prices(asset_id)
+
+    def get_all_live_prices(self) -> Dict[str, Dict]:
+        """Get all live prices across connections."""
+        with self.lock:
+            shards = list(self.shards)
+        prices = {}
+        for shard in shards:
+            prices.update(shard.get_all_live_prices())
+        return prices
+
+    def connection_stats(self) -> List[Dict]:
+        """
+        Describe each connection.
+
+        Returns:
+            List of {assets, connected, running} dictionaries
+        """
+        with self.lock:
+            return [
+                {
+                    "assets": len(shard.subscribed_assets),
+                    "connected": shard.connected,
+                    "running": shard.running,
+                }
+                for shard in self.shards
+            ]
+
+    def get_metrics(self) -> List[Dict]:
+        """
+        Get feed metrics for each connection.
+
+        Returns:
+            List of FeedMetrics.snapshot() dictionaries, one per connection
+        """
+        with self.lock:
+            shards = list(self.shards)
+        return [shard.get_metrics() for shard in shards]
+
+    def render_prometheus(self, prefix: str = "polymarket_ws") -> str:
+        """
+        Render every connection's FeedMetrics, labelled by connection.
+
+        Args:
+            prefix: Metric name prefix
+
+        Returns:
+            Exposition text ending in a newline
+        """
+        with self.lock:
+            shards = [(self.shard_ids.get(shard, -1), shard) for shard in self.shards]
+            assets = len(self.asset_shard)
+        texts = [
+            "\n".join(format_family(f"{prefix}_connections", "gauge", "Open WebSocket connections.",
+                                    [f"{prefix}_connections {len(shards)}"])),
+            "\n".join(format_family(f"{prefix}_subscribed_assets", "gauge", "Assets subscribed across connections.",
+                                    [f"{prefix}_subscribed_assets {assets}"])),
+        ]
+        for shard_id, shard in shards:
+            texts.append(shard.metrics.render_prometheus(prefix, {"connection": str(shard_id)}))
+        return merge_exposition(texts)
+
+    def disconnect(self):
+        """Close every connection and forget all subscriptions."""
+        with self.lock:
+            for shard in list(self.shards):
+                self._close_shard(shard)
+            self.asset_shard.clear()
+
+    def _shard_with_room(self, placement: Dict[WSClient, List[str]]) -> WSClient:
+        """
+        Least-loaded connection with spare capacity, or a new one.
+
+        Args:
+            placement: Assets already assigned in this batch but not yet
+                passed to each connection's connect()
+        """
+        def load(shard):
+            return len(shard.subscribed_assets) + len(placement.get(shard, ()))
+
+        candidates = [s for s in self.shards if load(s) < self.max_assets_per_connection]
+        if candidates:
+            return min(candidates, key=load)
+        shard = self.client_factory()
+        for listener in self.listeners:
+            shard.add_listener(listener)
+        self.shards.append(shard)
+        self.shard_ids[shard] = self._next_shard_id
+        self._next_shard_id += 1
+        return shard
+
+    def _close_shard(self, shard: WSClient):
+        """Disconnect a connection and drop it from the pool."""
+        shard.disconnect()
+        if shard in self.shards:
+            self.shards.remove(shard)
+        self.shard_ids.pop(shard, None)